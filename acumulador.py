@@ -0,0 +1,204 @@
+import heapq
+import threading
+from collections import Counter
+from top_k import TopK
+
+
+class Acumulador:
+    """
+    Estadísticas de ventas que se actualizan al vender una entrada, validarla o facturar en un restaurante.
+
+    Cada evento actualiza contadores y sumas en tiempo constante (O(log k) para los conteos con TopK), así que
+    consultar las estadísticas no recorre los partidos ni las entradas. Los métodos se llaman desde CargarApi, tanto en las operaciones
+    como al cargar los datos guardados, y un lock los protege de los hilos del servidor.
+
+    Attributes:
+        entradas (int): Entradas vendidas.
+        validaciones (int): Entradas validadas.
+        ingresos_entradas (float): Total cobrado por las entradas.
+        ingresos_restaurantes (float): Total cobrado en los restaurantes.
+        entradas_por_partido (Counter): Entradas vendidas por ID de partido.
+        asistencia_por_partido (Counter): Entradas validadas por ID de partido.
+        entradas_por_cliente (TopK): Entradas compradas por cliente, con la clave "nombre - cédula".
+        gastos_vip (dict): Gasto total (entrada y facturas) de cada entrada VIP, por código.
+        suma_gastos_vip (float): Suma de los gastos de las entradas VIP.
+        unidades_por_producto (TopK): Unidades vendidas por nombre de producto, en todos los restaurantes.
+        unidades_por_restaurante (dict): Unidades vendidas por nombre de producto (TopK), por nombre de restaurante.
+        ventas_por_restaurante (TopK): Total facturado por nombre de restaurante.
+    """
+
+    def __init__(self):
+        """
+        Inicializa un acumulador sin ventas.
+        """
+        self.entradas = 0
+        self.validaciones = 0
+        self.ingresos_entradas = 0
+        self.ingresos_restaurantes = 0
+        self.entradas_por_partido = Counter()
+        self.asistencia_por_partido = Counter()
+        self.entradas_por_cliente = TopK()
+        self.gastos_vip = {}
+        self.suma_gastos_vip = 0
+        self.unidades_por_producto = TopK()
+        self.unidades_por_restaurante = {}
+        self.ventas_por_restaurante = TopK()
+        self._lock = threading.Lock()
+
+    def registrar_entrada(self, entrada):
+        """
+        Suma una entrada vendida, junto con su validación y sus facturas si ya las tiene (al cargar datos guardados).
+
+        Args:
+            entrada (Entrada): La entrada vendida.
+        """
+        with self._lock:
+            self.entradas += 1
+            self.ingresos_entradas += entrada.factura["total"]
+            self.entradas_por_partido[entrada.partido.id] += 1
+            self.entradas_por_cliente.incrementar(str(entrada.cliente))
+            if entrada.tipo == "vip":
+                self.gastos_vip[entrada.codigo] = entrada.factura["total"]
+                self.suma_gastos_vip += entrada.factura["total"]
+            if entrada.validado:
+                self._validar(entrada)
+            for factura in entrada.compras:
+                self._facturar(factura)
+
+    def registrar_validacion(self, entrada):
+        """
+        Suma la validación de una entrada ya registrada.
+
+        Args:
+            entrada (Entrada): La entrada validada.
+        """
+        with self._lock:
+            self._validar(entrada)
+
+    def registrar_factura(self, factura):
+        """
+        Suma una factura de una entrada ya registrada.
+
+        Args:
+            factura (Factura): La factura creada.
+        """
+        with self._lock:
+            self._facturar(factura)
+
+    def gasto_vip_promedio(self) -> float:
+        """
+        Calcula el gasto promedio de las entradas VIP.
+
+        Returns:
+            float: Gasto promedio de las entradas VIP, 0 si no hay entradas VIP.
+        """
+        with self._lock:
+            return self.suma_gastos_vip / len(self.gastos_vip) if self.gastos_vip else 0
+
+    def gastos_top(self, n: int) -> list[tuple[float, str]]:
+        """
+        Busca las entradas VIP con más gasto.
+
+        Args:
+            n (int): Cantidad de entradas a retornar.
+
+        Returns:
+            list[tuple[float, str]]: Gasto total y código de cada entrada, de mayor a menor gasto.
+        """
+        with self._lock:
+            return heapq.nlargest(n, ((gasto, codigo) for codigo, gasto in self.gastos_vip.items()))
+
+    def conteos_partidos(self) -> dict[str, tuple[int, int]]:
+        """
+        Retorna las entradas vendidas y validadas de cada partido con entradas.
+
+        Returns:
+            dict[str, tuple[int, int]]: Entradas vendidas y validadas, por ID de partido.
+        """
+        with self._lock:
+            return {partido: (vendidas, self.asistencia_por_partido[partido]) for partido, vendidas in self.entradas_por_partido.items()}
+
+    def conteo_partido(self, partido_id: str) -> tuple[int, int]:
+        """
+        Retorna las entradas vendidas y validadas de un partido.
+
+        Args:
+            partido_id (str): ID del partido.
+
+        Returns:
+            tuple[int, int]: Entradas vendidas y entradas validadas.
+        """
+        with self._lock:
+            return self.entradas_por_partido[partido_id], self.asistencia_por_partido[partido_id]
+
+    def clientes_top(self, n: int) -> list[tuple[str, int]]:
+        """
+        Busca los clientes que han comprado más entradas.
+
+        Args:
+            n (int): Cantidad de clientes a retornar.
+
+        Returns:
+            list[tuple[str, int]]: Cliente y cantidad de entradas compradas.
+        """
+        with self._lock:
+            return self.entradas_por_cliente.top(n)
+
+    def restaurantes_top(self, n: int) -> list[tuple[str, float]]:
+        """
+        Busca los restaurantes con más ventas.
+
+        Args:
+            n (int): Cantidad de restaurantes a retornar.
+
+        Returns:
+            list[tuple[str, float]]: Nombre del restaurante y total vendido.
+        """
+        with self._lock:
+            return self.ventas_por_restaurante.top(n)
+
+    def platos_top(self, n: int = None, restaurante: str = None) -> list[tuple[str, int]]:
+        """
+        Busca los productos más vendidos, en general o en un restaurante.
+
+        Args:
+            n (int): Cantidad de productos a retornar, o None para todos.
+            restaurante (str): Nombre del restaurante, o None para considerar todos.
+
+        Returns:
+            list[tuple[str, int]]: Nombre del producto y cantidad vendida.
+        """
+        with self._lock:
+            if restaurante is None:
+                return self.unidades_por_producto.top(n)
+            unidades = self.unidades_por_restaurante.get(restaurante)
+            return unidades.top(n) if unidades is not None else []
+
+    def _validar(self, entrada):
+        """
+        Suma una validación. Se llama con el lock tomado.
+
+        Args:
+            entrada (Entrada): La entrada validada.
+        """
+        self.validaciones += 1
+        self.asistencia_por_partido[entrada.partido.id] += 1
+
+    def _facturar(self, factura):
+        """
+        Suma una factura a las ventas del restaurante, a las unidades de cada producto y, si corresponde, al gasto VIP.
+        Se llama con el lock tomado.
+
+        Args:
+            factura (Factura): La factura creada.
+        """
+        self.ingresos_restaurantes += factura.total
+        self.ventas_por_restaurante.incrementar(factura.restaurante.nombre, factura.total)
+        unidades = self.unidades_por_restaurante.setdefault(factura.restaurante.nombre, TopK())
+        for producto in factura.productos:
+            self.unidades_por_producto.incrementar(producto.nombre)
+            unidades.incrementar(producto.nombre)
+        codigo = factura.entrada.codigo
+        if codigo in self.gastos_vip:
+            self.gastos_vip[codigo] += factura.total
+            self.suma_gastos_vip += factura.total
@@ -0,0 +1,209 @@
+import sqlite3
+from collections import defaultdict
+from cliente import Cliente
+
+ARCHIVO_SQLITE = "datos_clientes.db"
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS cliente (
+    cedula INTEGER PRIMARY KEY,
+    nombre TEXT NOT NULL,
+    edad INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entrada (
+    id INTEGER PRIMARY KEY,
+    cedula INTEGER NOT NULL REFERENCES cliente (cedula),
+    partido TEXT NOT NULL,
+    tipo TEXT NOT NULL,
+    asiento TEXT NOT NULL,
+    codigo TEXT NOT NULL,
+    validado INTEGER NOT NULL,
+    subtotal REAL NOT NULL,
+    descuento REAL NOT NULL,
+    iva REAL NOT NULL,
+    precio REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS factura (
+    id INTEGER PRIMARY KEY,
+    entrada INTEGER NOT NULL REFERENCES entrada (id),
+    restaurante TEXT NOT NULL,
+    subtotal REAL NOT NULL,
+    descuento REAL NOT NULL,
+    iva REAL NOT NULL,
+    total REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS factura_producto (
+    factura INTEGER NOT NULL REFERENCES factura (id),
+    nombre TEXT NOT NULL,
+    cantidad TEXT,
+    precio REAL NOT NULL,
+    stock INTEGER,
+    adicional TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_entrada_cedula ON entrada (cedula);
+CREATE INDEX IF NOT EXISTS idx_entrada_codigo ON entrada (codigo);
+CREATE INDEX IF NOT EXISTS idx_entrada_partido ON entrada (partido);
+CREATE INDEX IF NOT EXISTS idx_factura_entrada ON factura (entrada);
+CREATE INDEX IF NOT EXISTS idx_factura_producto_factura ON factura_producto (factura);
+"""
+
+
+def conectar(ruta: str = ARCHIVO_SQLITE) -> sqlite3.Connection:
+    """
+    Abre la base de datos de clientes en modo WAL y crea el esquema si no existe.
+
+    Args:
+        ruta (str): Ruta del archivo de la base de datos.
+
+    Returns:
+        sqlite3.Connection: Conexión a la base de datos.
+    """
+    conexion = sqlite3.connect(ruta)
+    conexion.execute("PRAGMA journal_mode=WAL")
+    conexion.execute("PRAGMA synchronous=NORMAL")
+    conexion.executescript(ESQUEMA)
+    return conexion
+
+
+def escribir_clientes(conexion: sqlite3.Connection, clientes: list[Cliente]):
+    """
+    Reemplaza el contenido de la base de datos con los clientes dados en una sola transacción.
+
+    Args:
+        conexion (sqlite3.Connection): Conexión a la base de datos.
+        clientes (list[Cliente]): Lista de clientes a guardar.
+    """
+    filas_clientes, filas_entradas, filas_facturas, filas_productos = [], [], [], []
+    vistos = set()
+    for cliente in clientes:
+        if cliente.cedula in vistos:
+            continue
+        vistos.add(cliente.cedula)
+        filas_clientes.append((cliente.cedula, cliente.nombre, cliente.edad))
+        for entrada in cliente.entradas:
+            entrada_id = len(filas_entradas) + 1
+            filas_entradas.append((entrada_id, cliente.cedula, entrada.partido.id, entrada.tipo, entrada.asiento,
+                                   entrada.codigo, int(entrada.validado), entrada.factura["subtotal"], entrada.factura["descuento"],
+                                   entrada.factura["IVA"], entrada.factura["total"]))
+            for factura in entrada.compras:
+                factura_id = len(filas_facturas) + 1
+                filas_facturas.append((factura_id, entrada_id, factura.restaurante.nombre, factura.subtotal, factura.descuento, factura.iva, factura.total))
+                filas_productos.extend((factura_id, producto.nombre, producto.cantidad, producto.precio, producto.stock, producto.adicional)
+                                       for producto in factura.productos)
+    with conexion:
+        for tabla in ["factura_producto", "factura", "entrada", "cliente"]:
+            conexion.execute(f"DELETE FROM {tabla}")
+        conexion.executemany("INSERT INTO cliente VALUES (?, ?, ?)", filas_clientes)
+        conexion.executemany("INSERT INTO entrada VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", filas_entradas)
+        conexion.executemany("INSERT INTO factura VALUES (?, ?, ?, ?, ?, ?, ?)", filas_facturas)
+        conexion.executemany("INSERT INTO factura_producto VALUES (?, ?, ?, ?, ?, ?)", filas_productos)
+
+
+def leer_clientes(conexion: sqlite3.Connection):
+    """
+    Recorre los clientes guardados con el mismo formato de diccionario que usa el archivo de texto.
+
+    Yields:
+        dict: Datos de cada cliente con sus entradas y facturas.
+    """
+    productos = defaultdict(list)
+    for factura, nombre, cantidad, precio, stock, adicional in conexion.execute("SELECT * FROM factura_producto ORDER BY rowid"):
+        productos[factura].append({"nombre": nombre, "cantidad": cantidad, "precio": precio, "stock": stock, "adicional": adicional})
+    facturas = defaultdict(list)
+    for factura_id, entrada_id, restaurante, subtotal, descuento, iva, total in conexion.execute("SELECT * FROM factura ORDER BY id"):
+        facturas[entrada_id].append({"productos": productos.pop(factura_id, []), "restaurante": restaurante,
+                                     "subtotal": subtotal, "descuento": descuento, "iva": iva, "total": total})
+    entradas = defaultdict(list)
+    for entrada_id, cedula, partido, tipo, asiento, codigo, validado, subtotal, descuento, iva, precio in conexion.execute("SELECT * FROM entrada ORDER BY id"):
+        entradas[cedula].append({"tipo": tipo, "partido": partido, "asiento": asiento, "codigo": codigo, "validado": bool(validado),
+                                 "factura": {"subtotal": subtotal, "descuento": descuento, "IVA": iva, "total": precio},
+                                 "compras": facturas.pop(entrada_id, [])})
+    for cedula, nombre, edad in conexion.execute("SELECT cedula, nombre, edad FROM cliente ORDER BY rowid"):
+        yield {"nombre": nombre, "cedula": cedula, "edad": edad, "entradas": entradas.pop(cedula, [])}
+
+
+def gastos_vip(conexion: sqlite3.Connection) -> list[tuple[float, str]]:
+    """
+    Calcula el gasto total de cada entrada VIP (entrada más facturas de restaurante).
+
+    Args:
+        conexion (sqlite3.Connection): Conexión a la base de datos.
+
+    Returns:
+        list[tuple[float, str]]: Gasto total y código de cada entrada VIP.
+    """
+    return conexion.execute("""
+        SELECT e.precio + COALESCE(SUM(f.total), 0), e.codigo
+        FROM entrada e LEFT JOIN factura f ON f.entrada = e.id
+        WHERE e.tipo = 'vip'
+        GROUP BY e.id
+    """).fetchall()
+
+
+def asistencia_por_partido(conexion: sqlite3.Connection) -> dict[str, tuple[int, int]]:
+    """
+    Cuenta los boletos vendidos y validados de cada partido.
+
+    Args:
+        conexion (sqlite3.Connection): Conexión a la base de datos.
+
+    Returns:
+        dict[str, tuple[int, int]]: Boletos vendidos y asistencia por ID de partido.
+    """
+    filas = conexion.execute("SELECT partido, COUNT(*), SUM(validado) FROM entrada GROUP BY partido")
+    return {partido: (vendidos, asistencia) for partido, vendidos, asistencia in filas}
+
+
+def clientes_top(conexion: sqlite3.Connection, n: int = 3) -> list[tuple[str, int]]:
+    """
+    Busca los clientes que han comprado más entradas.
+
+    Args:
+        conexion (sqlite3.Connection): Conexión a la base de datos.
+        n (int): Cantidad de clientes a retornar.
+
+    Returns:
+        list[tuple[str, int]]: Cliente (con el formato de Cliente.__str__) y cantidad de entradas.
+    """
+    return conexion.execute("""
+        SELECT c.nombre || ' - ' || c.cedula, COUNT(*) AS cantidad
+        FROM entrada e JOIN cliente c ON c.cedula = e.cedula
+        GROUP BY c.cedula ORDER BY cantidad DESC LIMIT ?
+    """, (n,)).fetchall()
+
+
+def restaurantes_top(conexion: sqlite3.Connection, n: int = 5) -> list[tuple[str, float]]:
+    """
+    Busca los restaurantes con más ventas.
+
+    Args:
+        conexion (sqlite3.Connection): Conexión a la base de datos.
+        n (int): Cantidad de restaurantes a retornar.
+
+    Returns:
+        list[tuple[str, float]]: Nombre del restaurante y total vendido.
+    """
+    return conexion.execute("""
+        SELECT restaurante, SUM(total) AS ventas FROM factura
+        GROUP BY restaurante ORDER BY ventas DESC LIMIT ?
+    """, (n,)).fetchall()
+
+
+def platos_top(conexion: sqlite3.Connection, n: int = 5, restaurante: str = None) -> list[tuple[str, int]]:
+    """
+    Busca los productos más vendidos, en general o en un restaurante.
+
+    Args:
+        conexion (sqlite3.Connection): Conexión a la base de datos.
+        n (int): Cantidad de productos a retornar.
+        restaurante (str): Nombre del restaurante, o None para considerar todos.
+
+    Returns:
+        list[tuple[str, int]]: Nombre del producto y cantidad vendida.
+    """
+    return conexion.execute("""
+        SELECT p.nombre, COUNT(*) AS cantidad
+        FROM factura_producto p JOIN factura f ON f.id = p.factura
+        WHERE ? IS NULL OR f.restaurante = ?
+        GROUP BY p.nombre ORDER BY cantidad DESC LIMIT ?
+    """, (restaurante, restaurante, n)).fetchall()
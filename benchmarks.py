@@ -0,0 +1,915 @@
+import sys
+import json
+import time
+import tempfile
+import random
+import threading
+import asyncio
+import os
+import subprocess
+import tracemalloc
+from collections import Counter
+from contextlib import chdir
+from snapshot import cargar_snapshot
+from generador import datos_sinteticos, escribir_snapshots, clientes_sinteticos, escribir_clientes, generar
+from cargar_api import CargarApi
+from partido import Partido, SinAsientosDisponibles, RetencionExpirada
+from equipo import Equipo
+from estadio import Estadio
+from restaurantes import Restaurante
+from inventario import StockInsuficiente
+from mapa_asientos import MapaAsientos
+from funciones_ayudante import find_item, numero_perfecto, es_numero_vampiro
+from funciones_partidos import buscar_por_id
+from gestion_datos import cargar_datos, guardar_datos
+from registro_clientes import ClienteRegistry
+from servicio import Servicio
+from estadisticas import Estadisticas
+from top_k import TopK
+from diario import diario_eventos
+from servidor import Servidor
+from generador_carga import generar_carga, imprimir_resultado
+from lotes import leer_comandos, ejecutar_lote
+from reporte import generar_reporte, FORMATOS
+import instrumentacion
+
+
+def _medir(funcion, repeticiones: int) -> float:
+    """
+    Mide el tiempo promedio de ejecución de una función.
+
+    Args:
+        funcion (function): Función sin argumentos a medir.
+        repeticiones (int): Número de veces que se ejecuta la función.
+
+    Returns:
+        float: Tiempo promedio en milisegundos.
+    """
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - inicio) / repeticiones * 1000
+
+
+def benchmark_snapshot(repeticiones: int = 20):
+    """
+    Compara el arranque leyendo la caché antigua con eval() contra el snapshot JSON con checksum.
+
+    Args:
+        repeticiones (int): Número de lecturas por formato.
+    """
+    equipos, estadios, partidos = datos_sinteticos(600, 60, 5000)
+    with tempfile.TemporaryDirectory() as directorio, chdir(directorio):
+        for nombre, data in [("equipos", equipos), ("estadios", estadios), ("partidos", partidos)]:
+            with open(f"{nombre}.txt", "w") as file:
+                file.write(str(data))
+        escribir_snapshots(equipos, estadios, partidos)
+
+        def leer_txt():
+            for nombre in ["equipos", "estadios", "partidos"]:
+                with open(f"{nombre}.txt", "r") as file:
+                    eval(file.read())
+
+        def leer_snapshot():
+            for nombre in ["equipos", "estadios", "partidos"]:
+                cargar_snapshot(f"{nombre}.json")
+
+        antes = _medir(leer_txt, repeticiones)
+        despues = _medir(leer_snapshot, repeticiones)
+    print(f"Caché eval(): {antes:.2f} ms | Snapshot JSON: {despues:.2f} ms | {antes / despues:.1f}x")
+
+
+def benchmark_indices(n_partidos: int = 5000):
+    """
+    Compara la resolución de partidos con find_item contra los índices por ID de CargarApi.
+
+    Args:
+        n_partidos (int): Número de partidos del fixture sintético.
+    """
+    equipos, estadios, partidos = datos_sinteticos(600, 60, n_partidos)
+    with tempfile.TemporaryDirectory() as directorio, chdir(directorio):
+        escribir_snapshots(equipos, estadios, partidos)
+        api = CargarApi()
+
+    def resolver_lineal():
+        for item in partidos:
+            local = find_item(api.equipos, lambda equipo: equipo.id == item['home']['id'])
+            visitante = find_item(api.equipos, lambda equipo: equipo.id == item['away']['id'])
+            estadio = find_item(api.estadios, lambda estadio: estadio.id == item['stadium_id'])
+            Partido(local, visitante, item['date'], estadio)
+
+    def resolver_indices():
+        api.partidos, api.partidos_por_id = [], {}
+        api.cargar_partidos(partidos)
+
+    ids = [partido.id for partido in api.partidos]
+
+    def buscar_lineal():
+        for partido_id in ids:
+            find_item(api.partidos, lambda partido: partido.id == partido_id)
+
+    def buscar_indices():
+        for partido_id in ids:
+            buscar_por_id(api, partido_id)
+
+    antes, despues = _medir(resolver_lineal, 1), _medir(resolver_indices, 1)
+    print(f"Carga de {n_partidos} partidos: find_item {antes:.1f} ms | índices {despues:.1f} ms | {antes / despues:.1f}x")
+    antes, despues = _medir(buscar_lineal, 1), _medir(buscar_indices, 1)
+    print(f"{len(ids)} búsquedas por ID: lineal {antes:.1f} ms | índice {despues:.1f} ms | {antes / despues:.1f}x")
+
+
+def benchmark_asientos(capacidad: tuple[int, int] = (4000, 60000)):
+    """
+    Compara la memoria y el tiempo de creación del mapa de asientos con diccionarios contra MapaAsientos.
+
+    Args:
+        capacidad (tuple[int, int]): Capacidad VIP y general del estadio.
+    """
+    letras = ["A", "B", "C", "D", "F", "G", "H", "I", "J", "K", "L", "M", "N", "O", "P"]
+
+    def con_diccionarios():
+        return ({f"v{letra}{num}": False for letra in letras for num in range(1, capacidad[0])},
+                {f"{letra}{num}": False for letra in letras for num in range(1, capacidad[1])})
+
+    def con_mapas():
+        return MapaAsientos("v", letras, capacidad[0] - 1), MapaAsientos("", letras, capacidad[1] - 1)
+
+    for nombre, funcion in [("Diccionarios", con_diccionarios), ("MapaAsientos", con_mapas)]:
+        tracemalloc.start()
+        inicio = time.perf_counter()
+        mapas = funcion()
+        tiempo = (time.perf_counter() - inicio) * 1000
+        memoria = tracemalloc.get_traced_memory()[0] / 2 ** 20
+        tracemalloc.stop()
+        del mapas
+        print(f"{nombre}: {tiempo:.1f} ms, {memoria:.2f} MiB por partido")
+
+
+def _numero_perfecto_lineal(n: int) -> bool:
+    """
+    Implementación anterior de numero_perfecto, usada como referencia.
+
+    Args:
+        n (int): Número a evaluar.
+
+    Returns:
+        bool: True si el número es perfecto, False en caso contrario.
+    """
+    suma = 0
+    for i in range(1, n):
+        if n % i == 0:
+            suma += i
+    return suma == n
+
+
+def benchmark_perfecto(cedulas: tuple[int, ...] = (12345678, 27548093, 33550336)):
+    """
+    Compara la latencia por factura del chequeo de número perfecto antes y después de la optimización.
+
+    Args:
+        cedulas (tuple[int, ...]): Cédulas de 8 dígitos a evaluar.
+    """
+    for n in range(1, 20000):
+        assert numero_perfecto(n) == _numero_perfecto_lineal(n), n
+    for cedula in cedulas:
+        antes = _medir(lambda: _numero_perfecto_lineal(cedula), 1)
+        despues = _medir(lambda: numero_perfecto(cedula), 10000)
+        print(f"Cédula {cedula}: lineal {antes:.1f} ms | actual {despues * 1000:.3f} µs por factura")
+
+
+def _es_numero_vampiro_permutaciones(n: int) -> bool:
+    """
+    Implementación anterior de es_numero_vampiro por permutaciones, usada como referencia.
+
+    Args:
+        n (int): Número a evaluar.
+
+    Returns:
+        bool: True si el número es vampiro, False en caso contrario.
+    """
+    def generate_combinations(s: str):
+        if len(s) <= 1:
+            return [s]
+        combinations = []
+        for i in range(len(s)):
+            for combo in generate_combinations(s[:i] + s[i+1:]):
+                combinations.append(s[i] + combo)
+        return combinations
+
+    n_str = str(n)
+    if len(n_str) % 2 != 0:
+        return False
+    for combo in generate_combinations(n_str):
+        mid = len(combo) // 2
+        num1, num2 = int(combo[:mid]), int(combo[mid:])
+        if num1 * num2 == n and not (num1 % 10 == 0 and num2 % 10 == 0):
+            return True
+    return False
+
+
+def benchmark_vampiro(muestras: int = 3000):
+    """
+    Verifica es_numero_vampiro contra la implementación por permutaciones y compara su latencia.
+
+    Args:
+        muestras (int): Número de valores aleatorios de 6 dígitos a verificar.
+    """
+    aleatorio = random.Random(2024)
+    valores = list(range(1, 10000)) + [aleatorio.randrange(10 ** 5, 10 ** 6) for _ in range(muestras)]
+    valores += [aleatorio.randrange(10 ** 7, 10 ** 8) for _ in range(30)] + [125460, 11420923, 1001795850]
+    for n in valores:
+        assert es_numero_vampiro.__wrapped__(n) == _es_numero_vampiro_permutaciones(n), n
+    print(f"{len(valores)} valores verificados contra la implementación anterior.")
+    for digitos, n in [(6, 123456), (8, 12345678), (10, 1234567890)]:
+        antes = _medir(lambda: _es_numero_vampiro_permutaciones(n), 1)
+        despues = _medir(lambda: es_numero_vampiro.__wrapped__(n), 20)
+        print(f"{digitos} dígitos: permutaciones {antes:.1f} ms | divisores {despues:.3f} ms | {antes / despues:.0f}x")
+
+
+def benchmark_hidratacion(n_clientes: int = 100_000):
+    """
+    Compara cargar_datos sobre un archivo con el formato anterior (literales de Python, precios recalculados)
+    contra el formato actual (JSON, precios restaurados).
+
+    Args:
+        n_clientes (int): Número de clientes del archivo de datos.
+    """
+    with tempfile.TemporaryDirectory() as directorio, chdir(directorio):
+        escribir_snapshots(*datos_sinteticos(capacidad=(800, 4000)))
+        for formato_anterior, nombre in [(True, "Formato anterior"), (False, "Formato actual")]:
+            api = CargarApi()
+            with open("datos_clientes.txt", "w") as file:
+                for cliente in clientes_sinteticos(api.partidos, n_clientes, formato_anterior):
+                    file.write(f"{cliente}\n" if formato_anterior else f"{json.dumps(cliente)}\n")
+            inicio = time.perf_counter()
+            clientes = cargar_datos(api, "texto")
+            tiempo = time.perf_counter() - inicio
+            print(f"{nombre}: {len(clientes)} clientes en {tiempo:.2f} s ({len(clientes) / tiempo:,.0f} clientes/s)")
+
+
+def benchmark_llenado(capacidad: tuple[int, int] = (4000, 60000), grupo: int = 4):
+    """
+    Llena un estadio a capacidad completa con el asignador de mejores asientos, de uno en uno y en grupos contiguos.
+
+    Args:
+        capacidad (tuple[int, int]): Capacidad VIP y general del estadio.
+        grupo (int): Tamaño de los grupos de asientos contiguos.
+    """
+    _, estadios, _ = datos_sinteticos(2, 1, 0, capacidad)
+    estadio = Estadio(estadios[0]["id"], estadios[0]["name"], estadios[0]["city"], estadios[0]["capacity"], [])
+    equipos = [Equipo("t0", "AAlandia", "AA", "A"), Equipo("t1", "ABlandia", "AB", "A")]
+    for nombre, cantidad in [("De uno en uno", 1), (f"En grupos de {grupo}", grupo)]:
+        partido = Partido(equipos[0], equipos[1], "2024-06-14", estadio)
+        inicio = time.perf_counter()
+        vendidos = 0
+        for vip in [True, False]:
+            try:
+                while True:
+                    vendidos += len(partido.asignar_asientos_contiguos(vip, cantidad))
+            except SinAsientosDisponibles:
+                pass
+        tiempo = time.perf_counter() - inicio
+        print(f"{nombre}: {vendidos} asientos en {tiempo:.2f} s ({vendidos / tiempo:,.0f} asientos/s)")
+
+
+def benchmark_retenciones(hilos: int = 16, capacidad: tuple[int, int] = (400, 4000), ttl: float = 0.005):
+    """
+    Prueba de estrés de varios vendedores concurrentes que retienen, confirman, cancelan o abandonan asientos de un mismo partido.
+
+    Al terminar verifica que ningún asiento se haya vendido dos veces y que los asientos ocupados coincidan con los vendidos.
+
+    Args:
+        hilos (int): Cantidad de vendedores concurrentes.
+        capacidad (tuple[int, int]): Capacidad VIP y general del estadio.
+        ttl (float): Segundos que dura cada retención.
+    """
+    _, estadios, _ = datos_sinteticos(2, 1, 0, capacidad)
+    estadio = Estadio(estadios[0]["id"], estadios[0]["name"], estadios[0]["city"], estadios[0]["capacity"], [])
+    partido = Partido(Equipo("t0", "AAlandia", "AA", "A"), Equipo("t1", "ABlandia", "AB", "A"), "2024-06-14", estadio)
+    vendidos = {True: [], False: []}
+    resultados = {"confirmadas": 0, "canceladas": 0, "abandonadas": 0, "expiradas": 0}
+    lock = threading.Lock()
+
+    def vendedor(semilla: int):
+        rng = random.Random(semilla)
+        propios = {True: [], False: []}
+        conteo = dict.fromkeys(resultados, 0)
+        for vip in [True, False]:
+            while True:
+                try:
+                    retencion = partido.retener_asiento(vip, ttl=ttl)
+                except SinAsientosDisponibles:
+                    mapa = partido.mapa_asientos_vip if vip else partido.mapa_asientos_general
+                    if mapa.ocupados == len(mapa):
+                        break
+                    continue
+                accion = rng.random()
+                if accion < 0.1:
+                    conteo["abandonadas"] += 1
+                elif accion < 0.25:
+                    partido.liberar_retencion(retencion)
+                    conteo["canceladas"] += 1
+                else:
+                    if accion < 0.3:
+                        time.sleep(ttl * 2)
+                    try:
+                        propios[vip].append(partido.confirmar_retencion(retencion))
+                        conteo["confirmadas"] += 1
+                    except RetencionExpirada:
+                        conteo["expiradas"] += 1
+        with lock:
+            for vip in propios:
+                vendidos[vip].extend(propios[vip])
+            for clave in conteo:
+                resultados[clave] += conteo[clave]
+
+    inicio = time.perf_counter()
+    trabajadores = [threading.Thread(target=vendedor, args=(semilla,)) for semilla in range(hilos)]
+    for trabajador in trabajadores:
+        trabajador.start()
+    for trabajador in trabajadores:
+        trabajador.join()
+    tiempo = time.perf_counter() - inicio
+    time.sleep(ttl)
+    for vip, mapa in [(True, partido.mapa_asientos_vip), (False, partido.mapa_asientos_general)]:
+        assert len(vendidos[vip]) == len(set(vendidos[vip])), "asiento vendido dos veces"
+        assert mapa.ocupados == len(vendidos[vip]) == len(mapa), "ocupados no coincide con vendidos"
+        assert mapa.disponibles() == 0 and mapa.retenidos == 0
+    total = len(vendidos[True]) + len(vendidos[False])
+    print(f"{hilos} vendedores: {total} asientos vendidos en {tiempo:.2f} s ({total / tiempo:,.0f} asientos/s), "
+          + ", ".join(f"{clave}: {valor}" for clave, valor in resultados.items()))
+
+
+def benchmark_servicio(operaciones: int = 30_000):
+    """
+    Mide las operaciones por segundo del servicio sin interacción: venta de entradas, validación y facturas de restaurante.
+
+    Args:
+        operaciones (int): Cantidad de entradas a vender; cada una se valida y las VIP compran en un restaurante.
+    """
+    with tempfile.TemporaryDirectory() as directorio, chdir(directorio):
+        escribir_snapshots(*datos_sinteticos(capacidad=(800, 4000)))
+        servicio = Servicio(CargarApi(), ClienteRegistry())
+        partidos = [partido.id for partido in servicio.api.partidos]
+        tiempos = {}
+        inicio = time.perf_counter()
+        entradas = [servicio.vender_entrada(10_000_000 + i, partidos[i % len(partidos)], "vip" if i % 4 == 0 else "general",
+                                            nombre=f"Cliente {i}", edad=18 + i % 60) for i in range(operaciones)]
+        tiempos["venta"] = (len(entradas), time.perf_counter() - inicio)
+        inicio = time.perf_counter()
+        for entrada in entradas:
+            servicio.validar_entrada(entrada.codigo)
+        tiempos["validación"] = (len(entradas), time.perf_counter() - inicio)
+        vip = [entrada for entrada in entradas if entrada.tipo == "vip"]
+        inicio = time.perf_counter()
+        for i, entrada in enumerate(vip):
+            restaurante = entrada.partido.estadio.restaurantes[i % len(entrada.partido.estadio.restaurantes)]
+            servicio.crear_factura(entrada.cliente.cedula, restaurante.nombre, ["Producto 0", "Producto 2"], entrada.codigo)
+        tiempos["factura"] = (len(vip), time.perf_counter() - inicio)
+        diario_eventos.truncar()
+    for nombre, (cantidad, tiempo) in tiempos.items():
+        print(f"{nombre}: {cantidad} operaciones en {tiempo:.2f} s ({cantidad / tiempo:,.0f} op/s)")
+
+
+def benchmark_servidor(peticiones: int = 10_000, conexiones: int = 32):
+    """
+    Levanta el servidor HTTP en un puerto libre sobre datos sintéticos y mide peticiones por segundo y latencia p99 con el generador de carga.
+
+    Args:
+        peticiones (int): Cantidad total de peticiones.
+        conexiones (int): Cantidad de conexiones concurrentes.
+    """
+    async def medir():
+        servidor = Servidor(Servicio(CargarApi(), ClienteRegistry()))
+        servidor_asyncio = await servidor.iniciar("127.0.0.1", 0)
+        async with servidor_asyncio:
+            return await generar_carga("127.0.0.1", servidor_asyncio.sockets[0].getsockname()[1], peticiones, conexiones)
+
+    with tempfile.TemporaryDirectory() as directorio, chdir(directorio):
+        escribir_snapshots(*datos_sinteticos(capacidad=(800, 4000)))
+        imprimir_resultado(asyncio.run(medir()))
+        diario_eventos.truncar()
+
+
+def benchmark_lotes(n_comandos: int = 20_000, guardar_cada: int = 5000):
+    """
+    Mide los comandos por segundo del modo por lotes sobre un archivo JSONL de compras, validaciones y facturas.
+
+    Args:
+        n_comandos (int): Cantidad aproximada de comandos del archivo.
+        guardar_cada (int): Cantidad de comandos exitosos entre dos guardados.
+    """
+    with tempfile.TemporaryDirectory() as directorio, chdir(directorio):
+        escribir_snapshots(*datos_sinteticos(capacidad=(800, 4000)))
+        api = CargarApi()
+        with open("comandos.jsonl", "w") as file:
+            for i in range(n_comandos // 3):
+                partido = api.partidos[i % len(api.partidos)]
+                cedula = 10_000_000 + i
+                comandos = [{"operacion": "comprar", "cedula": cedula, "nombre": f"Cliente {i}", "edad": 30, "partido": partido.id, "tipo": "vip"},
+                            {"operacion": "validar", "codigo": f"{partido.mapa_asientos_vip.codigo(i // len(api.partidos))} {partido.id}"},
+                            {"operacion": "restaurante", "cedula": cedula, "restaurante": partido.estadio.restaurantes[i % 3].nombre, "productos": ["Producto 0"]}]
+                file.writelines(json.dumps(comando) + "\n" for comando in comandos)
+        with open(os.devnull, "w") as salida:
+            resultado = ejecutar_lote(Servicio(api, ClienteRegistry()), leer_comandos("comandos.jsonl"), salida, guardar_cada)
+    print(f"{resultado['comandos']} comandos ({resultado['fallidos']} fallidos) en {resultado['segundos']:.2f} s: "
+          f"{resultado['comandos_por_segundo']:,.0f} comandos/s")
+
+
+def benchmark_busqueda(n_partidos: int = 5000, repeticiones: int = 200):
+    """
+    Compara las búsquedas de partidos por país, estadio y fecha recorriendo todos los partidos contra los índices de CargarApi.
+
+    Args:
+        n_partidos (int): Número de partidos cargados.
+        repeticiones (int): Número de búsquedas por método.
+    """
+    with tempfile.TemporaryDirectory() as directorio, chdir(directorio):
+        escribir_snapshots(*datos_sinteticos(600, 60, n_partidos))
+        api = CargarApi()
+    equipo, estadio = api.equipos[7], api.estadios[7]
+    fecha = api.fechas[len(api.fechas) // 2]
+    texto_fecha = str(fecha)
+    casos = {
+        "país": (lambda: [p for p in api.partidos if p.equipo_local.nombre == equipo.nombre or p.equipo_visitante.nombre == equipo.nombre],
+                 lambda: api.partidos_de_equipo(equipo.id)),
+        "estadio": (lambda: [p for p in api.partidos if p.estadio.nombre == estadio.nombre],
+                    lambda: api.partidos_en_estadio(estadio.id)),
+        "fecha": (lambda: (sorted({p.fecha for p in api.partidos}, key=lambda x: x[4:]),
+                           [p for p in api.partidos if p.fecha.startswith(texto_fecha)]),
+                  lambda: (api.fechas, api.partidos_en_fecha(fecha))),
+    }
+    for nombre, (recorrido, indice) in casos.items():
+        antes, despues = _medir(recorrido, repeticiones), _medir(indice, repeticiones)
+        print(f"Por {nombre}: recorrido {antes * 1000:.1f} µs | índice {despues * 1000:.2f} µs | {antes / despues:,.0f}x")
+    rango = _medir(lambda: api.partidos_entre(api.fechas[10], api.fechas[12]), repeticiones)
+    print(f"Rango de 3 fechas: {len(api.partidos_entre(api.fechas[10], api.fechas[12]))} partidos en {rango * 1000:.1f} µs")
+
+
+def benchmark_menu(n_productos: int = 20_000, repeticiones: int = 200):
+    """
+    Compara las búsquedas de productos de un restaurante recorriendo el catálogo contra los índices por precio, tipo y nombre.
+
+    Args:
+        n_productos (int): Número de productos del catálogo.
+        repeticiones (int): Número de búsquedas por método.
+    """
+    rng = random.Random(0)
+    palabras = ["pizza", "burger", "cerveza", "agua", "combo", "hot dog", "nachos", "refresco", "vino", "papas"]
+    restaurante = Restaurante("Benchmark", [{"name": f"{rng.choice(palabras).title()} {i}", "quantity": "1", "price": str(round(rng.uniform(1, 50), 2)),
+                                             "stock": 100, "adicional": rng.choice(["plate", "alcoholic", "non-alcoholic", "package"])}
+                                            for i in range(n_productos)])
+    casos = {
+        "precio": (lambda: [p for p in restaurante.productos if 10 < p.precio < 10.5], lambda: restaurante.buscar_por_precio(10, 10.5)),
+        "tipo": (lambda: [p for p in restaurante.productos if p.tipo == "Paquete"], lambda: restaurante.buscar_por_tipo("Paquete")),
+        "nombre": (lambda: [p for p in restaurante.productos if "zza 12" in p.nombre.lower()], lambda: restaurante.buscar_por_nombre("zza 12")),
+    }
+    for nombre, (recorrido, indice) in casos.items():
+        assert sorted(p.nombre for p in recorrido()) == sorted(p.nombre for p in indice())
+        antes, despues = _medir(recorrido, repeticiones), _medir(indice, repeticiones)
+        print(f"Por {nombre}: recorrido {antes * 1000:.1f} µs | índice {despues * 1000:.1f} µs | {antes / despues:,.1f}x ({len(indice())} resultados)")
+
+
+def benchmark_inventario(hilos: int = 16, n_productos: int = 20, stock: int = 2000):
+    """
+    Prueba de estrés de compras concurrentes en un mismo restaurante que reservan canastas de varios productos y las confirman o cancelan.
+
+    Al terminar verifica que no se haya vendido ninguna unidad de más, que las unidades confirmadas coincidan con el
+    stock descontado y que el stock se conserve al guardar y volver a cargar los datos.
+
+    Args:
+        hilos (int): Cantidad de compradores concurrentes.
+        n_productos (int): Número de productos del restaurante.
+        stock (int): Stock inicial de cada producto.
+    """
+    restaurante = Restaurante("Benchmark", [{"name": f"Producto {j}", "quantity": "1", "price": "5", "stock": stock, "adicional": "plate"}
+                                            for j in range(n_productos)])
+    inventario = restaurante.inventario
+    nombres = [producto.nombre for producto in restaurante.productos]
+    vendidos = dict.fromkeys(nombres, 0)
+    resultados = {"confirmadas": 0, "canceladas": 0, "rechazadas": 0}
+    lock = threading.Lock()
+
+    def comprador(semilla: int):
+        rng = random.Random(semilla)
+        propios = dict.fromkeys(nombres, 0)
+        conteo = dict.fromkeys(resultados, 0)
+        while any(producto.stock for producto in restaurante.productos):
+            canasta = {}
+            for nombre in rng.sample(nombres, rng.randint(1, 4)):
+                canasta[nombre] = rng.randint(1, 3)
+            try:
+                reserva = inventario.reservar(canasta)
+            except StockInsuficiente:
+                conteo["rechazadas"] += 1
+                continue
+            if rng.random() < 0.2:
+                inventario.cancelar(reserva)
+                conteo["canceladas"] += 1
+                continue
+            inventario.confirmar(reserva)
+            conteo["confirmadas"] += 1
+            for nombre, cantidad in canasta.items():
+                propios[nombre] += cantidad
+        with lock:
+            for nombre in propios:
+                vendidos[nombre] += propios[nombre]
+            for clave in conteo:
+                resultados[clave] += conteo[clave]
+
+    inicio = time.perf_counter()
+    trabajadores = [threading.Thread(target=comprador, args=(semilla,)) for semilla in range(hilos)]
+    for trabajador in trabajadores:
+        trabajador.start()
+    for trabajador in trabajadores:
+        trabajador.join()
+    tiempo = time.perf_counter() - inicio
+    for producto in restaurante.productos:
+        assert producto.stock == 0, "stock negativo o sin vender"
+        assert vendidos[producto.nombre] == stock, "unidades vendidas no coinciden con el stock"
+    assert all(inventario.disponible(nombre) == 0 for nombre in nombres)
+    print(f"{hilos} compradores: {n_productos * stock} unidades vendidas en {tiempo:.2f} s ({resultados['confirmadas'] / tiempo:,.0f} canastas/s), "
+          + ", ".join(f"{clave}: {valor}" for clave, valor in resultados.items()))
+
+    with tempfile.TemporaryDirectory() as directorio, chdir(directorio):
+        escribir_snapshots(*datos_sinteticos())
+        servicio = Servicio(CargarApi(), ClienteRegistry())
+        entradas = [servicio.vender_entrada(10_000_000 + i, partido.id, "vip", nombre=f"Cliente {i}", edad=30)
+                    for i, partido in enumerate(servicio.api.partidos)]
+        for entrada in entradas:
+            servicio.crear_factura(entrada.cliente.cedula, entrada.partido.estadio.restaurantes[0].nombre, ["Producto 0", "Producto 0", "Producto 3"])
+        antes = {restaurante.nombre: restaurante.inventario.estado() for restaurante in servicio.api.restaurantes_por_nombre.values()}
+        recargada = CargarApi()
+        cargar_datos(recargada)
+        assert antes == {restaurante.nombre: restaurante.inventario.estado() for restaurante in recargada.restaurantes_por_nombre.values()}, "stock distinto al reaplicar el diario"
+        guardar_datos(servicio.clientes, api=servicio.api)
+        recargada = CargarApi()
+        cargar_datos(recargada)
+        assert antes == {restaurante.nombre: restaurante.inventario.estado() for restaurante in recargada.restaurantes_por_nombre.values()}, "stock distinto al recargar"
+        diario_eventos.truncar()
+    print(f"Stock conservado al reaplicar el diario y al recargar ({len(entradas)} facturas)")
+
+
+def _estadisticas_recorrido(api: CargarApi) -> dict:
+    """
+    Calcula las estadísticas recorriendo todos los partidos, entradas y facturas, como antes del acumulador.
+
+    Args:
+        api (CargarApi): Instancia de CargarApi con las entradas registradas.
+
+    Returns:
+        dict: Gasto VIP promedio, entradas y asistencia por partido, clientes top, unidades por producto (en total
+            y por restaurante) y ventas por restaurante.
+    """
+    gastos = []
+    clientes = Counter()
+    unidades, ventas = Counter(), Counter()
+    por_restaurante = {}
+    conteos = {}
+    for partido in api.partidos:
+        conteos[partido.id] = (len(partido.entradas), partido.asistencia)
+        for entrada in partido.entradas:
+            clientes[str(entrada.cliente)] += 1
+            if entrada.tipo == "vip":
+                entrada.calcular_gastos()
+                gastos.append(entrada.gastos_totales)
+            for factura in entrada.compras:
+                for producto in factura.productos:
+                    unidades[producto.nombre] += 1
+                    por_restaurante.setdefault(factura.restaurante.nombre, Counter())[producto.nombre] += 1
+                ventas[factura.restaurante.nombre] += factura.total
+    return {"gasto_vip": sum(gastos) / len(gastos) if gastos else 0, "partidos": conteos, "clientes": clientes.most_common(3),
+            "unidades": dict(unidades), "por_restaurante": {nombre: dict(platos) for nombre, platos in por_restaurante.items()}, "ventas": dict(ventas)}
+
+
+def benchmark_estadisticas(n_clientes: int = 100_000, operaciones: int = 2000):
+    """
+    Compara el cálculo de las estadísticas recorriendo todas las entradas contra la lectura del acumulador,
+    después de cargar datos guardados y de vender, validar y facturar en vivo.
+
+    Args:
+        n_clientes (int): Número de clientes del archivo de datos.
+        operaciones (int): Cantidad de entradas VIP vendidas, validadas y facturadas después de la carga.
+    """
+    with tempfile.TemporaryDirectory() as directorio, chdir(directorio):
+        escribir_snapshots(*datos_sinteticos(capacidad=(8000, 8000)))
+        api = CargarApi()
+        escribir_clientes(clientes_sinteticos(api.partidos, n_clientes))
+        servicio = Servicio(api, cargar_datos(api, "texto"))
+        for i in range(operaciones):
+            partido = api.partidos[i % len(api.partidos)]
+            entrada = servicio.vender_entrada(20_000_000 + i, partido.id, "vip", nombre=f"Cliente {i}", edad=30)
+            servicio.validar_entrada(entrada.codigo)
+            servicio.crear_factura(entrada.cliente.cedula, partido.estadio.restaurantes[1].nombre, ["Producto 1", "Producto 4"])
+        diario_eventos.truncar()
+
+    def acumulado() -> dict:
+        estadisticas = Estadisticas(api)
+        return {"gasto_vip": estadisticas.gastos_vip_promedio(), "partidos": {partido.id: api.acumulador.conteo_partido(partido.id) for partido in api.partidos},
+                "clientes": estadisticas.clientes_top(), "unidades": dict(api.acumulador.platos_top()),
+                "por_restaurante": {nombre: dict(platos) for nombre, platos in estadisticas.platos_por_restaurante(len(api.restaurantes_por_nombre)).items()},
+                "ventas": dict(api.acumulador.restaurantes_top(None))}
+
+    recorrido, lectura = _estadisticas_recorrido(api), acumulado()
+    assert abs(recorrido.pop("gasto_vip") - lectura.pop("gasto_vip")) < 1e-6
+    assert [cantidad for _, cantidad in recorrido.pop("clientes")] == [cantidad for _, cantidad in lectura.pop("clientes")]
+    assert recorrido["ventas"].keys() == lectura["ventas"].keys()
+    assert all(abs(recorrido["ventas"][nombre] - lectura["ventas"][nombre]) < 1e-6 for nombre in recorrido["ventas"])
+    assert {k: v for k, v in recorrido.items() if k != "ventas"} == {k: v for k, v in lectura.items() if k != "ventas"}
+    antes, despues = _medir(lambda: _estadisticas_recorrido(api), 3), _medir(acumulado, 3)
+    print(f"{len(api.entradas_por_codigo)} entradas: recorrido {antes:.1f} ms | acumulador {despues:.3f} ms | {antes / despues:,.0f}x")
+
+
+def benchmark_topk(n_claves: int = 200_000, incrementos: int = 1_000_000, n: int = 10, repeticiones: int = 50):
+    """
+    Compara los n mayores de un TopK, mantenidos al incrementar, contra Counter.most_common sobre todos los conteos.
+
+    Los incrementos siguen una distribución sesgada, como las compras de clientes frecuentes o los platos populares.
+
+    Args:
+        n_claves (int): Cantidad de claves distintas.
+        incrementos (int): Cantidad de incrementos.
+        n (int): Cantidad de claves mayores a consultar.
+        repeticiones (int): Número de consultas por método.
+    """
+    rng = random.Random(0)
+    claves = [f"Cliente {int(n_claves * rng.random() ** 3)}" for _ in range(incrementos)]
+    conteos, top = Counter(), TopK(n)
+    inicio = time.perf_counter()
+    for clave in claves:
+        top.incrementar(clave)
+    tiempo = time.perf_counter() - inicio
+    conteos.update(claves)
+    assert [conteo for _, conteo in top.top(n)] == [conteo for _, conteo in conteos.most_common(n)]
+    antes, despues = _medir(lambda: conteos.most_common(n), repeticiones), _medir(lambda: top.top(n), repeticiones)
+    print(f"{incrementos} incrementos en {tiempo:.2f} s ({incrementos / tiempo:,.0f}/s), {len(top)} claves: "
+          f"most_common {antes * 1000:.1f} µs | TopK {despues * 1000:.1f} µs | {antes / despues:,.0f}x")
+
+
+def benchmark_arranque(presupuesto_ms: float = 150, repeticiones: int = 5):
+    """
+    Mide con `python -X importtime` el tiempo de importar main.py y verifica que quede dentro del presupuesto
+    de arranque y que no cargue pandas, matplotlib ni requests.
+
+    Args:
+        presupuesto_ms (float): Tiempo máximo de importación de main.py, en milisegundos.
+        repeticiones (int): Cantidad de arranques medidos; se toma el más rápido.
+    """
+    tiempos = []
+    for _ in range(repeticiones):
+        proceso = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"], capture_output=True, text=True,
+                                 cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+        modulos = {}
+        for linea in proceso.stderr.splitlines():
+            if linea.startswith("import time:") and "|" in linea:
+                _, acumulado, nombre = linea.split("|")
+                if acumulado.strip().isdigit():
+                    modulos[nombre.strip()] = int(acumulado) / 1000
+        pesados = [nombre for nombre in ["pandas", "matplotlib", "requests"] if nombre in modulos]
+        assert not pesados, f"main.py importa {', '.join(pesados)} al arrancar"
+        tiempos.append(modulos["main"])
+    mejor = min(tiempos)
+    assert mejor <= presupuesto_ms, f"importar main.py tarda {mejor:.1f} ms (presupuesto {presupuesto_ms} ms)"
+    print(f"Importar main.py: {mejor:.1f} ms (presupuesto {presupuesto_ms} ms), sin pandas, matplotlib ni requests")
+
+
+def benchmark_reporte(n_clientes: int = 100_000):
+    """
+    Mide la generación del reporte de estadísticas sin interfaz gráfica, dibujando los gráficos en un solo
+    proceso y en un grupo de procesos, en PNG y en SVG.
+
+    Args:
+        n_clientes (int): Número de clientes del archivo de datos.
+    """
+    with tempfile.TemporaryDirectory() as directorio, chdir(directorio):
+        escribir_snapshots(*datos_sinteticos(capacidad=(8000, 8000)))
+        api = CargarApi()
+        escribir_clientes(clientes_sinteticos(api.partidos, n_clientes))
+        cargar_datos(api, "texto")
+        estadisticas = Estadisticas(api)
+        for formato in FORMATOS:
+            for procesos in [1, None]:
+                inicio = time.perf_counter()
+                indice = generar_reporte(estadisticas, f"reporte_{formato}_{procesos}", formato, procesos)
+                tiempo = time.perf_counter() - inicio
+                imagenes = [nombre for nombre in os.listdir(os.path.dirname(indice)) if nombre.endswith(formato)]
+                assert len(imagenes) == 4, "faltan gráficos en el reporte"
+                print(f"{formato.upper()} con {procesos or 'un proceso por gráfico'}{' proceso' if procesos == 1 else ''}: {tiempo:.2f} s")
+        diario_eventos.truncar()
+
+
+def _resumen_estadisticas(estadisticas: Estadisticas) -> dict:
+    """
+    Reúne todas las consultas de Estadisticas, para comparar dos fuentes.
+
+    Args:
+        estadisticas (Estadisticas): Estadísticas a consultar.
+
+    Returns:
+        dict: Resultado de cada consulta, con los montos redondeados y los empates sin orden.
+    """
+    restaurantes, platos = estadisticas.platos_top(50)
+    return {"gasto_vip": round(estadisticas.gastos_vip_promedio(), 6),
+            "gastos_top": [round(gasto, 6) for gasto, _ in estadisticas._grafico_gastos_vip()[1][0]],
+            "asistencia": sorted(map(tuple, estadisticas.filas_asistencia())),
+            "clientes_top": [cantidad for _, cantidad in estadisticas.clientes_top(10)],
+            "restaurantes_top": sorted((nombre, round(total, 6)) for nombre, total in restaurantes),
+            "platos_top": sorted(platos),
+            "platos_por_restaurante": {nombre: sorted(lista) for nombre, lista in estadisticas.platos_por_restaurante(50).items()}}
+
+
+def benchmark_columnas(n_clientes: int = 100_000, n_entradas: int = 2_000_000):
+    """
+    Verifica que las estadísticas del almacén columnar coincidan con las del acumulador sobre datos cargados
+    y mide la carga y las consultas vectorizadas con millones de entradas.
+
+    Args:
+        n_clientes (int): Número de clientes del archivo de datos para la verificación.
+        n_entradas (int): Número de entradas sintéticas para medir el almacén columnar.
+    """
+    from types import SimpleNamespace
+    from columnas import AlmacenColumnar
+    with tempfile.TemporaryDirectory() as directorio, chdir(directorio):
+        escribir_snapshots(*datos_sinteticos(capacidad=(8000, 8000)))
+        api = CargarApi()
+        escribir_clientes(clientes_sinteticos(api.partidos, n_clientes))
+        servicio = Servicio(api, cargar_datos(api, "texto"))
+        api.activar_columnas()
+        for i in range(2000):
+            partido = api.partidos[i % len(api.partidos)]
+            entrada = servicio.vender_entrada(20_000_000 + i % 700, partido.id, "vip", nombre=f"Cliente {i % 700}", edad=30)
+            servicio.validar_entrada(entrada.codigo)
+            servicio.crear_factura(entrada.cliente.cedula, partido.estadio.restaurantes[1].nombre, ["Producto 1", "Producto 4", "Producto 4"], entrada.codigo)
+        diario_eventos.truncar()
+    columnar, acumulado = Estadisticas(api), Estadisticas(api)
+    acumulado.fuente = api.acumulador
+    assert _resumen_estadisticas(columnar) == _resumen_estadisticas(acumulado), "el almacén columnar no coincide con el acumulador"
+    print(f"{len(api.columnas)} entradas: estadísticas del almacén columnar iguales a las del acumulador")
+
+    rng = random.Random(0)
+    partidos = [SimpleNamespace(id=f"P{i}") for i in range(64)]
+    restaurantes = [SimpleNamespace(nombre=f"Restaurante {i}") for i in range(40)]
+    productos = [SimpleNamespace(nombre=f"Producto {i}") for i in range(200)]
+    almacen = AlmacenColumnar()
+    inicio = time.perf_counter()
+    for i in range(n_entradas):
+        vip = i % 4 == 0
+        entrada = SimpleNamespace(partido=partidos[i % len(partidos)], tipo="vip" if vip else "general", factura={"total": 87.0 if vip else 40.6},
+                                  validado=i % 3 == 0, cliente=f"Cliente {int(n_entradas / 3 * rng.random() ** 2)}", codigo=f"E{i}", compras=[])
+        almacen.registrar_entrada(entrada)
+        if vip:
+            elegidos = rng.sample(productos, 3)
+            almacen.registrar_factura(SimpleNamespace(entrada=entrada, restaurante=rng.choice(restaurantes), total=30.0,
+                                                      cantidades=lambda elegidos=elegidos: {producto.nombre: 1 for producto in elegidos}))
+    carga = time.perf_counter() - inicio
+    consultas = {
+        "gasto VIP promedio": almacen.gasto_vip_promedio,
+        "5 gastos VIP mayores": lambda: almacen.gastos_top(5),
+        "asistencia por partido": almacen.conteos_partidos,
+        "3 clientes top": lambda: almacen.clientes_top(3),
+        "restaurantes y platos top": lambda: (almacen.restaurantes_top(5), almacen.platos_top(5)),
+        "platos de 5 restaurantes": lambda: [almacen.platos_top(None, nombre) for nombre, _ in almacen.restaurantes_top(5)],
+    }
+    print(f"{n_entradas} entradas cargadas en {carga:.1f} s ({n_entradas / carga:,.0f} entradas/s)")
+    for nombre, consulta in consultas.items():
+        print(f"{nombre}: {_medir(consulta, 5):.1f} ms")
+
+
+def benchmark_suite(n_clientes: int = 50_000, operaciones: int = 5000, salida: str = "benchmark_suite.json"):
+    """
+    Mide las operaciones principales sobre un torneo sintético y guarda los resultados en JSON para comparar corridas.
+
+    Se miden la carga de la API, cargar_datos, la compra y la validación de entradas, la compra en
+    restaurantes, guardar_datos y las estadísticas. Cada corrida se agrega al historial del archivo de
+    salida y se compara con la anterior.
+
+    Args:
+        n_clientes (int): Número de clientes guardados del torneo sintético.
+        operaciones (int): Cantidad de entradas vendidas y validadas durante la medición; las VIP compran en un restaurante.
+        salida (str): Archivo JSON con el historial de corridas.
+    """
+    salida = os.path.abspath(salida)
+    resultados = {}
+
+    def medir(nombre: str, funcion, cantidad: int = 1):
+        inicio = time.perf_counter()
+        valor = funcion()
+        tiempo = time.perf_counter() - inicio
+        resultados[nombre] = {"operaciones": cantidad, "segundos": tiempo, "por_segundo": cantidad / tiempo if tiempo else 0}
+        return valor
+
+    with tempfile.TemporaryDirectory() as directorio, chdir(directorio):
+        escala = generar(".", n_clientes=n_clientes, capacidad=(0, -(-(n_clientes + operaciones) // 51)))
+        api = medir("cargar_api", CargarApi)
+        servicio = Servicio(api, medir("cargar_datos", lambda: cargar_datos(api, "texto"), n_clientes))
+        partidos = [partido.id for partido in api.partidos]
+        entradas = medir("comprar_entrada", lambda: [servicio.vender_entrada(40_000_000 + i, partidos[i % len(partidos)], "vip" if i % 4 == 0 else "general",
+                                                                             nombre=f"Cliente {i}", edad=18 + i % 60) for i in range(operaciones)], operaciones)
+        medir("validar_entrada", lambda: [servicio.validar_entrada(entrada.codigo) for entrada in entradas], operaciones)
+        vip = [entrada for entrada in entradas if entrada.tipo == "vip"]
+        medir("factura_restaurante", lambda: [servicio.crear_factura(entrada.cliente.cedula, entrada.partido.estadio.restaurantes[i % 3].nombre,
+                                                                    ["Producto 0", "Producto 2"], entrada.codigo) for i, entrada in enumerate(vip)], len(vip))
+        medir("guardar_datos", lambda: guardar_datos(servicio.clientes, "texto", api), len(servicio.clientes))
+        estadisticas = Estadisticas(api)
+        medir("estadisticas", lambda: (estadisticas.gastos_vip_promedio(), estadisticas.asistencia_partidos(), estadisticas.clientes_top(),
+                                       estadisticas.platos_top(), estadisticas.platos_por_restaurante()))
+        diario_eventos.truncar()
+
+    historial = []
+    if os.path.exists(salida):
+        with open(salida, "r", encoding="utf-8") as file:
+            historial = json.load(file)
+    anterior = historial[-1]["resultados"] if historial else {}
+    for nombre, resultado in resultados.items():
+        cambio = ""
+        if nombre in anterior and anterior[nombre]["segundos"]:
+            cambio = f" ({(resultado['segundos'] / anterior[nombre]['segundos'] - 1) * 100:+.1f}% vs anterior)"
+        print(f"{nombre}: {resultado['operaciones']} en {resultado['segundos']:.3f} s ({resultado['por_segundo']:,.0f}/s){cambio}")
+    historial.append({"fecha": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": sys.version.split()[0], "escala": escala, "resultados": resultados})
+    with open(salida, "w", encoding="utf-8") as file:
+        json.dump(historial, file, indent=2)
+    print(f"Resultados guardados en {salida}")
+
+
+def benchmark_instrumentacion(operaciones: int = 20_000, llamadas: int = 1_000_000):
+    """
+    Mide el costo de la instrumentación: por llamada sobre una función vacía, y sobre la venta de entradas
+    con la instrumentación desactivada (la función sin envolver) y activada.
+
+    Args:
+        operaciones (int): Cantidad de entradas vendidas en cada medición.
+        llamadas (int): Cantidad de llamadas a la función vacía.
+    """
+    activa = instrumentacion.ACTIVA
+
+    def envolver(funcion, encendida: bool):
+        instrumentacion.ACTIVA = encendida
+        try:
+            return instrumentacion.medir(funcion)
+        finally:
+            instrumentacion.ACTIVA = activa
+
+    def vacia():
+        pass
+
+    assert envolver(vacia, False) is vacia or instrumentacion.PERFIL == vacia.__qualname__, "la instrumentación apagada envuelve la función"
+    vender = getattr(Servicio.vender_entrada, "__wrapped__", Servicio.vender_entrada)
+    with tempfile.TemporaryDirectory() as directorio, chdir(directorio):
+        escribir_snapshots(*datos_sinteticos(capacidad=(0, -(-2 * operaciones // 51))))
+        servicio = Servicio(CargarApi(), ClienteRegistry())
+        partidos = [partido.id for partido in servicio.api.partidos]
+        tiempos, costos = {}, {}
+        for nombre, encendida in [("apagada", False), ("activa", True)]:
+            funcion = envolver(vacia, encendida)
+            inicio = time.perf_counter()
+            for _ in range(llamadas):
+                funcion()
+            costos[nombre] = por_llamada = (time.perf_counter() - inicio) / llamadas * 1e9
+            funcion = envolver(vender, encendida)
+            base = 30_000_000 if encendida else 20_000_000
+            inicio = time.perf_counter()
+            for i in range(operaciones):
+                funcion(servicio, base + i, partidos[i % len(partidos)], "general", nombre=f"Cliente {i}", edad=30)
+            tiempos[nombre] = time.perf_counter() - inicio
+            print(f"Instrumentación {nombre}: {por_llamada:,.0f} ns por llamada vacía | {operaciones} ventas en {tiempos[nombre]:.3f} s "
+                  f"({operaciones / tiempos[nombre]:,.0f}/s)")
+        diario_eventos.truncar()
+    histograma = instrumentacion.histogramas.pop("Servicio.vender_entrada", None)
+    instrumentacion.histogramas.pop(vacia.__qualname__, None)
+    assert histograma is not None and histograma.llamadas >= operaciones
+    venta = tiempos["apagada"] / operaciones * 1e9
+    print(f"Costo de la instrumentación activa: {costos['activa'] - costos['apagada']:,.0f} ns por llamada, "
+          f"{(costos['activa'] - costos['apagada']) / venta * 100:.2f}% de una venta")
+    print(histograma.mostrar("Servicio.vender_entrada"))
+
+
+BENCHMARKS = {
+    "snapshot": benchmark_snapshot,
+    "indices": benchmark_indices,
+    "asientos": benchmark_asientos,
+    "perfecto": benchmark_perfecto,
+    "vampiro": benchmark_vampiro,
+    "hidratacion": benchmark_hidratacion,
+    "llenado": benchmark_llenado,
+    "retenciones": benchmark_retenciones,
+    "servicio": benchmark_servicio,
+    "servidor": benchmark_servidor,
+    "lotes": benchmark_lotes,
+    "busqueda": benchmark_busqueda,
+    "menu": benchmark_menu,
+    "inventario": benchmark_inventario,
+    "estadisticas": benchmark_estadisticas,
+    "topk": benchmark_topk,
+    "arranque": benchmark_arranque,
+    "reporte": benchmark_reporte,
+    "columnas": benchmark_columnas,
+    "suite": benchmark_suite,
+    "instrumentacion": benchmark_instrumentacion,
+}
+
+
+if __name__ == "__main__":
+    nombres = sys.argv[1:] or list(BENCHMARKS)
+    for nombre in nombres:
+        print(f"--- {nombre}")
+        BENCHMARKS[nombre]()
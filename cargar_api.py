@@ -1,19 +1,35 @@
-import requests
+from bisect import bisect_left, bisect_right, insort
+from datetime import date
 from equipo import Equipo
 from estadio import Estadio
 from partido import Partido
 from restaurantes import Restaurante
-from funciones_ayudante import find_item, file_exists
+from acumulador import Acumulador
+from funciones_ayudante import file_exists, parsear_fecha
+from snapshot import guardar_snapshot, cargar_snapshot, migrar_cache, SnapshotInvalido
+from instrumentacion import medir
 
 
 class CargarApi:
     """
-    Clase para cargar datos de equipos, estadios y partidos desde una API o archivos locales.
+    Clase para cargar datos de equipos, estadios y partidos desde una API o snapshots locales.
 
     Attributes:
         equipos (list): Lista de objetos Equipo.
         estadios (list): Lista de objetos Estadio.
         partidos (list): Lista de objetos Partido.
+        equipos_por_id (dict): Índice de equipos por su ID.
+        estadios_por_id (dict): Índice de estadios por su ID.
+        partidos_por_id (dict): Índice de partidos por su ID.
+        restaurantes_por_nombre (dict): Índice de restaurantes por su nombre.
+        entradas_por_codigo (dict): Registro global de entradas vendidas por su código.
+        partidos_por_equipo (dict): Índice de partidos por el ID de cada uno de sus equipos.
+        partidos_por_estadio (dict): Índice de partidos por el ID de su estadio.
+        partidos_por_fecha (dict): Índice de partidos por su fecha (date); las fechas ordenadas están en `fechas`.
+        fechas (list): Fechas con partidos, ordenadas, para búsquedas por rango con bisect.
+        acumulador (Acumulador): Estadísticas de ventas, validaciones y facturas, actualizadas con cada operación.
+        columnas (AlmacenColumnar): Copia columnar de las entradas y facturas para estadísticas vectorizadas, o None
+            si no se activó con activar_columnas().
     """
 
     def __init__(self):
@@ -23,96 +39,256 @@ class CargarApi:
         self.equipos = []
         self.estadios = []
         self.partidos = []
+        self.equipos_por_id = {}
+        self.estadios_por_id = {}
+        self.partidos_por_id = {}
+        self.restaurantes_por_nombre = {}
+        self.entradas_por_codigo = {}
+        self.partidos_por_equipo = {}
+        self.partidos_por_estadio = {}
+        self.partidos_por_fecha = {}
+        self.fechas = []
+        self.acumulador = Acumulador()
+        self.columnas = None
 
         self._cargar_equipos()
         self._cargar_estadios()
         self._cargar_partidos()
 
+    @medir
     def _cargar_equipos(self):
         """
-        Carga los equipos desde un archivo local o desde una API si el archivo no existe.
+        Carga los equipos desde el snapshot local, migrando la caché antigua o consultando la API si no existe.
         """
-        filename = "equipos.txt"
         url = "https://raw.githubusercontent.com/Algoritmos-y-Programacion/api-proyecto/main/teams.json"
-        if file_exists(filename):
-            self.cargar_equipos()
-        else:
-            self._fetch_and_save_data(url, filename)
-            self.cargar_equipos()
+        self.cargar_equipos(self._leer_datos("equipos.json", "equipos.txt", url))
 
+    @medir
     def _cargar_estadios(self):
         """
-        Carga los estadios desde un archivo local o desde una API si el archivo no existe.
+        Carga los estadios desde el snapshot local, migrando la caché antigua o consultando la API si no existe.
         """
-        filename = "estadios.txt"
         url = "https://raw.githubusercontent.com/Algoritmos-y-Programacion/api-proyecto/main/stadiums.json"
-        if file_exists(filename):
-            self.cargar_estadios()
-        else:
-            self._fetch_and_save_data(url, filename)
-            self.cargar_estadios()
+        self.cargar_estadios(self._leer_datos("estadios.json", "estadios.txt", url))
 
+    @medir
     def _cargar_partidos(self):
         """
-        Carga los partidos desde un archivo local o desde una API si el archivo no existe.
+        Carga los partidos desde el snapshot local, migrando la caché antigua o consultando la API si no existe.
         """
-        filename = "partidos.txt"
         url = "https://raw.githubusercontent.com/Algoritmos-y-Programacion/api-proyecto/main/matches.json"
-        if file_exists(filename):
-            self.cargar_partidos()
-        else:
-            self._fetch_and_save_data(url, filename)
-            self.cargar_partidos()
+        self.cargar_partidos(self._leer_datos("partidos.json", "partidos.txt", url))
 
-    def _fetch_and_save_data(self, url, filename):
+    def _leer_datos(self, filename: str, legacy: str, url: str) -> list[dict]:
         """
-        Descarga datos desde una URL y los guarda en un archivo.
+        Obtiene los datos crudos de un recurso desde su snapshot, su caché antigua o la API, en ese orden.
+
+        Args:
+            filename (str): El nombre del archivo del snapshot.
+            legacy (str): El nombre del archivo de caché antiguo.
+            url (str): La URL desde la cual se descargan los datos.
+
+        Returns:
+            list[dict]: Datos crudos del recurso.
+        """
+        if file_exists([filename]):
+            try:
+                return cargar_snapshot(filename)
+            except SnapshotInvalido as e:
+                print(f"{e}. Se descargarán los datos de nuevo.")
+                return self._fetch_and_save_data(url, filename)
+        if file_exists([legacy]):
+            return migrar_cache(legacy, filename)
+        return self._fetch_and_save_data(url, filename)
+
+    @medir
+    def _fetch_and_save_data(self, url: str, filename: str) -> list[dict]:
+        """
+        Descarga datos desde una URL y los guarda en un snapshot.
 
         Args:
             url (str): La URL desde la cual se descargan los datos.
             filename (str): El nombre del archivo donde se guardarán los datos.
+
+        Returns:
+            list[dict]: Datos descargados, o una lista vacía si la descarga falla.
         """
+        import requests
         response = requests.get(url)
         if response.status_code == 200:
             data = response.json()
-            with open(filename, "w") as file:
-                file.write(str(data))
-        else:
-            print(f"Error fetching data from {url}")
+            guardar_snapshot(filename, data)
+            return data
+        print(f"Error fetching data from {url}")
+        return []
+
+    def cargar_equipos(self, data: list[dict]):
+        """
+        Crea instancias de Equipo a partir de los datos crudos.
+
+        Args:
+            data (list[dict]): Datos crudos de los equipos.
+        """
+        for item in data:
+            equipo = Equipo(item["id"], item['name'], item['code'], item['group'])
+            self.equipos.append(equipo)
+            self.equipos_por_id.setdefault(equipo.id, equipo)
+
+    def cargar_estadios(self, data: list[dict]):
+        """
+        Crea instancias de Estadio a partir de los datos crudos.
+
+        Args:
+            data (list[dict]): Datos crudos de los estadios.
+        """
+        for item in data:
+            restaurantes = [Restaurante(rest["name"], rest["products"]) for rest in item["restaurants"]]
+            estadio = Estadio(item['id'], item['name'], item['city'], item['capacity'], restaurantes)
+            self.estadios.append(estadio)
+            self.estadios_por_id.setdefault(estadio.id, estadio)
+            for restaurante in restaurantes:
+                self.restaurantes_por_nombre.setdefault(restaurante.nombre, restaurante)
+
+    def cargar_partidos(self, data: list[dict]):
+        """
+        Crea instancias de Partido a partir de los datos crudos.
+
+        Args:
+            data (list[dict]): Datos crudos de los partidos.
+        """
+        for item in data:
+            equipo_local = self.equipos_por_id.get(item['home']['id'])
+            equipo_visitante = self.equipos_por_id.get(item['away']['id'])
+            estadio = self.estadios_por_id.get(item['stadium_id'])
+
+            if equipo_local is None and equipo_visitante is None or estadio is None:
+                continue
+            partido = Partido(equipo_local, equipo_visitante, item['date'], estadio)
+            self.partidos.append(partido)
+            self.partidos_por_id.setdefault(partido.id, partido)
+            self._indexar_partido(partido)
+
+    def _indexar_partido(self, partido: Partido):
+        """
+        Agrega un partido a los índices por equipo, por estadio y por fecha.
+
+        Args:
+            partido (Partido): El partido a indexar.
+        """
+        for equipo in {partido.equipo_local.id, partido.equipo_visitante.id}:
+            self.partidos_por_equipo.setdefault(equipo, []).append(partido)
+        self.partidos_por_estadio.setdefault(partido.estadio.id, []).append(partido)
+        fecha = parsear_fecha(partido.fecha)
+        if fecha is not None:
+            if fecha not in self.partidos_por_fecha:
+                insort(self.fechas, fecha)
+            self.partidos_por_fecha.setdefault(fecha, []).append(partido)
+
+    def partidos_de_equipo(self, equipo_id: str) -> list[Partido]:
+        """
+        Busca los partidos que juega un equipo, como local o como visitante.
+
+        Args:
+            equipo_id (str): ID del equipo.
+
+        Returns:
+            list[Partido]: Partidos del equipo, en el orden de carga.
+        """
+        return self.partidos_por_equipo.get(equipo_id, [])
+
+    def partidos_en_estadio(self, estadio_id: str) -> list[Partido]:
+        """
+        Busca los partidos que se juegan en un estadio.
+
+        Args:
+            estadio_id (str): ID del estadio.
+
+        Returns:
+            list[Partido]: Partidos del estadio, en el orden de carga.
+        """
+        return self.partidos_por_estadio.get(estadio_id, [])
+
+    def partidos_en_fecha(self, fecha: date) -> list[Partido]:
+        """
+        Busca los partidos que se juegan en una fecha.
+
+        Args:
+            fecha (date): La fecha.
+
+        Returns:
+            list[Partido]: Partidos de esa fecha.
+        """
+        return self.partidos_por_fecha.get(fecha, [])
+
+    def partidos_entre(self, desde: date, hasta: date) -> list[Partido]:
+        """
+        Busca los partidos que se juegan entre dos fechas, ambas incluidas, ordenados por fecha.
+
+        Args:
+            desde (date): Fecha inicial.
+            hasta (date): Fecha final.
+
+        Returns:
+            list[Partido]: Partidos en el rango de fechas.
+        """
+        inicio, fin = bisect_left(self.fechas, desde), bisect_right(self.fechas, hasta)
+        return [partido for fecha in self.fechas[inicio:fin] for partido in self.partidos_por_fecha[fecha]]
+
+    def registrar_entrada(self, entrada):
+        """
+        Registra una entrada en su partido, en el registro global de entradas y en las estadísticas.
 
-    def cargar_equipos(self):
+        Args:
+            entrada (Entrada): La entrada a registrar.
         """
-        Carga los datos de equipos desde un archivo y crea instancias de Equipo.
+        entrada.partido.registrar_entrada(entrada)
+        self.entradas_por_codigo[entrada.codigo] = entrada
+        self.acumulador.registrar_entrada(entrada)
+        if self.columnas is not None:
+            self.columnas.registrar_entrada(entrada)
+
+    def registrar_validacion(self, entrada) -> bool:
         """
-        with open("equipos.txt", "r") as file:
-            data = eval(file.read())
-            for item in data:
-                equipo = Equipo(item["id"], item['name'], item['code'], item['group'])
-                self.equipos.append(equipo)
+        Marca una entrada registrada como validada y suma la asistencia a su partido y a las estadísticas.
+
+        La verificación y la marca se hacen juntas con el lock del partido, así una entrada validada a la vez
+        desde varios hilos se cuenta una sola vez.
+
+        Args:
+            entrada (Entrada): La entrada validada.
 
-    def cargar_estadios(self):
+        Returns:
+            bool: True si se validó, False si ya estaba validada.
         """
-        Carga los datos de estadios desde un archivo y crea instancias de Estadio.
+        if not entrada.partido.validar(entrada):
+            return False
+        self.acumulador.registrar_validacion(entrada)
+        if self.columnas is not None:
+            self.columnas.registrar_validacion(entrada)
+        return True
+
+    def registrar_factura(self, factura):
         """
-        with open("estadios.txt", "r") as file:
-            data = eval(file.read())
-            for item in data:
-                restaurantes = [Restaurante(rest["name"], rest["products"]) for rest in item["restaurants"]]
-                estadio = Estadio(item['id'], item['name'], item['city'], item['capacity'], restaurantes)
-                self.estadios.append(estadio)
+        Asocia una factura a su entrada registrada y la suma a las estadísticas.
 
-    def cargar_partidos(self):
+        Args:
+            factura (Factura): La factura creada.
         """
-        Carga los datos de partidos desde un archivo y crea instancias de Partido.
+        factura.entrada.compras.append(factura)
+        self.acumulador.registrar_factura(factura)
+        if self.columnas is not None:
+            self.columnas.registrar_factura(factura)
+
+    def activar_columnas(self):
         """
-        with open("partidos.txt", "r") as file:
-            data = eval(file.read())
-            for item in data:
-                equipo_local = find_item(self.equipos, lambda equipo: equipo.id == item['home']['id'])
-                equipo_visitante = find_item(self.equipos, lambda equipo: equipo.id == item['away']['id'])
-                estadio = find_item(self.estadios, lambda estadio: estadio.id == item['stadium_id'])
+        Activa el almacén columnar de entradas y facturas, cargando en él las entradas ya registradas.
 
-                if equipo_local is None and equipo_visitante is None or estadio is None:
-                    continue
-                partido = Partido(equipo_local, equipo_visitante, item['date'], estadio)
-                self.partidos.append(partido)
\ No newline at end of file
+        NumPy se importa recién al activarlo, para no demorar el arranque cuando no se usa.
+        """
+        if self.columnas is not None:
+            return
+        from columnas import AlmacenColumnar
+        columnas = AlmacenColumnar()
+        for entrada in self.entradas_por_codigo.values():
+            columnas.registrar_entrada(entrada)
+        self.columnas = columnas
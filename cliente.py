@@ -1,3 +1,6 @@
+from funciones_ayudante import numero_perfecto, es_numero_vampiro
+
+
 class Cliente:
     """
     Representa un cliente con sus datos personales y sus actividades de compra.
@@ -9,6 +12,8 @@ class Cliente:
         entradas (list): Lista de entradas compradas por el cliente.
         compras (list): Lista de productos comprados por el cliente.
         gastos_totales (float): Suma total de los gastos del cliente.
+        cedula_perfecta (bool): Indica si la cédula del cliente es un número perfecto.
+        cedula_vampiro (bool): Indica si la cédula del cliente es un número vampiro.
     """
 
     def __init__(self, nombre: str, cedula: int, edad: int):
@@ -26,6 +31,32 @@ class Cliente:
         self.entradas = []
         self.compras = []
         self.gastos_totales = 0
+        self._cedula_perfecta = None
+        self._cedula_vampiro = None
+
+    @property
+    def cedula_perfecta(self) -> bool:
+        """
+        Indica si la cédula del cliente es un número perfecto, calculándolo solo la primera vez.
+
+        Returns:
+            bool: True si la cédula es un número perfecto, False en caso contrario.
+        """
+        if self._cedula_perfecta is None:
+            self._cedula_perfecta = numero_perfecto(self.cedula)
+        return self._cedula_perfecta
+
+    @property
+    def cedula_vampiro(self) -> bool:
+        """
+        Indica si la cédula del cliente es un número vampiro, calculándolo solo la primera vez.
+
+        Returns:
+            bool: True si la cédula es un número vampiro, False en caso contrario.
+        """
+        if self._cedula_vampiro is None:
+            self._cedula_vampiro = es_numero_vampiro(self.cedula)
+        return self._cedula_vampiro
 
     def calcular_gastos(self):
         """
@@ -0,0 +1,303 @@
+import threading
+import numpy as np
+
+CAPACIDAD_INICIAL = 1024
+
+
+class Columna:
+    """
+    Arreglo de NumPy que crece al agregar valores, duplicando su capacidad cuando se llena.
+
+    Attributes:
+        datos (np.ndarray): Arreglo con la capacidad reservada; los valores válidos son los primeros `largo`.
+        largo (int): Cantidad de valores agregados.
+    """
+
+    def __init__(self, tipo, capacidad: int = CAPACIDAD_INICIAL):
+        """
+        Inicializa una columna vacía.
+
+        Args:
+            tipo (np.dtype): Tipo de los valores.
+            capacidad (int): Capacidad inicial.
+        """
+        self.datos = np.zeros(capacidad, dtype=tipo)
+        self.largo = 0
+
+    def agregar(self, valor) -> int:
+        """
+        Agrega un valor al final de la columna.
+
+        Args:
+            valor: El valor a agregar.
+
+        Returns:
+            int: Posición del valor agregado.
+        """
+        if self.largo == len(self.datos):
+            self.datos = np.concatenate([self.datos, np.zeros(len(self.datos), dtype=self.datos.dtype)])
+        self.datos[self.largo] = valor
+        self.largo += 1
+        return self.largo - 1
+
+    def valores(self) -> np.ndarray:
+        """
+        Retorna los valores agregados, sin copiarlos.
+
+        Returns:
+            np.ndarray: Vista de los valores válidos.
+        """
+        return self.datos[:self.largo]
+
+
+class Diccionario:
+    """
+    Codifica valores repetidos (IDs de partido, clientes, restaurantes, productos) como enteros consecutivos.
+
+    Attributes:
+        valores (list): Valor de cada código.
+        codigos (dict): Código de cada valor.
+    """
+
+    def __init__(self):
+        """
+        Inicializa un diccionario vacío.
+        """
+        self.valores = []
+        self.codigos = {}
+
+    def codificar(self, valor) -> int:
+        """
+        Retorna el código de un valor, asignándole uno nuevo si es la primera vez que aparece.
+
+        Args:
+            valor (hashable): El valor.
+
+        Returns:
+            int: Su código.
+        """
+        codigo = self.codigos.get(valor)
+        if codigo is None:
+            codigo = self.codigos[valor] = len(self.valores)
+            self.valores.append(valor)
+        return codigo
+
+
+class AlmacenColumnar:
+    """
+    Copia de las entradas y facturas en arreglos columnares de NumPy, para calcular las estadísticas con
+    operaciones vectorizadas (group-bys con np.bincount) en lugar de recorrer objetos.
+
+    Recibe los mismos eventos que el Acumulador (registrar_entrada, registrar_validacion y registrar_factura)
+    y responde las mismas consultas, así que Estadisticas puede leer de cualquiera de los dos. Los valores
+    repetidos se guardan codificados como enteros con un Diccionario por columna.
+
+    Columnas de entradas: partido, tipo (VIP o no), precio, validado y cliente. Columnas de facturas: entrada,
+    restaurante y total. Columnas de las líneas de factura: restaurante, producto y cantidad.
+    """
+
+    def __init__(self):
+        """
+        Inicializa un almacén sin entradas ni facturas.
+        """
+        self.partidos = Diccionario()
+        self.clientes = Diccionario()
+        self.restaurantes = Diccionario()
+        self.productos = Diccionario()
+        self.codigos = []
+        self.filas = {}
+        self.entrada_partido = Columna(np.int32)
+        self.entrada_vip = Columna(np.bool_)
+        self.entrada_precio = Columna(np.float64)
+        self.entrada_validado = Columna(np.bool_)
+        self.entrada_cliente = Columna(np.int64)
+        self.factura_entrada = Columna(np.int64)
+        self.factura_restaurante = Columna(np.int32)
+        self.factura_total = Columna(np.float64)
+        self.linea_restaurante = Columna(np.int32)
+        self.linea_producto = Columna(np.int32)
+        self.linea_cantidad = Columna(np.int32)
+        self._lock = threading.Lock()
+
+    def registrar_entrada(self, entrada):
+        """
+        Agrega una entrada vendida, junto con sus facturas si ya las tiene (al cargar datos guardados).
+
+        Args:
+            entrada (Entrada): La entrada vendida.
+        """
+        with self._lock:
+            fila = self.entrada_partido.agregar(self.partidos.codificar(entrada.partido.id))
+            self.entrada_vip.agregar(entrada.tipo == "vip")
+            self.entrada_precio.agregar(entrada.factura["total"])
+            self.entrada_validado.agregar(entrada.validado)
+            self.entrada_cliente.agregar(self.clientes.codificar(str(entrada.cliente)))
+            self.codigos.append(entrada.codigo)
+            self.filas[entrada.codigo] = fila
+            for factura in entrada.compras:
+                self._facturar(factura, fila)
+
+    def registrar_validacion(self, entrada):
+        """
+        Marca como validada una entrada ya registrada.
+
+        Args:
+            entrada (Entrada): La entrada validada.
+        """
+        with self._lock:
+            self.entrada_validado.datos[self.filas[entrada.codigo]] = True
+
+    def registrar_factura(self, factura):
+        """
+        Agrega una factura de una entrada ya registrada.
+
+        Args:
+            factura (Factura): La factura creada.
+        """
+        with self._lock:
+            self._facturar(factura, self.filas[factura.entrada.codigo])
+
+    def _facturar(self, factura, fila: int):
+        """
+        Agrega una factura y una línea por producto. Se llama con el lock tomado.
+
+        Args:
+            factura (Factura): La factura creada.
+            fila (int): Fila de la entrada de la factura.
+        """
+        restaurante = self.restaurantes.codificar(factura.restaurante.nombre)
+        self.factura_entrada.agregar(fila)
+        self.factura_restaurante.agregar(restaurante)
+        self.factura_total.agregar(factura.total)
+        for nombre, cantidad in factura.cantidades().items():
+            self.linea_restaurante.agregar(restaurante)
+            self.linea_producto.agregar(self.productos.codificar(nombre))
+            self.linea_cantidad.agregar(cantidad)
+
+    def __len__(self) -> int:
+        """
+        Retorna la cantidad de entradas registradas.
+
+        Returns:
+            int: Cantidad de entradas.
+        """
+        return self.entrada_partido.largo
+
+    def _gastos_por_entrada(self) -> np.ndarray:
+        """
+        Calcula el gasto total (entrada y facturas) de cada entrada. Se llama con el lock tomado.
+
+        Returns:
+            np.ndarray: Gasto por fila de entrada.
+        """
+        return self.entrada_precio.valores() + np.bincount(self.factura_entrada.valores(), weights=self.factura_total.valores(),
+                                                           minlength=len(self))
+
+    def gasto_vip_promedio(self) -> float:
+        """
+        Calcula el gasto promedio de las entradas VIP.
+
+        Returns:
+            float: Gasto promedio de las entradas VIP, 0 si no hay entradas VIP.
+        """
+        with self._lock:
+            vip = self.entrada_vip.valores()
+            return float(self._gastos_por_entrada()[vip].mean()) if vip.any() else 0
+
+    def gastos_top(self, n: int) -> list[tuple[float, str]]:
+        """
+        Busca las entradas VIP con más gasto.
+
+        Args:
+            n (int): Cantidad de entradas a retornar.
+
+        Returns:
+            list[tuple[float, str]]: Gasto total y código de cada entrada, de mayor a menor gasto.
+        """
+        with self._lock:
+            filas = np.flatnonzero(self.entrada_vip.valores())
+            gastos = self._gastos_por_entrada()[filas]
+            return [(float(gastos[i]), self.codigos[filas[i]]) for i in _mayores(gastos, n)]
+
+    def conteos_partidos(self) -> dict[str, tuple[int, int]]:
+        """
+        Cuenta las entradas vendidas y validadas de cada partido.
+
+        Returns:
+            dict[str, tuple[int, int]]: Entradas vendidas y validadas, por ID de partido.
+        """
+        with self._lock:
+            partidos = self.entrada_partido.valores()
+            vendidas = np.bincount(partidos, minlength=len(self.partidos.valores))
+            validadas = np.bincount(partidos, weights=self.entrada_validado.valores(), minlength=len(self.partidos.valores))
+            return {partido: (int(vendidas[i]), int(validadas[i])) for i, partido in enumerate(self.partidos.valores)}
+
+    def clientes_top(self, n: int) -> list[tuple[str, int]]:
+        """
+        Busca los clientes que han comprado más entradas.
+
+        Args:
+            n (int): Cantidad de clientes a retornar.
+
+        Returns:
+            list[tuple[str, int]]: Cliente y cantidad de entradas compradas.
+        """
+        with self._lock:
+            conteos = np.bincount(self.entrada_cliente.valores(), minlength=len(self.clientes.valores))
+            return [(self.clientes.valores[i], int(conteos[i])) for i in _mayores(conteos, n)]
+
+    def restaurantes_top(self, n: int) -> list[tuple[str, float]]:
+        """
+        Busca los restaurantes con más ventas.
+
+        Args:
+            n (int): Cantidad de restaurantes a retornar, o None para todos.
+
+        Returns:
+            list[tuple[str, float]]: Nombre del restaurante y total vendido.
+        """
+        with self._lock:
+            ventas = np.bincount(self.factura_restaurante.valores(), weights=self.factura_total.valores(),
+                                 minlength=len(self.restaurantes.valores))
+            return [(self.restaurantes.valores[i], float(ventas[i])) for i in _mayores(ventas, n)]
+
+    def platos_top(self, n: int = None, restaurante: str = None) -> list[tuple[str, int]]:
+        """
+        Busca los productos más vendidos, en general o en un restaurante.
+
+        Args:
+            n (int): Cantidad de productos a retornar, o None para todos.
+            restaurante (str): Nombre del restaurante, o None para considerar todos.
+
+        Returns:
+            list[tuple[str, int]]: Nombre del producto y cantidad vendida.
+        """
+        with self._lock:
+            productos, cantidades = self.linea_producto.valores(), self.linea_cantidad.valores()
+            if restaurante is not None:
+                codigo = self.restaurantes.codigos.get(restaurante)
+                if codigo is None:
+                    return []
+                mascara = self.linea_restaurante.valores() == codigo
+                productos, cantidades = productos[mascara], cantidades[mascara]
+            unidades = np.bincount(productos, weights=cantidades, minlength=len(self.productos.valores))
+            return [(self.productos.valores[i], int(unidades[i])) for i in _mayores(unidades, n) if unidades[i] > 0]
+
+
+def _mayores(valores: np.ndarray, n: int = None) -> np.ndarray:
+    """
+    Retorna las posiciones de los n mayores valores, de mayor a menor, con np.argpartition en O(len + n log n).
+
+    Args:
+        valores (np.ndarray): Los valores.
+        n (int): Cantidad de posiciones a retornar, o None para todas.
+
+    Returns:
+        np.ndarray: Posiciones de los mayores valores.
+    """
+    if n is None or n >= len(valores):
+        return np.argsort(-valores, kind="stable")
+    if n <= 0:
+        return np.array([], dtype=np.int64)
+    candidatos = np.argpartition(-valores, n - 1)[:n]
+    return candidatos[np.argsort(-valores[candidatos], kind="stable")]
@@ -0,0 +1,133 @@
+import os
+import json
+import time
+import atexit
+import threading
+
+ARCHIVO_DIARIO = "diario_clientes.jsonl"
+
+ENTRADA_VENDIDA = "entrada_vendida"
+ENTRADA_VALIDADA = "entrada_validada"
+FACTURA_CREADA = "factura_creada"
+
+
+class Diario:
+    """
+    Diario de eventos de solo escritura al final, usado para no perder operaciones entre guardados.
+
+    Cada evento se escribe como una línea JSON y se vacía al sistema operativo en cuanto ocurre; la
+    sincronización a disco (fsync) se hace por lotes, cada cierto número de eventos o de segundos.
+    Las escrituras se serializan con un lock para que varios vendedores puedan registrar eventos a la vez.
+    Cada evento lleva la generación del último guardado, para que al reaplicarlo se sepa si el inventario
+    guardado ya lo incluye.
+
+    Attributes:
+        filename (str): Nombre del archivo del diario.
+        fsync_cada (int): Cantidad de eventos pendientes que fuerzan un fsync.
+        intervalo_fsync (float): Segundos máximos entre dos fsync mientras haya eventos pendientes.
+        compactar_cada (int): Cantidad de eventos a partir de la cual conviene compactar el diario.
+        eventos (int): Cantidad de eventos escritos desde la última compactación.
+        generacion (int): Número del último guardado de los datos, que se anota en cada evento.
+    """
+
+    def __init__(self, filename: str = ARCHIVO_DIARIO, fsync_cada: int = 32, intervalo_fsync: float = 1.0, compactar_cada: int = 1000):
+        """
+        Inicializa una instancia de la clase Diario. El archivo se abre la primera vez que se escribe un evento.
+
+        Args:
+            filename (str): Nombre del archivo del diario.
+            fsync_cada (int): Cantidad de eventos pendientes que fuerzan un fsync.
+            intervalo_fsync (float): Segundos máximos entre dos fsync mientras haya eventos pendientes.
+            compactar_cada (int): Cantidad de eventos a partir de la cual conviene compactar el diario.
+        """
+        self.filename = filename
+        self.fsync_cada = fsync_cada
+        self.intervalo_fsync = intervalo_fsync
+        self.compactar_cada = compactar_cada
+        self.eventos = 0
+        self.generacion = 0
+        self._file = None
+        self._pendientes = 0
+        self._ultimo_fsync = time.monotonic()
+        self._lock = threading.RLock()
+        atexit.register(self.cerrar)
+
+    def registrar(self, evento: str, datos: dict):
+        """
+        Escribe un evento al final del diario.
+
+        Args:
+            evento (str): Tipo de evento (ENTRADA_VENDIDA, ENTRADA_VALIDADA o FACTURA_CREADA).
+            datos (dict): Datos del evento.
+        """
+        with self._lock:
+            linea = json.dumps({"evento": evento, "generacion": self.generacion, **datos}, ensure_ascii=False) + "\n"
+            if self._file is None:
+                self._file = open(self.filename, "a", encoding="utf-8")
+            self._file.write(linea)
+            self._file.flush()
+            self.eventos += 1
+            self._pendientes += 1
+            if self._pendientes >= self.fsync_cada or time.monotonic() - self._ultimo_fsync >= self.intervalo_fsync:
+                self.sincronizar()
+
+    def sincronizar(self):
+        """
+        Fuerza la escritura a disco de los eventos pendientes.
+        """
+        with self._lock:
+            if self._file is not None and self._pendientes:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+            self._pendientes = 0
+            self._ultimo_fsync = time.monotonic()
+
+    def leer(self):
+        """
+        Recorre los eventos del diario en el orden en que fueron escritos.
+
+        Una última línea incompleta, producto de una caída a mitad de escritura, se ignora.
+
+        Yields:
+            dict: Datos de cada evento, con su tipo en la llave "evento".
+        """
+        if not os.path.exists(self.filename):
+            return
+        with open(self.filename, "r", encoding="utf-8") as file:
+            for line in file:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    break
+
+    def debe_compactar(self) -> bool:
+        """
+        Indica si el diario creció lo suficiente como para plegarlo en el archivo de datos.
+
+        Returns:
+            bool: True si conviene compactar, False en caso contrario.
+        """
+        return self.eventos >= self.compactar_cada
+
+    def truncar(self):
+        """
+        Vacía el diario después de que su contenido fue plegado en el archivo de datos.
+        """
+        with self._lock:
+            self.cerrar()
+            if os.path.exists(self.filename):
+                os.remove(self.filename)
+            self.eventos = 0
+
+    def cerrar(self):
+        """
+        Sincroniza y cierra el archivo del diario.
+        """
+        with self._lock:
+            if self._file is not None:
+                self.sincronizar()
+                self._file.close()
+                self._file = None
+
+
+diario_eventos = Diario()
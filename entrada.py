@@ -1,6 +1,5 @@
 from partido import Partido
 from cliente import Cliente
-from funciones_ayudante import es_numero_vampiro
 
 
 class Entrada:
@@ -21,7 +20,7 @@ class Entrada:
         gastos_totales (float): Suma total de los gastos asociados a la entrada.
     """
 
-    def __init__(self, tipo: str, partido: Partido, asiento: str, cliente: Cliente, codigo: str, status: bool = False):
+    def __init__(self, tipo: str, partido: Partido, asiento: str, cliente: Cliente, codigo: str, status: bool = False, factura: dict = None):
         """
         Inicializa una instancia de la clase Entrada.
 
@@ -32,6 +31,7 @@ class Entrada:
             cliente (Cliente): Cliente que compró la entrada.
             codigo (str): Código de la entrada.
             status (bool): Indica si la entrada fue generada durante el run del programa o cargada de datos guardados.
+            factura (dict): Factura guardada de la entrada. Si se indica, se restaura en lugar de recalcular el precio.
         """
         self.tipo = tipo
         self.partido = partido
@@ -42,7 +42,11 @@ class Entrada:
         self.status = status
         self.precio = 35 if tipo == 'general' else 75
         self.factura = {}
-        self.calcular_precio_final()
+        if factura is None:
+            self.calcular_precio_final()
+        else:
+            self.factura = factura
+            self.precio = factura["total"]
         self.compras = []
         self.gastos_totales = 0
 
@@ -57,16 +61,13 @@ class Entrada:
         Calcula el precio final de la entrada, aplicando descuentos si corresponde, y añade IVA.
         """
         descuento = 0
-        if es_numero_vampiro(self.cliente.cedula):
-            print("Su cedula es un numero vampiro! Es elegido para un 50% de descuento sobre el precio de su entrada. ")
+        if self.cliente.cedula_vampiro:
             descuento = self.precio * 0.50
         subtotal = self.precio - descuento
         iva = subtotal * 0.16
         total = subtotal + iva
         self.precio = total
         self.factura = {"subtotal": subtotal, "descuento": descuento, "IVA": iva, "total": total}
-        if not self.status:
-            print(self.factura)
 
     def __str__(self):
         """
@@ -90,6 +91,7 @@ class Entrada:
             "asiento": self.asiento,
             "codigo": self.codigo,
             "validado": self.validado,
+            "factura": self.factura,
             "compras": [compra.__dict__() for compra in self.compras]
         }
     
\ No newline at end of file
@@ -1,36 +1,53 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-from collections import Counter, defaultdict
+import heapq
+from typing import TYPE_CHECKING
 from cargar_api import CargarApi
 from statistics import mean
-from funciones_restaurantes import buscar_restaurante
+import almacen_sqlite
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 class Estadisticas:
     """
-    Clase para calcular y graficar estadísticas relacionadas con partidos, clientes y ventas de restaurantes.
+    Clase para consultar y graficar estadísticas relacionadas con partidos, clientes y ventas de restaurantes.
+
+    Sin conexión a SQLite, las estadísticas se leen del acumulador de la API, que se actualiza con cada venta,
+    validación y factura, así que abrir las estadísticas no recorre los partidos ni las entradas. Si la API
+    tiene activado el almacén columnar, se calculan en cambio con operaciones vectorizadas sobre sus arreglos.
+    pandas y matplotlib se importan recién al armar la tabla o el primer gráfico, para no demorar el arranque del menú.
 
     Attributes:
         api (CargarApi): Instancia de CargarApi que contiene los datos.
-        gastos (list): Lista de tuplas con gastos totales y códigos de entradas VIP.
+        conexion (sqlite3.Connection): Conexión a la base SQLite para calcular las estadísticas con SQL, o None.
+        fuente (Acumulador or AlmacenColumnar): Origen de las estadísticas cuando no hay conexión a SQLite.
+        gastos (list): Lista de tuplas con gastos totales y códigos de entradas VIP, con el backend SQLite.
         rotacion (int): Valor de rotación para las etiquetas de los gráficos.
     """
 
-    def __init__(self, api: CargarApi):
+    def __init__(self, api: CargarApi, conexion=None):
         """
-        Inicializa una instancia de la clase Estadisticas y ejecuta los cálculos y gráficos.
+        Inicializa una instancia de la clase Estadisticas. Las estadísticas se leen al consultar cada una.
 
         Args:
             api (CargarApi): Instancia de CargarApi que contiene los datos.
+            conexion (sqlite3.Connection): Conexión a la base SQLite para calcular las estadísticas con SQL, o None.
         """
         self.api = api
+        self.conexion = conexion
+        self.fuente = api.columnas if api.columnas is not None else api.acumulador
         self.gastos = []
         self.rotacion = 15
 
+    def mostrar(self):
+        """
+        Imprime las estadísticas y muestra sus gráficos.
+        """
         print(self.gastos_vip_promedio())
         print(self.asistencia_partidos().to_string())
-        self.clientes_top()
-        self.platos_top()
+        print(self.clientes_top())
+        for restaurant_name, plate_counts in self.platos_por_restaurante().items():
+            print(f"Most sold plates in {restaurant_name}: {plate_counts}")
         self.graficar_gastos_vip()
         self.graficar_asistencia_partidos()
         self.graficar_restaurantes_max_ventas()
@@ -41,40 +58,61 @@ class Estadisticas:
         Calcula el gasto promedio de las entradas VIP.
 
         Returns:
-            float: Gasto promedio de las entradas VIP.
+            float: Gasto promedio de las entradas VIP, 0 si no hay entradas VIP.
         """
-        for partido in self.api.partidos:
-            for entrada in partido.entradas:
-                if entrada.tipo == 'vip':
-                    entrada.calcular_gastos()
-                    self.gastos.append((entrada.gastos_totales, entrada.codigo))
-        return mean([gasto for gasto, _ in self.gastos])
+        if self.conexion is not None:
+            self.gastos = almacen_sqlite.gastos_vip(self.conexion)
+            return mean([gasto for gasto, _ in self.gastos]) if self.gastos else 0
+        return self.fuente.gasto_vip_promedio()
 
-    def graficar_gastos_vip(self):
+    def graficar_gastos_vip(self, archivo: str = None):
         """
         Grafica los gastos de las entradas VIP, destacando las 5 más costosas y la línea de gasto promedio.
+
+        Args:
+            archivo (str): Archivo de imagen (PNG o SVG, según la extensión) donde se guarda el gráfico, o None para mostrarlo.
+        """
+        funcion, argumentos = self._grafico_gastos_vip()
+        funcion(*argumentos, archivo=archivo)
+
+    def _grafico_gastos_vip(self) -> tuple:
+        """
+        Calcula los datos del gráfico de gastos VIP.
+
+        Returns:
+            tuple: Función de dibujo y sus argumentos.
         """
-        sorted_gastos = sorted(self.gastos, reverse=True)[:5]
-        y, x = zip(*sorted_gastos)
-        plt.bar(x, y)
         promedio = self.gastos_vip_promedio()
-        plt.axhline(y=promedio, color='r', linestyle='--', label='Promedio')
-        plt.title('Gastos VIP por Entrada')
-        plt.xlabel('Codigo de Entrada')
-        plt.ylabel('Gastos Totales')
-        plt.show()
+        gastos = heapq.nlargest(5, self.gastos) if self.conexion is not None else self.fuente.gastos_top(5)
+        return dibujar_gastos_vip, (gastos, promedio)
 
-    def asistencia_partidos(self) -> pd.DataFrame:
+    def asistencia_partidos(self) -> "pd.DataFrame":
         """
         Crea una tabla con las estadísticas de asistencia a los partidos.
 
         Returns:
             pd.DataFrame: DataFrame con las estadísticas de asistencia a los partidos.
         """
+        import pandas as pd
+        df = pd.DataFrame(self.filas_asistencia(),
+                          columns=['ID', 'Partido', 'Estadio', 'Boletos Vendidos', 'Asistencia', 'Relación Asistencia/Venta'])
+        df.sort_values(by=['Boletos Vendidos', 'Asistencia'], ascending=False, inplace=True, kind='stable')
+        return df
+
+    def filas_asistencia(self) -> list[list]:
+        """
+        Arma las filas de la tabla de asistencia a los partidos, sin ordenar.
+
+        Returns:
+            list[list]: ID, partido, estadio, boletos vendidos, asistencia y relación asistencia/venta de cada partido.
+        """
         tabla = []
+        if self.conexion is not None:
+            conteos = almacen_sqlite.asistencia_por_partido(self.conexion)
+        else:
+            conteos = self.fuente.conteos_partidos()
         for partido in self.api.partidos:
-            entradas = len(partido.entradas)
-            asistencias = partido.asistencia
+            entradas, asistencias = conteos.get(partido.id, (0, 0))
             relacion = asistencias / entradas if entradas else 0
             tabla.append([
                 partido.id,
@@ -84,80 +122,180 @@ class Estadisticas:
                 asistencias,
                 relacion
             ])
-        df = pd.DataFrame(tabla,
-                          columns=['ID', 'Partido', 'Estadio', 'Boletos Vendidos', 'Asistencia', 'Relación Asistencia/Venta'])
-        df.sort_values(by='Asistencia', ascending=False, inplace=True)
-        df.sort_values(by='Boletos Vendidos', ascending=False, inplace=True)
-        return df
+        return tabla
 
-    def graficar_asistencia_partidos(self):
+    def graficar_asistencia_partidos(self, archivo: str = None):
         """
-        Grafica la asistencia de los 10 partidos con mayor asistencia.
+        Grafica la asistencia de los 10 partidos con más boletos vendidos.
+
+        Args:
+            archivo (str): Archivo de imagen (PNG o SVG, según la extensión) donde se guarda el gráfico, o None para mostrarlo.
         """
-        df = self.asistencia_partidos()
-        df = df.head(10)
-        df.plot(x='Partido', y='Asistencia', kind='bar', title='Asistencia por Partido')
-        plt.xticks(rotation=self.rotacion)
-        plt.show()
+        funcion, argumentos = self._grafico_asistencia_partidos()
+        funcion(*argumentos, archivo=archivo)
 
-    def clientes_top(self):
+    def _grafico_asistencia_partidos(self) -> tuple:
         """
-        Imprime los 3 clientes que han comprado más entradas.
+        Calcula los datos del gráfico de asistencia, con los partidos en el mismo orden que la tabla de asistencia.
+
+        Returns:
+            tuple: Función de dibujo y sus argumentos.
         """
-        clientes = [entrada.cliente.__str__() for partido in self.api.partidos for entrada in partido.entradas]
-        top_clientes = Counter(clientes).most_common(3)
-        print(top_clientes)
+        filas = sorted(self.filas_asistencia(), key=lambda fila: (fila[3], fila[4]), reverse=True)
+        return dibujar_barras, ([(fila[1], fila[4]) for fila in filas[:10]], 'Asistencia por Partido', 'Partido', 'Asistencia', self.rotacion)
 
-    def platos_top(self):
+    def clientes_top(self, n: int = 3) -> list[tuple[str, int]]:
         """
-        Encuentra e imprime los platos más vendidos en los restaurantes y los restaurantes con más ventas.
+        Busca los clientes que han comprado más entradas.
+
+        Args:
+            n (int): Cantidad de clientes a retornar.
 
         Returns:
-            tuple: Lista de los 5 restaurantes con más ventas y lista de los 5 platos más vendidos.
+            list[tuple[str, int]]: Cliente y cantidad de entradas compradas.
         """
-        plate_counts = defaultdict(int)
-        restaurant_sales = defaultdict(int)
+        if self.conexion is not None:
+            return almacen_sqlite.clientes_top(self.conexion, n)
+        return self.fuente.clientes_top(n)
 
-        for partido in self.api.partidos:
-            for entrada in partido.entradas:
-                for factura in entrada.compras:
-                    for producto in factura.productos:
-                        plate_counts[producto.nombre] += 1
-                    restaurant_sales[factura.restaurante.nombre] += factura.total
+    def platos_top(self, n: int = 5):
+        """
+        Encuentra los platos más vendidos en los restaurantes y los restaurantes con más ventas.
 
-        sorted_restaurant_sales = sorted(restaurant_sales.items(), key=lambda x: x[1], reverse=True)
-        sorted_platos = sorted(plate_counts.items(), key=lambda x: x[1], reverse=True)
+        Args:
+            n (int): Cantidad de restaurantes y de platos a retornar.
 
-        for restaurant_name, _ in sorted_restaurant_sales[:5]:
-            plate_counts_by_restaurant = [(plate, count) for plate, count in plate_counts.items() if
-                                          plate in [producto.nombre for producto in
-                                                    buscar_restaurante(self.api, restaurant_name).productos]]
-            plate_counts_by_restaurant.sort(key=lambda x: x[1], reverse=True)
-            print(f"Most sold plates in {restaurant_name}: {plate_counts_by_restaurant}")
-        return sorted_restaurant_sales[:5], sorted_platos[:5]
+        Returns:
+            tuple: Lista de los n restaurantes con más ventas y lista de los n platos más vendidos.
+        """
+        if self.conexion is not None:
+            return almacen_sqlite.restaurantes_top(self.conexion, n), almacen_sqlite.platos_top(self.conexion, n)
+        return self.fuente.restaurantes_top(n), self.fuente.platos_top(n)
 
-    def graficar_restaurantes_max_ventas(self):
+    def platos_por_restaurante(self, n: int = 5) -> dict[str, list[tuple[str, int]]]:
+        """
+        Encuentra los platos más vendidos de cada uno de los n restaurantes con más ventas.
+
+        Args:
+            n (int): Cantidad de restaurantes a considerar.
+
+        Returns:
+            dict[str, list[tuple[str, int]]]: Platos vendidos en el restaurante y cantidad, por nombre de restaurante.
+        """
+        if self.conexion is not None:
+            return {restaurant_name: almacen_sqlite.platos_top(self.conexion, -1, restaurant_name)
+                    for restaurant_name, _ in almacen_sqlite.restaurantes_top(self.conexion, n)}
+        return {restaurant_name: self.fuente.platos_top(None, restaurant_name)
+                for restaurant_name, _ in self.fuente.restaurantes_top(n)}
+
+    def graficar_restaurantes_max_ventas(self, archivo: str = None):
         """
         Grafica los 5 restaurantes con más ventas.
+
+        Args:
+            archivo (str): Archivo de imagen (PNG o SVG, según la extensión) donde se guarda el gráfico, o None para mostrarlo.
         """
-        restaurantes = self.platos_top()[0]
-        x, y = zip(*restaurantes)
-        plt.bar(x, y)
-        plt.title('Restaurantes con más ventas')
-        plt.xlabel('Restaurante')
-        plt.ylabel('Ventas')
-        plt.xticks(rotation=self.rotacion)
-        plt.show()
+        funcion, argumentos = self._grafico_restaurantes_max_ventas()
+        funcion(*argumentos, archivo=archivo)
+
+    def _grafico_restaurantes_max_ventas(self) -> tuple:
+        """
+        Calcula los datos del gráfico de restaurantes con más ventas.
+
+        Returns:
+            tuple: Función de dibujo y sus argumentos.
+        """
+        return dibujar_barras, (self.platos_top()[0], 'Restaurantes con más ventas', 'Restaurante', 'Ventas', self.rotacion)
 
-    def graficar_platos_max_ventas(self):
+    def graficar_platos_max_ventas(self, archivo: str = None):
         """
         Grafica los 5 platos más vendidos.
+
+        Args:
+            archivo (str): Archivo de imagen (PNG o SVG, según la extensión) donde se guarda el gráfico, o None para mostrarlo.
+        """
+        funcion, argumentos = self._grafico_platos_max_ventas()
+        funcion(*argumentos, archivo=archivo)
+
+    def _grafico_platos_max_ventas(self) -> tuple:
+        """
+        Calcula los datos del gráfico de platos más vendidos.
+
+        Returns:
+            tuple: Función de dibujo y sus argumentos.
+        """
+        return dibujar_barras, (self.platos_top()[1], 'Platos con más ventas', 'Plato', 'Ventas', self.rotacion)
+
+    def graficos(self) -> dict[str, tuple]:
         """
-        platos = self.platos_top()[1]
-        x, y = zip(*platos)
-        plt.bar(x, y)
-        plt.title('Platos con más ventas')
-        plt.xlabel('Plato')
-        plt.ylabel('Ventas')
-        plt.xticks(rotation=self.rotacion)
-        plt.show()
\ No newline at end of file
+        Calcula de una vez los datos de todos los gráficos, para dibujarlos después sin acceder a la API,
+        por ejemplo en otros procesos.
+
+        Returns:
+            dict[str, tuple]: Función de dibujo y sus argumentos, por nombre de gráfico.
+        """
+        return {
+            "gastos_vip": self._grafico_gastos_vip(),
+            "asistencia_partidos": self._grafico_asistencia_partidos(),
+            "restaurantes_max_ventas": self._grafico_restaurantes_max_ventas(),
+            "platos_max_ventas": self._grafico_platos_max_ventas(),
+        }
+
+
+def dibujar_gastos_vip(gastos: list[tuple[float, str]], promedio: float, archivo: str = None):
+    """
+    Dibuja las barras de gasto de las entradas VIP con la línea de gasto promedio.
+
+    Args:
+        gastos (list[tuple[float, str]]): Gasto total y código de las entradas a graficar.
+        promedio (float): Gasto promedio de las entradas VIP.
+        archivo (str): Archivo de imagen donde se guarda el gráfico, o None para mostrarlo.
+    """
+    import matplotlib.pyplot as plt
+    plt.figure()
+    y, x = zip(*gastos) if gastos else ((), ())
+    plt.bar(x, y)
+    plt.axhline(y=promedio, color='r', linestyle='--', label='Promedio')
+    plt.title('Gastos VIP por Entrada')
+    plt.xlabel('Codigo de Entrada')
+    plt.ylabel('Gastos Totales')
+    _terminar(plt, archivo)
+
+
+def dibujar_barras(datos: list[tuple[str, float]], titulo: str, eje_x: str, eje_y: str, rotacion: int = 0, archivo: str = None):
+    """
+    Dibuja un gráfico de barras.
+
+    Args:
+        datos (list[tuple[str, float]]): Etiqueta y valor de cada barra.
+        titulo (str): Título del gráfico.
+        eje_x (str): Nombre del eje x.
+        eje_y (str): Nombre del eje y.
+        rotacion (int): Rotación de las etiquetas del eje x.
+        archivo (str): Archivo de imagen donde se guarda el gráfico, o None para mostrarlo.
+    """
+    import matplotlib.pyplot as plt
+    plt.figure()
+    x, y = zip(*datos) if datos else ((), ())
+    plt.bar(x, y)
+    plt.title(titulo)
+    plt.xlabel(eje_x)
+    plt.ylabel(eje_y)
+    plt.xticks(rotation=rotacion)
+    _terminar(plt, archivo)
+
+
+def _terminar(plt, archivo: str = None):
+    """
+    Guarda el gráfico actual en un archivo y lo cierra, o lo muestra si no se indica un archivo.
+
+    Args:
+        plt (module): El módulo matplotlib.pyplot.
+        archivo (str): Archivo de imagen (el formato sale de la extensión), o None para mostrar el gráfico.
+    """
+    if archivo is None:
+        plt.show()
+        return
+    plt.tight_layout()
+    plt.savefig(archivo)
+    plt.close()
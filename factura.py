@@ -2,7 +2,8 @@ from collections import Counter
 from entrada import Entrada
 from producto import Producto
 from restaurantes import Restaurante
-from funciones_ayudante import numero_perfecto
+from inventario import Reserva
+from instrumentacion import medir
 
 
 class Factura:
@@ -21,7 +22,7 @@ class Factura:
         iva (float): IVA aplicado a la factura.
     """
 
-    def __init__(self, entrada: Entrada, productos: list[Producto], restaurante: Restaurante, status: bool = False):
+    def __init__(self, entrada: Entrada, productos: list[Producto], restaurante: Restaurante, status: bool = False, totales: dict = None):
         """
         Inicializa una instancia de la clase Factura.
 
@@ -30,6 +31,7 @@ class Factura:
             productos (list[Producto]): Lista de productos comprados.
             restaurante (Restaurante): Restaurante donde se realizó la compra.
             status (bool): Indica si la factura fue generada durante el run del programa o cargada de datos guardados.
+            totales (dict): Subtotal, descuento, IVA y total guardados. Si se indican, se restauran en lugar de calcularlos.
         """
         self.entrada = entrada
         self.cliente = entrada.cliente
@@ -40,33 +42,50 @@ class Factura:
         self.descuento = 0
         self.subtotal = 0
         self.iva = 0
-        self.generar_venta()
+        if totales is None:
+            self.calcular_totales()
+        else:
+            self.subtotal = totales["subtotal"]
+            self.descuento = totales["descuento"]
+            self.iva = totales["iva"]
+            self.total = totales["total"]
 
-    def generar_venta(self):
+    def calcular_totales(self):
         """
-        Genera la venta calculando el total, el descuento, el IVA y actualizando el stock de los productos.
+        Calcula el subtotal, el descuento y el IVA de la factura y su total.
         """
         for producto in self.productos:
             self.total += producto.precio
-        if numero_perfecto(self.entrada.cliente.cedula):
-            print("Su cedula es un numero perfecto! Se le aplicara un descuento del 15%.")
+        if self.cliente.cedula_perfecta:
             self.descuento = self.total * 0.15
         self.iva = self.total * 0.16
         self.subtotal = self.total
         self.total += self.iva
         self.total -= self.descuento
-        if not self.status:
-            print(self.mostrar())
-            seguir = input("Desea continuar con la compra? (s/n): ")
-        else:
-            seguir = "s"
-        if seguir.lower() == "n":
-            print("Compra cancelada.")
-            return
-        if not self.status:
-            print("Compra realizada con exito!")
-        for producto in self.productos:
-            producto.stock -= 1
+
+    def cantidades(self) -> dict[str, int]:
+        """
+        Cuenta las unidades compradas de cada producto.
+
+        Returns:
+            dict[str, int]: Unidades por nombre de producto.
+        """
+        return dict(Counter(producto.nombre for producto in self.productos))
+
+    @medir
+    def confirmar(self, reserva: Reserva = None):
+        """
+        Confirma la venta descontando del inventario del restaurante las unidades compradas.
+
+        Args:
+            reserva (Reserva): Reserva hecha previamente para la factura. Si no se indica, los productos se
+                reservan y se descuentan en el momento.
+
+        Raises:
+            StockInsuficiente: Si no se indica una reserva y algún producto no tiene unidades suficientes.
+        """
+        inventario = self.restaurante.inventario
+        inventario.confirmar(reserva if reserva is not None else inventario.reservar(self.cantidades()))
 
     def mostrar(self) -> str:
         """
@@ -77,10 +96,11 @@ class Factura:
         """
         producto_name = [producto.nombre for producto in self.productos]
         producto_name = dict(Counter(producto_name))
+        lineas = '\n'.join([f"{producto} x {cantidad}" for producto, cantidad in producto_name.items()])
         string = f"""
 Cliente: {self.cliente.nombre}
 Restaurante: {self.restaurante.nombre}
-{'\n'.join([f"{producto} x {cantidad}" for producto, cantidad in producto_name.items()])}
+{lineas}
 Subtotal: {self.subtotal}
 IVA: {self.iva}
 Descuento: {self.descuento}
@@ -104,5 +124,6 @@ Total: {self.total}
         Returns:
             dict: Diccionario con las características de la factura.
         """
-        return {"productos": [producto.__dict__() for producto in self.productos], "restaurante": self.restaurante.nombre}
+        return {"productos": [producto.__dict__() for producto in self.productos], "restaurante": self.restaurante.nombre,
+                "subtotal": self.subtotal, "descuento": self.descuento, "iva": self.iva, "total": self.total}
     
\ No newline at end of file
@@ -1,4 +1,12 @@
 import os
+from math import isqrt
+from datetime import date, datetime
+from functools import lru_cache
+
+# Exponentes p de los primos de Mersenne con 2^(p-1)(2^p-1) < 10^1500.
+_EXPONENTES_MERSENNE = (2, 3, 5, 7, 13, 17, 19, 31, 61, 89, 107, 127, 521, 607, 1279, 2203, 2281)
+NUMEROS_PERFECTOS = frozenset(2 ** (p - 1) * (2 ** p - 1) for p in _EXPONENTES_MERSENNE)
+_LIMITE_PERFECTOS = 10 ** 1500
 
 
 def generar_id(a: str, b: str, c: str) -> str:
@@ -58,54 +66,56 @@ def numero_perfecto(n: int) -> bool:
     """
     Determina si un número es perfecto.
 
+    Por el teorema de Euclides-Euler todo perfecto par es 2^(p-1)(2^p-1) con 2^p-1 primo, y no existen
+    perfectos impares por debajo de 10^1500, así que en ese rango basta con consultar NUMEROS_PERFECTOS.
+    Por encima se suman los divisores hasta la raíz cuadrada.
+
     Args:
         n (int): Número a evaluar.
 
     Returns:
         bool: True si el número es perfecto, False en caso contrario.
     """
-    suma = 0
-    for i in range(1, n):
+    if n < _LIMITE_PERFECTOS:
+        return n in NUMEROS_PERFECTOS
+    suma = 1
+    for i in range(2, isqrt(n) + 1):
         if n % i == 0:
             suma += i
+            if i != n // i:
+                suma += n // i
     return suma == n
 
 
+@lru_cache(maxsize=2 ** 16)
 def es_numero_vampiro(n: int) -> bool:
     """
     Determina si un número es vampiro.
 
+    Recorre los posibles colmillos x desde el menor divisor con la mitad de los dígitos hasta la raíz
+    cuadrada de n, y compara el multiconjunto de dígitos de x e y = n // x con el de n. Los resultados
+    se guardan en caché por número.
+
     Args:
         n (int): Número a evaluar.
 
     Returns:
         bool: True si el número es vampiro, False en caso contrario.
     """
-    def generate_combinations(s: str):
-        if len(s) <= 1:
-            return [s]
-        else:
-            combinations = []
-            for i in range(len(s)):
-                part1 = s[i]
-                part2 = s[:i] + s[i+1:]
-                for combo in generate_combinations(part2):
-                    combinations.append(part1 + combo)
-            return combinations
-
     n_str = str(n)
-    if len(n_str) % 2 != 0:
+    if n < 1 or len(n_str) % 2 != 0:
         return False
 
-    combinations = generate_combinations(n_str)
-    for combo in combinations:
-        mid = len(combo) // 2
-        part1 = combo[:mid]
-        part2 = combo[mid:]
-        num1 = int(part1)
-        num2 = int(part2)
-        if num1 * num2 == n and not (num1 % 10 == 0 and num2 % 10 == 0):
-            return True
+    mitad = len(n_str) // 2
+    digitos = sorted(n_str)
+    minimo = max(10 ** (mitad - 1), -(-n // 10 ** mitad))
+    for x in range(minimo, isqrt(n) + 1):
+        if n % x == 0:
+            y = n // x
+            if x % 10 == 0 and y % 10 == 0:
+                continue
+            if sorted(f"{x}{y}") == digitos:
+                return True
 
     return False
 
@@ -126,6 +136,25 @@ def file_exists(archivos: list[str]) -> bool:
     return True
 
 
+def parsear_fecha(texto: str) -> date or None:
+    """
+    Convierte la fecha de un partido en un objeto date. Acepta fechas ISO, con o sin hora ("2024-06-14", "2024-06-14T21:00").
+
+    Args:
+        texto (str): Fecha en texto.
+
+    Returns:
+        date or None: La fecha, o None si el texto no es una fecha válida.
+    """
+    try:
+        return datetime.fromisoformat(texto).date()
+    except (TypeError, ValueError):
+        try:
+            return date.fromisoformat(texto[:10])
+        except (TypeError, ValueError):
+            return None
+
+
 def seleccion(lista: list):
     """
     Permite seleccionar un ítem de una lista mediante la entrada del usuario.
@@ -1,20 +1,17 @@
-from entrada import Entrada
-from partido import Partido
 from cliente import Cliente
-from cargar_api import CargarApi
 from funciones_partidos import buscar_partidos
+from servicio import Servicio, AsientoNoDisponible, EntradaNoEncontrada, EntradaYaValidada
 
 
-def comprar_entrada(api: CargarApi, clientes: list[Cliente]) -> Cliente:
+def comprar_entrada(servicio: Servicio) -> Cliente or None:
     """
     Permite al usuario comprar una entrada para un partido.
 
     Args:
-        api (CargarApi): Instancia de CargarApi para acceder a los datos.
-        clientes (list[Cliente]): Lista de clientes existentes.
+        servicio (Servicio): Servicio con el que se realiza la venta.
 
     Returns:
-        Cliente: El cliente que compró la entrada.
+        Cliente or None: El cliente que compró la entrada, o None si no quedaban asientos.
     """
     while True:
         try:
@@ -24,8 +21,8 @@ def comprar_entrada(api: CargarApi, clientes: list[Cliente]) -> Cliente:
             continue
         break
 
-    cliente = cliente_existe(cedula_cliente, clientes)
-    if cliente is None:
+    nombre_cliente = edad_cliente = None
+    if cliente_existe(cedula_cliente, servicio) is None:
         nombre_cliente = input("Ingrese el nombre del cliente: ")
         while True:
             try:
@@ -34,55 +31,64 @@ def comprar_entrada(api: CargarApi, clientes: list[Cliente]) -> Cliente:
                 print("La edad es inválida, debe ser un número entero. Intente de nuevo.")
                 continue
             break
-        cliente = Cliente(nombre_cliente, cedula_cliente, edad_cliente)
     print("\nSeleccione el partido:")
-    partido = buscar_partidos(api)
+    partido = buscar_partidos(servicio.api)
     while True:
         tipo_entrada = input("Ingrese el tipo de entrada (General: 35$ | VIP: 75$): ").lower()
         if tipo_entrada not in ["general", "vip"]:
             print("Tipo de entrada inválida. Intente de nuevo.")
             continue
         break
-    asiento = partido.modificar_asientos(tipo_entrada == "vip")
-    codigo = f"{asiento} {partido.id}"
-    print(f"El código de su boleto es: {codigo}")
-    entrada = Entrada(tipo_entrada, partido, asiento, cliente, codigo)
-    partido.registrar_entrada(entrada)
-    cliente.entradas.append(entrada)
-    return cliente
+    if input("¿Desea elegir el asiento? (s/n): ").lower() == "s":
+        print(partido.plano_asientos(tipo_entrada == "vip"))
+        while True:
+            asiento = input("Ingrese el asiento: ")
+            try:
+                entrada = servicio.vender_entrada(cedula_cliente, partido.id, tipo_entrada, asiento, nombre_cliente, edad_cliente)
+            except AsientoNoDisponible:
+                print("Asiento invalido. Intente de nuevo.")
+                continue
+            break
+    else:
+        try:
+            entrada = servicio.vender_entrada(cedula_cliente, partido.id, tipo_entrada, None, nombre_cliente, edad_cliente)
+        except AsientoNoDisponible:
+            print("No quedan asientos disponibles de ese tipo para este partido.")
+            return None
+        print(f"Se le asignó el asiento {entrada.asiento}.")
+    if entrada.factura["descuento"]:
+        print("Su cedula es un numero vampiro! Es elegido para un 50% de descuento sobre el precio de su entrada. ")
+    print(entrada.factura)
+    print(f"El código de su boleto es: {entrada.codigo}")
+    return entrada.cliente
 
 
-def validar_entrada(api: CargarApi) -> None:
+def validar_entrada(servicio: Servicio) -> None:
     """
     Valida una entrada cambiando su estado a validado si el código es correcto.
 
     Args:
-        api (CargarApi): Instancia de CargarApi para acceder a los datos.
+        servicio (Servicio): Servicio con el que se valida la entrada.
     """
     codigo = input("Ingrese el código de la entrada: ")
-    for partido in api.partidos:
-        for entrada in partido.entradas:
-            if entrada.codigo == codigo:
-                if entrada.validado:
-                    print("La entrada ya ha sido validada.")
-                else:
-                    entrada.validado = True
-                    print("Entrada validada.")
-                    partido.asistencia += 1
+    try:
+        servicio.validar_entrada(codigo)
+        print("Entrada validada.")
+    except EntradaYaValidada:
+        print("La entrada ya ha sido validada.")
+    except EntradaNoEncontrada:
+        print("La entrada no existe.")
 
 
-def cliente_existe(cedula_cliente: int, clientes: list[Cliente]) -> Cliente or None:
+def cliente_existe(cedula_cliente: int, servicio: Servicio) -> Cliente or None:
     """
-    Verifica si un cliente ya existe en la lista de clientes.
+    Verifica si un cliente ya existe en el registro de clientes.
 
     Args:
         cedula_cliente (int): Cédula del cliente a verificar.
-        clientes (list[Cliente]): Lista de clientes existentes.
+        servicio (Servicio): Servicio con el registro de clientes existentes.
 
     Returns:
         Cliente or None: El cliente si existe, None en caso contrario.
     """
-    for cliente in clientes:
-        if cliente.cedula == cedula_cliente:
-            return cliente
-    return None
+    return servicio.clientes.obtener(cedula_cliente)
@@ -1,11 +1,11 @@
 from cargar_api import CargarApi
 from partido import Partido
-from funciones_ayudante import seleccion
+from funciones_ayudante import seleccion, parsear_fecha
 
 
 def buscar_partidos(api: CargarApi) -> Partido:
     """
-    Permite al usuario buscar partidos por país, estadio o fecha.
+    Permite al usuario buscar partidos por país, estadio, fecha o rango de fechas.
 
     Args:
         api (CargarApi): Instancia de CargarApi para acceder a los datos.
@@ -16,6 +16,7 @@ def buscar_partidos(api: CargarApi) -> Partido:
     print("1. Buscar partidos por país")
     print("2. Buscar partidos por estadio")
     print("3. Buscar partidos por fecha")
+    print("4. Buscar partidos por rango de fechas")
     opcion = input("Seleccione una opción: ")
     if opcion == "1":
         return buscar_por_pais(api)
@@ -23,6 +24,8 @@ def buscar_partidos(api: CargarApi) -> Partido:
         return buscar_por_estadio(api)
     elif opcion == "3":
         return buscar_por_fecha(api)
+    elif opcion == "4":
+        return buscar_por_rango(api)
 
 
 def buscar_por_pais(api: CargarApi) -> Partido:
@@ -35,9 +38,9 @@ def buscar_por_pais(api: CargarApi) -> Partido:
     Returns:
         Partido: Partido seleccionado por el usuario.
     """
-    nombre_pais = seleccion(api.equipos).nombre
-    partidos_pais = [partido for partido in api.partidos if partido.equipo_local.nombre == nombre_pais or partido.equipo_visitante.nombre == nombre_pais]
-    print(f"\nPartidos en {nombre_pais}:")
+    equipo = seleccion(api.equipos)
+    partidos_pais = api.partidos_de_equipo(equipo.id)
+    print(f"\nPartidos en {equipo.nombre}:")
     return seleccion(partidos_pais)
 
 
@@ -51,9 +54,9 @@ def buscar_por_estadio(api: CargarApi) -> Partido:
     Returns:
         Partido: Partido seleccionado por el usuario.
     """
-    nombre_estadio = seleccion(api.estadios).nombre
-    partidos_estadio = [partido for partido in api.partidos if partido.estadio.nombre == nombre_estadio]
-    print(f"\nPartidos en el estadio {nombre_estadio}")
+    estadio = seleccion(api.estadios)
+    partidos_estadio = api.partidos_en_estadio(estadio.id)
+    print(f"\nPartidos en el estadio {estadio.nombre}")
     return seleccion(partidos_estadio)
 
 
@@ -67,13 +70,37 @@ def buscar_por_fecha(api: CargarApi) -> Partido:
     Returns:
         Partido: Partido seleccionado por el usuario.
     """
-    fechas = sorted({partido.fecha for partido in api.partidos}, key=lambda x: x[4:])
-    fecha = seleccion(fechas)
-    partidos_fecha = [partido for partido in api.partidos if partido.fecha.startswith(fecha)]
+    fecha = seleccion(api.fechas)
+    partidos_fecha = api.partidos_en_fecha(fecha)
     print(f"\nPartidos el día {fecha}")
     return seleccion(partidos_fecha)
 
 
+def buscar_por_rango(api: CargarApi) -> Partido:
+    """
+    Busca partidos entre dos fechas.
+
+    Args:
+        api (CargarApi): Instancia de CargarApi para acceder a los datos.
+
+    Returns:
+        Partido: Partido seleccionado por el usuario.
+    """
+    while True:
+        desde = parsear_fecha(input("Ingrese la fecha inicial (AAAA-MM-DD): "))
+        hasta = parsear_fecha(input("Ingrese la fecha final (AAAA-MM-DD): "))
+        if desde is None or hasta is None or desde > hasta:
+            print("Rango inválido. Intente de nuevo.")
+            continue
+        partidos_rango = api.partidos_entre(desde, hasta)
+        if len(partidos_rango) == 0:
+            print("No hay partidos en ese rango. Intente de nuevo.")
+            continue
+        break
+    print(f"\nPartidos entre {desde} y {hasta}")
+    return seleccion(partidos_rango)
+
+
 def buscar_por_id(api: CargarApi, partido_id: str) -> Partido or None:
     """
     Busca un partido por su ID.
@@ -85,7 +112,4 @@ def buscar_por_id(api: CargarApi, partido_id: str) -> Partido or None:
     Returns:
         Partido or None: Partido encontrado o None si no se encuentra.
     """
-    for partido in api.partidos:
-        if partido.id == partido_id:
-            return partido
-    return None
\ No newline at end of file
+    return api.partidos_por_id.get(partido_id)
\ No newline at end of file
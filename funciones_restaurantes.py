@@ -1,41 +1,11 @@
 from cargar_api import CargarApi
-from entrada import Entrada
 from producto import Producto
 from estadio import Estadio
 from factura import Factura
 from restaurantes import Restaurante
+from inventario import StockInsuficiente
 from funciones_ayudante import seleccion
-
-
-class NoEsVip(Exception):
-    """
-    Excepción personalizada para indicar que un cliente no tiene entradas VIP.
-    """
-    pass
-
-
-def es_vip(cedula: int, api: CargarApi) -> list[Entrada]:
-    """
-    Verifica si un cliente tiene entradas VIP.
-
-    Args:
-        cedula (int): Cédula del cliente.
-        api (CargarApi): Instancia de CargarApi para acceder a los datos.
-
-    Returns:
-        list[Entrada]: Lista de entradas VIP del cliente.
-
-    Raises:
-        NoEsVip: Si el cliente no tiene entradas VIP.
-    """
-    entradas = []
-    for partido in api.partidos:
-        for entrada in partido.entradas:
-            if entrada.cliente.cedula == cedula and entrada.tipo == 'vip':
-                entradas.append(entrada)
-    if len(entradas) == 0:
-        raise NoEsVip
-    return entradas
+from servicio import Servicio, ClienteNoVip
 
 
 def iniciar_compra(estadio: Estadio, edad: int) -> tuple[list[Producto], Restaurante]:
@@ -56,21 +26,21 @@ def iniciar_compra(estadio: Estadio, edad: int) -> tuple[list[Producto], Restaur
     return restaurante.iniciar_compra(edad), restaurante
 
 
-def compra_restaurante(api: CargarApi):
+def compra_restaurante(servicio: Servicio):
     """
     Realiza una compra en un restaurante para un cliente con entrada VIP.
 
     Args:
-        api (CargarApi): Instancia de CargarApi para acceder a los datos.
+        servicio (Servicio): Servicio con el que se registra la compra.
     """
     while True:
         try:
             cedula = int(input("Ingrese la cédula del cliente: "))
-            entradas = es_vip(cedula, api)
+            entradas = servicio.entradas_vip(cedula)
         except ValueError:
             print("Cédula inválida.")
             continue
-        except NoEsVip:
+        except ClienteNoVip:
             print("El cliente no tiene entrada VIP.")
             return
         break
@@ -89,8 +59,20 @@ def compra_restaurante(api: CargarApi):
     entrada = entradas[estadio_num - 1]
     productos_deseados, restaurante = iniciar_compra(entrada.partido.estadio, entrada.cliente.edad)
     factura = Factura(entrada, productos_deseados, restaurante)
-    entrada.compras.append(factura)
-    entrada.cliente.compras.append(factura)
+    try:
+        reserva = restaurante.inventario.reservar(factura.cantidades())
+    except StockInsuficiente as error:
+        print(error)
+        return
+    if factura.descuento:
+        print("Su cedula es un numero perfecto! Se le aplicara un descuento del 15%.")
+    print(factura.mostrar())
+    if input("Desea continuar con la compra? (s/n): ").lower() == "n":
+        restaurante.inventario.cancelar(reserva)
+        print("Compra cancelada.")
+        return
+    servicio.registrar_factura(factura, reserva)
+    print("Compra realizada con exito!")
 
 
 def buscar_restaurante(api: CargarApi, nombre: str) -> Restaurante:
@@ -107,8 +89,7 @@ def buscar_restaurante(api: CargarApi, nombre: str) -> Restaurante:
     Raises:
         ValueError: Si el restaurante no se encuentra.
     """
-    for estadio in api.estadios:
-        for restaurante in estadio.restaurantes:
-            if restaurante.nombre == nombre:
-                return restaurante
-    raise ValueError("Restaurante no encontrado.")
\ No newline at end of file
+    restaurante = api.restaurantes_por_nombre.get(nombre)
+    if restaurante is None:
+        raise ValueError("Restaurante no encontrado.")
+    return restaurante
\ No newline at end of file
@@ -0,0 +1,162 @@
+import os
+import json
+import argparse
+from contextlib import chdir
+from snapshot import guardar_snapshot
+from cargar_api import CargarApi
+
+MAXIMO_EQUIPOS = 26 * 26
+
+
+def datos_sinteticos(n_equipos: int = 24, n_estadios: int = 10, n_partidos: int = 51, capacidad: tuple[int, int] = (20, 60),
+                     stock: int = 500) -> tuple[list[dict], list[dict], list[dict]]:
+    """
+    Genera datos crudos de equipos, estadios y partidos con la misma forma que los de la API.
+
+    Los nombres de los equipos empiezan con dos letras distintas para que los IDs de los partidos no se repitan,
+    y el visitante de cada partido se elige entre los otros equipos, así ningún equipo juega contra sí mismo.
+
+    Args:
+        n_equipos (int): Número de equipos a generar (entre 2 y 676).
+        n_estadios (int): Número de estadios a generar.
+        n_partidos (int): Número de partidos a generar.
+        capacidad (tuple[int, int]): Capacidad VIP y general de cada estadio.
+        stock (int): Stock inicial de cada producto de cada restaurante.
+
+    Returns:
+        tuple[list[dict], list[dict], list[dict]]: Equipos, estadios y partidos.
+
+    Raises:
+        ValueError: Si la cantidad de equipos está fuera de rango.
+    """
+    if not 2 <= n_equipos <= MAXIMO_EQUIPOS:
+        raise ValueError(f"La cantidad de equipos debe estar entre 2 y {MAXIMO_EQUIPOS}.")
+    letras = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    prefijos = [a + b for a in letras for b in letras]
+    equipos = [{"id": f"t{i}", "code": prefijos[i], "name": f"{prefijos[i]}landia", "group": letras[i % 6]} for i in range(n_equipos)]
+    productos = [{"name": f"Producto {j}", "quantity": "1", "price": str(2.5 + j), "stock": stock, "adicional": ["plate", "alcoholic", "non-alcoholic", "package"][j % 4]} for j in range(8)]
+    estadios = [{"id": f"s{i}", "name": f"{letras[i % 26]}stadion {i}", "city": f"Ciudad {i}", "capacity": list(capacidad),
+                 "restaurants": [{"name": f"Restaurante {i}-{k}", "products": productos} for k in range(3)]} for i in range(n_estadios)]
+    partidos = []
+    for i in range(n_partidos):
+        local = equipos[i % n_equipos]
+        visitante = equipos[(i % n_equipos + 1 + i // n_equipos % (n_equipos - 1)) % n_equipos]
+        partidos.append({"id": f"m{i}", "number": i + 1, "home": local, "away": visitante,
+                         "date": f"2024-{6 + i // 30 % 2:02d}-{1 + i % 28:02d}", "group": local["group"], "stadium_id": f"s{i % n_estadios}"})
+    return equipos, estadios, partidos
+
+
+def escribir_snapshots(equipos: list[dict], estadios: list[dict], partidos: list[dict]):
+    """
+    Escribe los snapshots de la API en el directorio actual.
+
+    Args:
+        equipos (list[dict]): Datos crudos de los equipos.
+        estadios (list[dict]): Datos crudos de los estadios.
+        partidos (list[dict]): Datos crudos de los partidos.
+    """
+    guardar_snapshot("equipos.json", equipos)
+    guardar_snapshot("estadios.json", estadios)
+    guardar_snapshot("partidos.json", partidos)
+
+
+def clientes_sinteticos(partidos: list, n_clientes: int, formato_anterior: bool = False) -> list[dict]:
+    """
+    Genera datos guardados de clientes, con una entrada cada uno y una factura por cada entrada VIP.
+
+    Args:
+        partidos (list): Lista de objetos Partido donde se ubican las entradas.
+        n_clientes (int): Número de clientes a generar.
+        formato_anterior (bool): Si es True, omite los precios guardados, como en las versiones anteriores.
+
+    Returns:
+        list[dict]: Datos de los clientes con el formato de Cliente.__dict__().
+    """
+    letras = partidos[0].letras
+    clientes = []
+    for i in range(n_clientes):
+        partido = partidos[i % len(partidos)]
+        k = i // len(partidos)
+        vip = i % 4 == 0
+        asiento = f"{'v' if vip else ''}{letras[k % len(letras)]}{k // len(letras) + 1}"
+        precio = 75 if vip else 35
+        entrada = {"tipo": "vip" if vip else "general", "partido": partido.id, "asiento": asiento,
+                   "codigo": f"{asiento} {partido.id}", "validado": i % 3 == 0, "compras": []}
+        if not formato_anterior:
+            entrada["factura"] = {"subtotal": precio, "descuento": 0, "IVA": precio * 0.16, "total": precio * 1.16}
+        if vip:
+            restaurante = partido.estadio.restaurantes[0]
+            compra = {"productos": [producto.__dict__() for producto in restaurante.productos[:2]], "restaurante": restaurante.nombre}
+            if not formato_anterior:
+                subtotal = sum(producto.precio for producto in restaurante.productos[:2])
+                compra.update({"subtotal": subtotal, "descuento": 0, "iva": subtotal * 0.16, "total": subtotal * 1.16})
+            entrada["compras"].append(compra)
+        clientes.append({"nombre": f"Cliente {i}", "cedula": 10_000_000 + i, "edad": 18 + i % 60, "entradas": [entrada], "compras": [], "gastos_totales": 0})
+    return clientes
+
+
+def escribir_clientes(clientes: list[dict], filename: str = "datos_clientes.txt"):
+    """
+    Escribe datos de clientes con el formato del backend de texto, un cliente JSON por línea.
+
+    Args:
+        clientes (list[dict]): Datos de los clientes, como los de clientes_sinteticos.
+        filename (str): Nombre del archivo de datos.
+    """
+    with open(filename, "w", encoding="utf-8") as file:
+        for cliente in clientes:
+            file.write(json.dumps(cliente, ensure_ascii=False))
+            file.write("\n")
+
+
+def generar(directorio: str, n_equipos: int = 24, n_estadios: int = 10, n_partidos: int = 51, n_clientes: int = 0,
+            capacidad: tuple[int, int] = (20, 60), stock: int = None) -> dict:
+    """
+    Genera un torneo sintético en un directorio: los snapshots de la API y, si se piden, los datos guardados de los clientes.
+
+    La capacidad de los estadios se agranda si hace falta para ubicar a todos los clientes, y el stock
+    alcanza por defecto para las compras guardadas y otras tantas más. El directorio debe estar vacío, para
+    no reemplazar los datos reales ni dejar un inventario o un diario que no correspondan al torneo generado.
+
+    Args:
+        directorio (str): Directorio vacío donde se escriben los archivos; se crea si no existe.
+        n_equipos (int): Número de equipos (entre 2 y 676).
+        n_estadios (int): Número de estadios.
+        n_partidos (int): Número de partidos.
+        n_clientes (int): Número de clientes con una entrada cada uno; 0 no escribe el archivo de clientes.
+        capacidad (tuple[int, int]): Capacidad VIP y general mínima de cada estadio.
+        stock (int): Stock inicial de cada producto, o None para calcularlo según la cantidad de clientes.
+
+    Returns:
+        dict: Cantidad de equipos, estadios, partidos y clientes generados, capacidad y stock usados.
+
+    Raises:
+        FileExistsError: Si el directorio ya tiene archivos.
+        ValueError: Si la cantidad de equipos está fuera de rango.
+    """
+    por_partido = -(-n_clientes // n_partidos) if n_partidos else 0
+    capacidad = (max(capacidad[0], por_partido), max(capacidad[1], por_partido))
+    stock = stock if stock is not None else max(500, 2 * n_clientes)
+    if os.path.isdir(directorio) and os.listdir(directorio):
+        raise FileExistsError(f"El directorio {directorio} no está vacío.")
+    datos = datos_sinteticos(n_equipos, n_estadios, n_partidos, capacidad, stock)
+    os.makedirs(directorio, exist_ok=True)
+    with chdir(directorio):
+        escribir_snapshots(*datos)
+        if n_clientes:
+            escribir_clientes(clientes_sinteticos(CargarApi().partidos, n_clientes))
+    return {"equipos": n_equipos, "estadios": n_estadios, "partidos": n_partidos, "clientes": n_clientes, "capacidad": list(capacidad), "stock": stock}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera un torneo sintético (snapshots de la API y datos de clientes) a la escala indicada.")
+    parser.add_argument("--directorio", required=True, help="Directorio vacío donde se escriben los archivos.")
+    parser.add_argument("--equipos", type=int, default=24)
+    parser.add_argument("--estadios", type=int, default=10)
+    parser.add_argument("--partidos", type=int, default=51)
+    parser.add_argument("--clientes", type=int, default=0, help="Clientes con una entrada cada uno; las VIP tienen una factura.")
+    argumentos = parser.parse_args()
+    try:
+        print(generar(argumentos.directorio, argumentos.equipos, argumentos.estadios, argumentos.partidos, argumentos.clientes))
+    except (FileExistsError, ValueError) as error:
+        parser.error(str(error))
@@ -0,0 +1,158 @@
+import json
+import time
+import random
+import asyncio
+import argparse
+from servidor import HOST, PUERTO
+
+
+class ClienteHttp:
+    """
+    Cliente HTTP/1.1 mínimo que mantiene abierta una conexión con el servidor y envía peticiones JSON de a una.
+
+    Attributes:
+        host (str): Dirección del servidor.
+        puerto (int): Puerto del servidor.
+    """
+
+    def __init__(self, host: str, puerto: int):
+        """
+        Inicializa una instancia de la clase ClienteHttp. La conexión se abre con conectar().
+
+        Args:
+            host (str): Dirección del servidor.
+            puerto (int): Puerto del servidor.
+        """
+        self.host = host
+        self.puerto = puerto
+        self._reader = None
+        self._writer = None
+
+    async def conectar(self):
+        """
+        Abre la conexión con el servidor.
+        """
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.puerto)
+
+    async def pedir(self, metodo: str, ruta: str, datos: dict = None) -> tuple[int, object]:
+        """
+        Envía una petición y espera su respuesta.
+
+        Args:
+            metodo (str): Método HTTP.
+            ruta (str): Ruta pedida.
+            datos (dict): Cuerpo JSON de la petición, o None.
+
+        Returns:
+            tuple[int, object]: Código de estado y cuerpo JSON de la respuesta.
+        """
+        cuerpo = json.dumps(datos).encode("utf-8") if datos is not None else b""
+        self._writer.write(f"{metodo} {ruta} HTTP/1.1\r\nHost: {self.host}\r\nContent-Type: application/json\r\n"
+                           f"Content-Length: {len(cuerpo)}\r\n\r\n".encode("latin-1") + cuerpo)
+        await self._writer.drain()
+        estado = int((await self._reader.readline()).split()[1])
+        largo = 0
+        while (linea := await self._reader.readline()) not in (b"\r\n", b""):
+            nombre, _, valor = linea.decode("latin-1").partition(":")
+            if nombre.lower() == "content-length":
+                largo = int(valor)
+        return estado, json.loads(await self._reader.readexactly(largo))
+
+    async def cerrar(self):
+        """
+        Cierra la conexión con el servidor.
+        """
+        self._writer.close()
+        await self._writer.wait_closed()
+
+
+def percentil(valores: list[float], p: float) -> float:
+    """
+    Calcula un percentil por el método del rango más cercano.
+
+    Args:
+        valores (list[float]): Valores ordenados de menor a mayor.
+        p (float): Percentil entre 0 y 100.
+
+    Returns:
+        float: El valor del percentil, o 0 si no hay valores.
+    """
+    if not valores:
+        return 0
+    return valores[min(len(valores) - 1, max(0, round(p / 100 * len(valores) + 0.5) - 1))]
+
+
+async def generar_carga(host: str = HOST, puerto: int = PUERTO, peticiones: int = 10_000, conexiones: int = 32,
+                        proporcion_validaciones: float = 0.3, semilla: int = 0) -> dict:
+    """
+    Envía una mezcla de ventas de entradas y validaciones desde varias conexiones concurrentes y mide la latencia.
+
+    Cada conexión vende entradas a clientes nuevos en partidos al azar y valida algunas de las entradas que vendió.
+
+    Args:
+        host (str): Dirección del servidor.
+        puerto (int): Puerto del servidor.
+        peticiones (int): Cantidad total de peticiones a enviar.
+        conexiones (int): Cantidad de conexiones concurrentes.
+        proporcion_validaciones (float): Fracción de las peticiones que son validaciones.
+        semilla (int): Semilla del generador de números aleatorios.
+
+    Returns:
+        dict: Peticiones enviadas, segundos, peticiones por segundo, latencias p50 y p99 en milisegundos
+            y cantidad de respuestas por código de estado.
+    """
+    cliente = ClienteHttp(host, puerto)
+    await cliente.conectar()
+    _, partidos = await cliente.pedir("GET", "/partidos")
+    await cliente.cerrar()
+    partidos = [partido["id"] for partido in partidos]
+    latencias, estados = [], {}
+
+    async def trabajar(numero: int, cantidad: int):
+        rng = random.Random(semilla * 1000 + numero)
+        http = ClienteHttp(host, puerto)
+        await http.conectar()
+        vendidas = []
+        for i in range(cantidad):
+            if vendidas and rng.random() < proporcion_validaciones:
+                ruta, datos = "/validaciones", {"codigo": vendidas.pop()}
+            else:
+                cedula = 30_000_000 + numero * 1_000_000 + i
+                ruta, datos = "/entradas", {"cedula": cedula, "partido": rng.choice(partidos), "tipo": rng.choice(["general", "vip"]),
+                                            "nombre": f"Cliente {cedula}", "edad": rng.randint(12, 80)}
+            inicio = time.perf_counter()
+            estado, respuesta = await http.pedir("POST", ruta, datos)
+            latencias.append(time.perf_counter() - inicio)
+            estados[estado] = estados.get(estado, 0) + 1
+            if ruta == "/entradas" and estado == 201:
+                vendidas.append(respuesta["codigo"])
+        await http.cerrar()
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(trabajar(numero, peticiones // conexiones + (numero < peticiones % conexiones)) for numero in range(conexiones)))
+    tiempo = time.perf_counter() - inicio
+    latencias.sort()
+    return {"peticiones": len(latencias), "segundos": tiempo, "peticiones_por_segundo": len(latencias) / tiempo,
+            "p50_ms": percentil(latencias, 50) * 1000, "p99_ms": percentil(latencias, 99) * 1000, "estados": estados}
+
+
+def imprimir_resultado(resultado: dict):
+    """
+    Imprime el resultado de una prueba de carga.
+
+    Args:
+        resultado (dict): Resultado retornado por generar_carga.
+    """
+    print(f"{resultado['peticiones']} peticiones en {resultado['segundos']:.2f} s: {resultado['peticiones_por_segundo']:,.0f} peticiones/s, "
+          f"p50 {resultado['p50_ms']:.2f} ms, p99 {resultado['p99_ms']:.2f} ms, estados {resultado['estados']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generador de carga para el servidor de la taquilla.")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--puerto", type=int, default=PUERTO)
+    parser.add_argument("--peticiones", type=int, default=10_000)
+    parser.add_argument("--conexiones", type=int, default=32)
+    parser.add_argument("--validaciones", type=float, default=0.3, help="Fracción de las peticiones que son validaciones.")
+    argumentos = parser.parse_args()
+    imprimir_resultado(asyncio.run(generar_carga(argumentos.host, argumentos.puerto, argumentos.peticiones, argumentos.conexiones, argumentos.validaciones)))
@@ -1,62 +1,256 @@
 import os
+import json
+from ast import literal_eval
+from itertools import islice
 from cliente import Cliente
 from entrada import Entrada
 from factura import Factura
 from producto import Producto
 from cargar_api import CargarApi
-from funciones_partidos import buscar_por_id
 from funciones_ayudante import file_exists
 from funciones_restaurantes import buscar_restaurante
+from diario import diario_eventos, ENTRADA_VENDIDA, ENTRADA_VALIDADA, FACTURA_CREADA
+from registro_clientes import ClienteRegistry
+from inventario import guardar_inventario, cargar_inventario
+import almacen_sqlite
+from instrumentacion import medir, contar
 
+BACKEND = os.environ.get("EURO2024_BACKEND", "texto")
+TAMANO_LOTE = 1000
 
-def guardar_datos(datos: list[Cliente]):
+
+@medir
+def guardar_datos(datos: ClienteRegistry, backend: str = None, api: CargarApi = None):
     """
-    Guarda los datos de los clientes en un archivo.
+    Guarda los datos de los clientes y el stock de los restaurantes y compacta el diario de eventos.
+
+    Con el backend de texto el archivo se escribe completo en un temporal y se reemplaza de forma atómica;
+    con el backend SQLite se reemplaza el contenido de la base en una transacción. Después el diario se
+    vacía, ya que sus eventos quedaron incluidos en los datos guardados.
+
+    El inventario se guarda primero, con el número de la nueva generación. Si el programa se cae antes de
+    vaciar el diario, al cargar se reaplican sus eventos sin duplicar lo que ya estaba guardado: las entradas
+    y las facturas que ya están en los datos se saltan, y el stock solo se descuenta para las facturas de
+    generaciones que el inventario no incluye.
 
     Args:
-        datos (list[Cliente]): Lista de clientes a guardar.
+        datos (ClienteRegistry): Registro de clientes a guardar.
+        backend (str): "texto" o "sqlite". Por defecto se usa la variable de entorno EURO2024_BACKEND.
+        api (CargarApi): Instancia de CargarApi cuyo inventario se guarda, o None para guardar solo los clientes.
+    """
+    backend = backend or BACKEND
+    if len(datos) == 0:
+        return
+    generacion = diario_eventos.generacion + 1
+    if api is not None:
+        guardar_inventario(api, generacion=generacion)
+    if backend == "sqlite":
+        conexion = almacen_sqlite.conectar()
+        try:
+            almacen_sqlite.escribir_clientes(conexion, datos)
+        finally:
+            conexion.close()
+    else:
+        with open("datos_clientes.txt.tmp", "w") as file:
+            for cliente in datos:
+                file.write(json.dumps(cliente.__dict__(), ensure_ascii=False))
+                file.write("\n")
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace("datos_clientes.txt.tmp", "datos_clientes.txt")
+    diario_eventos.truncar()
+    diario_eventos.generacion = generacion
+
+
+def conexion_estadisticas():
+    """
+    Abre la base SQLite para calcular las estadísticas con SQL, sin guardar ni compactar nada.
+
+    Se llama después de cargar_datos. La base solo está al día si es el backend configurado, existe y el
+    diario no tiene eventos pendientes; si no, las estadísticas deben calcularse con los datos cargados.
+
+    Returns:
+        sqlite3.Connection or None: Conexión a la base, o None si la base no refleja todos los datos.
     """
-    if len(datos) > 0:
-        if os.path.exists("datos_clientes.txt"):
-            os.remove("datos_clientes.txt")
-    with open("datos_clientes.txt", "a") as file:
-        for cliente in datos:
-            file.write(str(cliente.__dict__()))
-            file.write("\n")
-    print("Datos guardados con éxito.")
+    if BACKEND != "sqlite" or diario_eventos.eventos > 0 or not file_exists([almacen_sqlite.ARCHIVO_SQLITE]):
+        return None
+    return almacen_sqlite.conectar()
 
 
-def cargar_datos(api: CargarApi) -> list[Cliente]:
+@medir
+def cargar_datos(api: CargarApi, backend: str = None) -> ClienteRegistry:
     """
-    Carga los datos de los clientes desde un archivo.
+    Carga los datos de los clientes y el stock de los restaurantes y reaplica los eventos del diario
+    posteriores al último guardado.
+
+    Si no hay un inventario guardado (por ejemplo, con datos de versiones anteriores), el stock se
+    reconstruye descontando del catálogo las facturas guardadas. Las facturas del diario siempre se
+    descuentan, porque son posteriores al último guardado del inventario.
 
     Args:
         api (CargarApi): Instancia de CargarApi para acceder a los datos.
+        backend (str): "texto" o "sqlite". Por defecto se usa la variable de entorno EURO2024_BACKEND.
 
     Returns:
-        list[Cliente]: Lista de clientes cargados desde el archivo.
-    """
-    clientes = []
-    if not file_exists(["datos_clientes.txt"]):
-        return clientes
-    with open("datos_clientes.txt", "r") as file:
-        for line in file:
-            datos = eval(line)
-            cliente = Cliente(datos["nombre"], datos["cedula"], datos["edad"])
-            entradas = datos["entradas"]
-            partidos = [buscar_por_id(api, entrada["partido"]) for entrada in datos["entradas"]]
-            for i, entrada in enumerate(entradas):
-                partidos[i].modificar_asientos_(entrada["tipo"] == "vip", entrada["asiento"])
-                partidos[i].asistencia += 1 if entrada["validado"] else 0
-                entra = Entrada(entrada["tipo"], partidos[i], entrada["asiento"], cliente, entrada["codigo"], True)
-                if entrada["validado"]:
-                    entra.validado = True
-                for compras in entrada["compras"]:
-                    productos = [Producto(producto["nombre"], producto["cantidad"], producto["precio"], producto["stock"], producto["adicional"]) for producto in compras["productos"]]
-                    restaurante = buscar_restaurante(api, compras["restaurante"])
-                    entra.compras.extend([Factura(entra, productos, restaurante, True)])
-                partidos[i].entradas.append(entra)
-                cliente.entradas.append(entra)
-            clientes.append(cliente)
+        ClienteRegistry: Registro con los clientes cargados.
+    """
+    clientes = ClienteRegistry()
+    generacion = cargar_inventario(api)
+    diario_eventos.generacion = generacion or 0
+    for lote in _leer_lotes(backend or BACKEND, TAMANO_LOTE):
+        for datos in lote:
+            if datos["cedula"] in clientes:
+                continue
+            cliente = clientes.agregar(Cliente(datos["nombre"], datos["cedula"], datos["edad"]))
+            for entrada in datos["entradas"]:
+                _hidratar_entrada(api, clientes, cliente, entrada, generacion is None)
+    _reaplicar_diario(api, clientes, generacion)
     return clientes
 
+
+def _leer_lotes(backend: str, tamano: int):
+    """
+    Recorre los clientes guardados en el backend indicado, en lotes de tamaño fijo.
+
+    Args:
+        backend (str): "texto" o "sqlite".
+        tamano (int): Cantidad de clientes por lote.
+
+    Yields:
+        list[dict]: Datos guardados de los clientes de cada lote.
+    """
+    if backend == "sqlite":
+        if not file_exists([almacen_sqlite.ARCHIVO_SQLITE]):
+            return
+        conexion = almacen_sqlite.conectar()
+        try:
+            registros = almacen_sqlite.leer_clientes(conexion)
+            while lote := list(islice(registros, tamano)):
+                yield lote
+        finally:
+            conexion.close()
+    elif file_exists(["datos_clientes.txt"]):
+        with open("datos_clientes.txt", "r") as file:
+            while lineas := list(islice(file, tamano)):
+                yield _parsear_lote(lineas)
+
+
+def _parsear_lote(lineas: list[str]) -> list[dict]:
+    """
+    Convierte un lote de líneas del archivo de datos en diccionarios.
+
+    Las líneas nuevas están en JSON y se decodifican todas juntas como un solo arreglo; las escritas por
+    versiones anteriores son literales de Python y se evalúan una por una.
+
+    Args:
+        lineas (list[str]): Líneas del archivo de datos.
+
+    Returns:
+        list[dict]: Datos guardados de los clientes.
+    """
+    lineas = [line for line in lineas if line.strip()]
+    if all(line.startswith('{"') for line in lineas):
+        return json.loads(f"[{','.join(lineas)}]")
+    return [json.loads(line) if line.startswith('{"') else literal_eval(line) for line in lineas]
+
+
+def _hidratar_entrada(api: CargarApi, clientes: ClienteRegistry, cliente: Cliente, entrada: dict, descontar: bool = False) -> Entrada:
+    """
+    Reconstruye una entrada guardada, ocupando su asiento y registrándola en su partido y en su cliente.
+
+    El precio guardado se restaura tal cual; solo los datos de versiones anteriores, que no lo guardaban, lo recalculan.
+    Si el asiento guardado ya no existe en el mapa del estadio (datos antiguos o un estadio redimensionado), la
+    entrada se carga igual, sin ocupar ningún asiento.
+
+    Args:
+        api (CargarApi): Instancia de CargarApi para acceder a los datos.
+        clientes (ClienteRegistry): Registro de clientes.
+        cliente (Cliente): Cliente dueño de la entrada.
+        entrada (dict): Datos guardados de la entrada.
+        descontar (bool): Indica si las facturas de la entrada se descuentan del inventario.
+
+    Returns:
+        Entrada: La entrada reconstruida.
+    """
+    partido = api.partidos_por_id[entrada["partido"]]
+    try:
+        partido.modificar_asientos_(entrada["tipo"] == "vip", entrada["asiento"])
+    except KeyError:
+        print(f"El asiento {entrada['asiento']} de la entrada {entrada['codigo']} no existe en el estadio; no se ocupará.")
+    partido.asistencia += 1 if entrada["validado"] else 0
+    entra = Entrada(entrada["tipo"], partido, entrada["asiento"], cliente, entrada["codigo"], True, entrada.get("factura"))
+    if entrada["validado"]:
+        entra.validado = True
+    for compras in entrada["compras"]:
+        entra.compras.append(_hidratar_factura(api, entra, compras, descontar))
+    api.registrar_entrada(entra)
+    clientes.registrar_entrada(entra)
+    return entra
+
+
+def _hidratar_factura(api: CargarApi, entrada: Entrada, compras: dict, descontar: bool = False) -> Factura:
+    """
+    Reconstruye una factura guardada. Quien la llama la asocia a su entrada.
+
+    Los productos que siguen en el menú del restaurante se toman del catálogo, así la factura comparte los
+    objetos Producto con el inventario; los que ya no están se reconstruyen con los datos guardados.
+
+    Args:
+        api (CargarApi): Instancia de CargarApi para acceder a los datos.
+        entrada (Entrada): Entrada con la que se realizó la compra.
+        compras (dict): Datos guardados de la factura.
+        descontar (bool): Indica si las unidades compradas se descuentan del inventario del restaurante.
+
+    Returns:
+        Factura: La factura reconstruida.
+    """
+    restaurante = buscar_restaurante(api, compras["restaurante"])
+    productos = [restaurante.buscar_producto(producto["nombre"])
+                 or Producto(producto["nombre"], producto["cantidad"], producto["precio"], producto["stock"], producto["adicional"])
+                 for producto in compras["productos"]]
+    factura = Factura(entrada, productos, restaurante, True, compras if "total" in compras else None)
+    if descontar:
+        restaurante.inventario.descontar(factura.cantidades())
+    return factura
+
+
+def _reaplicar_diario(api: CargarApi, clientes: ClienteRegistry, generacion: int = None):
+    """
+    Reaplica los eventos del diario escritos después del último guardado.
+
+    Los eventos que ya están en los datos cargados (porque el programa se cayó después de guardar y antes de
+    vaciar el diario) se saltan: las entradas por su código y las facturas por su posición en las compras de
+    su entrada, comparada con las compras que la entrada ya tenía guardadas.
+
+    Args:
+        api (CargarApi): Instancia de CargarApi para acceder a los datos.
+        clientes (ClienteRegistry): Registro de clientes cargados, que se completa con los clientes nuevos.
+        generacion (int): Generación del inventario restaurado, o None si el stock se recalculó a partir de
+            las ventas guardadas. Las facturas de generaciones anteriores ya están descontadas del inventario.
+    """
+    reaplicados = 0
+    guardadas = {}
+    for evento in diario_eventos.leer():
+        reaplicados += 1
+        if evento["evento"] == ENTRADA_VENDIDA:
+            if evento["entrada"]["codigo"] in api.entradas_por_codigo:
+                continue
+            datos = evento["cliente"]
+            cliente = clientes.agregar(Cliente(datos["nombre"], datos["cedula"], datos["edad"]))
+            _hidratar_entrada(api, clientes, cliente, evento["entrada"], True)
+        elif evento["evento"] == ENTRADA_VALIDADA:
+            entrada = api.entradas_por_codigo.get(evento["codigo"])
+            if entrada is not None:
+                api.registrar_validacion(entrada)
+        elif evento["evento"] == FACTURA_CREADA:
+            entrada = api.entradas_por_codigo.get(evento["codigo"])
+            if entrada is None:
+                continue
+            previas = guardadas.setdefault(entrada.codigo, len(entrada.compras))
+            if evento.get("indice", previas) >= previas:
+                descontar = generacion is None or evento.get("generacion", 0) >= generacion
+                factura = _hidratar_factura(api, entrada, evento["factura"], descontar)
+                api.registrar_factura(factura)
+                entrada.cliente.compras.append(factura)
+    diario_eventos.eventos = reaplicados
+    contar("eventos_reaplicados", reaplicados)
@@ -0,0 +1,217 @@
+import os
+import sys
+import math
+import time
+import atexit
+import threading
+from functools import wraps
+
+ACTIVA = os.environ.get("EURO2024_INSTRUMENTACION", "") not in ("", "0")
+PERFIL = os.environ.get("EURO2024_PERFIL") or None
+ARCHIVO_PERFIL = "perfil_{}.prof"
+
+# Límites superiores de los intervalos del histograma, en microsegundos (potencias de 2 hasta ~67 s)
+LIMITES = [2 ** i for i in range(27)]
+
+
+class Histograma:
+    """
+    Latencias de una operación agrupadas en intervalos de potencias de 2 microsegundos.
+
+    Attributes:
+        llamadas (int): Cantidad de llamadas medidas.
+        errores (int): Cantidad de llamadas que terminaron con una excepción.
+        total (float): Suma de las latencias, en microsegundos.
+        minimo (float): Menor latencia, en microsegundos.
+        maximo (float): Mayor latencia, en microsegundos.
+        intervalos (list[int]): Cantidad de llamadas en cada intervalo de LIMITES; el último cuenta las más lentas.
+    """
+
+    def __init__(self):
+        """
+        Inicializa un histograma sin llamadas.
+        """
+        self.llamadas = 0
+        self.errores = 0
+        self.total = 0
+        self.minimo = float("inf")
+        self.maximo = 0
+        self.intervalos = [0] * (len(LIMITES) + 1)
+
+    def agregar(self, microsegundos: float, error: bool = False):
+        """
+        Suma una llamada al histograma.
+
+        Args:
+            microsegundos (float): Latencia de la llamada.
+            error (bool): Indica si la llamada terminó con una excepción.
+        """
+        self.llamadas += 1
+        self.errores += error
+        self.total += microsegundos
+        self.minimo = min(self.minimo, microsegundos)
+        self.maximo = max(self.maximo, microsegundos)
+        self.intervalos[_intervalo(microsegundos)] += 1
+
+    def percentil(self, p: float) -> float:
+        """
+        Estima un percentil de las latencias con el límite superior de su intervalo.
+
+        Args:
+            p (float): Percentil entre 0 y 100.
+
+        Returns:
+            float: Latencia estimada en microsegundos, sin superar la máxima medida.
+        """
+        objetivo = p / 100 * self.llamadas
+        acumuladas = 0
+        for i, cantidad in enumerate(self.intervalos):
+            acumuladas += cantidad
+            if cantidad and acumuladas >= objetivo:
+                return min(LIMITES[i] if i < len(LIMITES) else self.maximo, self.maximo)
+        return self.maximo
+
+    def mostrar(self, nombre: str) -> str:
+        """
+        Muestra el resumen y los intervalos con llamadas del histograma.
+
+        Args:
+            nombre (str): Nombre de la operación.
+
+        Returns:
+            str: El histograma en texto.
+        """
+        lineas = [f"{nombre}: {self.llamadas} llamadas, {self.errores} con error | promedio {self.total / self.llamadas:,.1f} µs | "
+                  f"p50 {self.percentil(50):,.0f} µs | p99 {self.percentil(99):,.0f} µs | máx {self.maximo:,.1f} µs"]
+        mayor = max(self.intervalos)
+        for i, cantidad in enumerate(self.intervalos):
+            if cantidad:
+                limite = f"<= {LIMITES[i]:,} µs" if i < len(LIMITES) else f"> {LIMITES[-1]:,} µs"
+                lineas.append(f"  {limite:>16} {cantidad:>9} {'#' * max(1, round(40 * cantidad / mayor))}")
+        return "\n".join(lineas)
+
+
+def _intervalo(microsegundos: float) -> int:
+    """
+    Busca el intervalo del histograma de una latencia.
+
+    Args:
+        microsegundos (float): La latencia.
+
+    Returns:
+        int: Posición del primer límite mayor o igual a la latencia, o len(LIMITES) si los supera a todos.
+    """
+    return min(max(0, math.ceil(microsegundos) - 1).bit_length(), len(LIMITES))
+
+
+histogramas = {}
+contadores = {}
+_perfil = None
+_lock = threading.Lock()
+_lock_perfil = threading.Lock()
+
+
+def medir(funcion):
+    """
+    Decorador que mide la latencia de cada llamada a una función en el histograma de su nombre calificado
+    (por ejemplo "Servicio.vender_entrada").
+
+    Si la instrumentación está desactivada (variable de entorno EURO2024_INSTRUMENTACION vacía o "0") la
+    función se retorna sin envolver, así que no agrega ningún costo. Si la variable EURO2024_PERFIL tiene
+    el nombre de la función, sus llamadas se perfilan además con cProfile, de a una por vez, y el perfil se
+    escribe en perfil_<nombre>.prof al salir.
+
+    Args:
+        funcion (function): La función a medir.
+
+    Returns:
+        function: La función envuelta, o la misma función si no hay nada que medir.
+    """
+    nombre = funcion.__qualname__
+    perfilar, registrar = nombre == PERFIL, ACTIVA
+    if not registrar and not perfilar:
+        return funcion
+
+    @wraps(funcion)
+    def medida(*args, **kwargs):
+        error = True
+        inicio = time.perf_counter()
+        try:
+            if perfilar:
+                with _lock_perfil:
+                    resultado = _perfilador().runcall(funcion, *args, **kwargs)
+            else:
+                resultado = funcion(*args, **kwargs)
+            error = False
+            return resultado
+        finally:
+            if registrar:
+                microsegundos = (time.perf_counter() - inicio) * 1e6
+                with _lock:
+                    histograma = histogramas.get(nombre)
+                    if histograma is None:
+                        histograma = histogramas[nombre] = Histograma()
+                    histograma.agregar(microsegundos, error)
+
+    return medida
+
+
+def contar(nombre: str, cantidad: int = 1):
+    """
+    Suma una cantidad a un contador, si la instrumentación está activa.
+
+    Args:
+        nombre (str): Nombre del contador.
+        cantidad (int): Cantidad a sumar.
+    """
+    if ACTIVA:
+        with _lock:
+            contadores[nombre] = contadores.get(nombre, 0) + cantidad
+
+
+def _perfilador():
+    """
+    Retorna el perfilador de la operación elegida en EURO2024_PERFIL, creándolo en la primera llamada.
+    Se llama con el lock del perfil tomado.
+
+    Returns:
+        cProfile.Profile: El perfilador.
+    """
+    global _perfil
+    if _perfil is None:
+        import cProfile
+        _perfil = cProfile.Profile()
+    return _perfil
+
+
+def reporte() -> str:
+    """
+    Arma el reporte de los histogramas de latencia y los contadores registrados.
+
+    Returns:
+        str: El reporte, vacío si no se registró nada.
+    """
+    with _lock:
+        partes = [histograma.mostrar(nombre) for nombre, histograma in sorted(histogramas.items())]
+        if contadores:
+            partes.append("Contadores: " + ", ".join(f"{nombre}={valor}" for nombre, valor in sorted(contadores.items())))
+    return "\n".join(partes)
+
+
+def _al_salir():
+    """
+    Escribe en stderr el reporte de latencias y guarda el perfil de cProfile, si se capturó alguno.
+    """
+    texto = reporte()
+    if texto:
+        print(f"\n--- Instrumentación\n{texto}", file=sys.stderr)
+    if _perfil is not None:
+        import pstats
+        archivo = ARCHIVO_PERFIL.format(PERFIL)
+        _perfil.dump_stats(archivo)
+        print(f"\n--- Perfil de {PERFIL} (guardado en {archivo})", file=sys.stderr)
+        pstats.Stats(_perfil, stream=sys.stderr).sort_stats("cumulative").print_stats(15)
+
+
+if ACTIVA or PERFIL:
+    atexit.register(_al_salir)
@@ -0,0 +1,240 @@
+import threading
+from snapshot import guardar_snapshot, cargar_snapshot, SnapshotInvalido
+from funciones_ayudante import file_exists
+
+ARCHIVO_INVENTARIO = "inventario.json"
+
+
+class StockInsuficiente(Exception):
+    """
+    Excepción personalizada para indicar que no hay stock suficiente de un producto.
+
+    Attributes:
+        nombre (str): Nombre del producto sin stock suficiente.
+    """
+
+    def __init__(self, nombre: str):
+        """
+        Inicializa una instancia de la clase StockInsuficiente.
+
+        Args:
+            nombre (str): Nombre del producto sin stock suficiente.
+        """
+        super().__init__(f"Producto {nombre} no disponible")
+        self.nombre = nombre
+
+
+class Reserva:
+    """
+    Representa unidades de productos apartadas en un inventario hasta que se confirme o se cancele la compra.
+
+    Attributes:
+        inventario (Inventario): Inventario donde se hizo la reserva.
+        cantidades (dict): Unidades reservadas por nombre de producto.
+        vigente (bool): Indica si la reserva todavía no se confirmó ni se canceló.
+    """
+
+    def __init__(self, inventario, cantidades: dict[str, int]):
+        """
+        Inicializa una instancia de la clase Reserva.
+
+        Args:
+            inventario (Inventario): Inventario donde se hizo la reserva.
+            cantidades (dict[str, int]): Unidades reservadas por nombre de producto.
+        """
+        self.inventario = inventario
+        self.cantidades = cantidades
+        self.vigente = True
+
+
+class Inventario:
+    """
+    Inventario de un restaurante: el stock de cada producto de su catálogo, con reservas atómicas.
+
+    El stock vive en los objetos Producto del catálogo (así el menú muestra siempre el valor actual); el
+    inventario serializa con un lock las reservas y confirmaciones. Una reserva aparta todas las unidades
+    de una canasta o ninguna, de modo que dos compras concurrentes nunca venden más unidades de las que hay.
+
+    Attributes:
+        restaurante (Restaurante): Restaurante dueño del inventario.
+    """
+
+    def __init__(self, restaurante):
+        """
+        Inicializa una instancia de la clase Inventario.
+
+        Args:
+            restaurante (Restaurante): Restaurante dueño del inventario.
+        """
+        self.restaurante = restaurante
+        self._reservado = {}
+        self._lock = threading.Lock()
+
+    def disponible(self, nombre: str) -> int:
+        """
+        Retorna las unidades de un producto que se pueden reservar.
+
+        Args:
+            nombre (str): Nombre del producto.
+
+        Returns:
+            int: Stock del producto menos las unidades reservadas, o 0 si el producto no existe.
+        """
+        producto = self.restaurante.buscar_producto(nombre)
+        if producto is None:
+            return 0
+        with self._lock:
+            return producto.stock - self._reservado.get(nombre, 0)
+
+    def reservar(self, cantidades: dict[str, int]) -> Reserva:
+        """
+        Aparta las unidades de una canasta de productos. Se reservan todas o ninguna.
+
+        Args:
+            cantidades (dict[str, int]): Unidades a reservar por nombre de producto.
+
+        Returns:
+            Reserva: La reserva.
+
+        Raises:
+            StockInsuficiente: Si algún producto no existe o no tiene unidades suficientes.
+        """
+        with self._lock:
+            for nombre, cantidad in cantidades.items():
+                producto = self.restaurante.buscar_producto(nombre)
+                if producto is None or producto.stock - self._reservado.get(nombre, 0) < cantidad:
+                    raise StockInsuficiente(nombre)
+            for nombre, cantidad in cantidades.items():
+                self._reservado[nombre] = self._reservado.get(nombre, 0) + cantidad
+        return Reserva(self, dict(cantidades))
+
+    def confirmar(self, reserva: Reserva) -> bool:
+        """
+        Descuenta del stock las unidades de una reserva.
+
+        Args:
+            reserva (Reserva): La reserva a confirmar.
+
+        Returns:
+            bool: True si se confirmó, False si la reserva ya no estaba vigente.
+        """
+        with self._lock:
+            if not reserva.vigente:
+                return False
+            reserva.vigente = False
+            for nombre, cantidad in reserva.cantidades.items():
+                self.restaurante.buscar_producto(nombre).stock -= cantidad
+                self._liberar(nombre, cantidad)
+            return True
+
+    def cancelar(self, reserva: Reserva) -> bool:
+        """
+        Devuelve al inventario las unidades de una reserva sin descontarlas.
+
+        Args:
+            reserva (Reserva): La reserva a cancelar.
+
+        Returns:
+            bool: True si se canceló, False si la reserva ya no estaba vigente.
+        """
+        with self._lock:
+            if not reserva.vigente:
+                return False
+            reserva.vigente = False
+            for nombre, cantidad in reserva.cantidades.items():
+                self._liberar(nombre, cantidad)
+            return True
+
+    def descontar(self, cantidades: dict[str, int]):
+        """
+        Descuenta unidades del stock sin verificar que alcancen. Se usa al reconstruir ventas ya realizadas.
+
+        Los productos que ya no están en el catálogo se ignoran.
+
+        Args:
+            cantidades (dict[str, int]): Unidades vendidas por nombre de producto.
+        """
+        with self._lock:
+            for nombre, cantidad in cantidades.items():
+                producto = self.restaurante.buscar_producto(nombre)
+                if producto is not None:
+                    producto.stock -= cantidad
+
+    def estado(self) -> dict[str, int]:
+        """
+        Retorna el stock de cada producto del catálogo.
+
+        Returns:
+            dict[str, int]: Stock por nombre de producto.
+        """
+        with self._lock:
+            return {producto.nombre: producto.stock for producto in self.restaurante.productos}
+
+    def restaurar(self, estado: dict[str, int]):
+        """
+        Restaura el stock guardado de los productos del catálogo. Los productos que no aparecen conservan su stock.
+
+        Args:
+            estado (dict[str, int]): Stock por nombre de producto.
+        """
+        with self._lock:
+            for nombre, stock in estado.items():
+                producto = self.restaurante.buscar_producto(nombre)
+                if producto is not None:
+                    producto.stock = stock
+
+    def _liberar(self, nombre: str, cantidad: int):
+        """
+        Quita unidades de las reservadas de un producto. Se llama con el lock tomado.
+
+        Args:
+            nombre (str): Nombre del producto.
+            cantidad (int): Unidades a liberar.
+        """
+        restante = self._reservado[nombre] - cantidad
+        if restante:
+            self._reservado[nombre] = restante
+        else:
+            del self._reservado[nombre]
+
+
+def guardar_inventario(api, filename: str = ARCHIVO_INVENTARIO, generacion: int = 0):
+    """
+    Guarda el stock de todos los restaurantes en un snapshot.
+
+    Args:
+        api (CargarApi): Instancia de CargarApi con los estadios y sus restaurantes.
+        filename (str): Nombre del archivo del snapshot.
+        generacion (int): Número del guardado; las facturas del diario de generaciones anteriores ya están
+            descontadas en este stock.
+    """
+    guardar_snapshot(filename, {"generacion": generacion,
+                                "restaurantes": {restaurante.nombre: restaurante.inventario.estado()
+                                                 for estadio in api.estadios for restaurante in estadio.restaurantes}})
+
+
+def cargar_inventario(api, filename: str = ARCHIVO_INVENTARIO) -> int or None:
+    """
+    Restaura el stock guardado de los restaurantes.
+
+    Args:
+        api (CargarApi): Instancia de CargarApi con los estadios y sus restaurantes.
+        filename (str): Nombre del archivo del snapshot.
+
+    Returns:
+        int or None: Generación del snapshot restaurado (0 para los snapshots sin generación), o None si no
+            había un snapshot válido.
+    """
+    if not file_exists([filename]):
+        return None
+    try:
+        datos = cargar_snapshot(filename)
+    except SnapshotInvalido as e:
+        print(f"{e}. Se recalculará el stock a partir de las ventas guardadas.")
+        return None
+    generacion = datos.get("generacion")
+    estados = datos["restaurantes"] if isinstance(generacion, int) else datos
+    for estadio in api.estadios:
+        for restaurante in estadio.restaurantes:
+            restaurante.inventario.restaurar(estados.get(restaurante.nombre, {}))
+    return generacion if isinstance(generacion, int) else 0
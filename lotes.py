@@ -0,0 +1,167 @@
+import csv
+import json
+import time
+from servicio import Servicio, ErrorServicio, DatosInvalidos, VALIDADA, resumen_entrada
+from gestion_datos import guardar_datos
+
+COMPRAR = "comprar"
+VALIDAR = "validar"
+RESTAURANTE = "restaurante"
+
+GUARDAR_CADA = 1000
+
+CAMPOS_ENTEROS = ["cedula", "edad", "cantidad"]
+
+
+def leer_comandos(filename: str):
+    """
+    Recorre los comandos de un archivo CSV o JSONL, según su extensión.
+
+    En JSONL cada línea es un objeto con la llave "operacion" ("comprar", "validar" o "restaurante") y los
+    argumentos de la operación. En CSV la primera fila nombra las columnas (operacion, cedula, nombre, edad,
+    partido, tipo, asiento, cantidad, contiguos, codigo, restaurante, productos); las celdas vacías se omiten
+    y los productos se separan con ";".
+
+    Args:
+        filename (str): Nombre del archivo de comandos.
+
+    Yields:
+        tuple[int, dict or None]: Número de línea y comando, o None si la línea no se pudo leer.
+    """
+    with open(filename, "r", encoding="utf-8", newline="") as file:
+        if filename.lower().endswith(".csv"):
+            lector = csv.DictReader(file)
+            for fila in lector:
+                yield lector.line_num, _comando_csv(fila)
+        else:
+            for numero, linea in enumerate(file, 1):
+                if linea.strip():
+                    try:
+                        yield numero, json.loads(linea)
+                    except ValueError:
+                        yield numero, None
+
+
+def _comando_csv(fila: dict) -> dict or None:
+    """
+    Convierte una fila de un archivo CSV de comandos en un comando.
+
+    Args:
+        fila (dict): Celdas de la fila por nombre de columna.
+
+    Returns:
+        dict or None: El comando, o None si un campo numérico no es un número.
+    """
+    comando = {campo: valor.strip() for campo, valor in fila.items() if campo and valor and valor.strip()}
+    try:
+        for campo in CAMPOS_ENTEROS:
+            if campo in comando:
+                comando[campo] = int(comando[campo])
+    except ValueError:
+        return None
+    if "contiguos" in comando:
+        comando["contiguos"] = comando["contiguos"].lower() in ["s", "si", "sí", "true", "1"]
+    if "productos" in comando:
+        comando["productos"] = [producto.strip() for producto in comando["productos"].split(";") if producto.strip()]
+    return comando
+
+
+def ejecutar_comando(servicio: Servicio, comando: dict):
+    """
+    Ejecuta un comando con el servicio.
+
+    Los campos obligatorios se leen antes de llamar al servicio, así un KeyError interno de la operación no
+    se confunde con un campo faltante.
+
+    Args:
+        servicio (Servicio): Servicio con el que se ejecuta el comando.
+        comando (dict): Operación y argumentos del comando.
+
+    Returns:
+        object: El resultado de la operación, listo para escribirse como JSON.
+
+    Raises:
+        ErrorServicio: Si la operación falla o el comando es inválido.
+    """
+    operacion = _campo(comando, "operacion")
+    if operacion == COMPRAR:
+        cedula, partido, tipo = _campo(comando, "cedula"), _campo(comando, "partido"), _campo(comando, "tipo")
+        if "cantidad" in comando:
+            entradas = servicio.vender_entradas(cedula, partido, tipo, comando["cantidad"], comando.get("contiguos", False),
+                                                comando.get("nombre"), comando.get("edad"))
+            return [resumen_entrada(entrada) for entrada in entradas]
+        entrada = servicio.vender_entrada(cedula, partido, tipo, comando.get("asiento"), comando.get("nombre"), comando.get("edad"))
+        return resumen_entrada(entrada)
+    if operacion == VALIDAR:
+        codigo = _campo(comando, "codigo")
+        servicio.validar_entrada(codigo)
+        return {"codigo": codigo, "estado": VALIDADA}
+    if operacion == RESTAURANTE:
+        cedula, restaurante, productos = _campo(comando, "cedula"), _campo(comando, "restaurante"), _campo(comando, "productos")
+        return servicio.crear_factura(cedula, restaurante, productos, comando.get("codigo")).__dict__()
+    raise DatosInvalidos(f"Operación desconocida: {operacion}.")
+
+
+def _campo(comando: dict, nombre: str):
+    """
+    Lee un campo obligatorio de un comando.
+
+    Args:
+        comando (dict): El comando.
+        nombre (str): Nombre del campo.
+
+    Returns:
+        object: El valor del campo.
+
+    Raises:
+        DatosInvalidos: Si el comando no tiene el campo.
+    """
+    if nombre not in comando:
+        raise DatosInvalidos(f"Falta el campo '{nombre}'.")
+    return comando[nombre]
+
+
+def ejecutar_lote(servicio: Servicio, comandos, salida, guardar_cada: int = GUARDAR_CADA) -> dict:
+    """
+    Ejecuta comandos sin interacción, escribiendo el resultado de cada uno como una línea JSON.
+
+    Los datos se guardan cada `guardar_cada` comandos exitosos y al terminar. Un comando con datos de tipo
+    incorrecto (TypeError o ValueError) se informa como DatosInvalidos y el lote sigue con el siguiente.
+
+    Args:
+        servicio (Servicio): Servicio con el que se ejecutan los comandos.
+        comandos (iterable): Pares (número de línea, comando), como los de leer_comandos.
+        salida (file): Archivo de texto donde se escriben los resultados.
+        guardar_cada (int): Cantidad de comandos exitosos entre dos guardados; 0 guarda solo al terminar.
+
+    Returns:
+        dict: Comandos ejecutados, exitosos, fallidos, segundos y comandos por segundo.
+    """
+    exitosos = fallidos = pendientes = 0
+    inicio = time.perf_counter()
+    for numero, comando in comandos:
+        resultado = {"linea": numero}
+        try:
+            if not isinstance(comando, dict):
+                raise DatosInvalidos("Comando ilegible.")
+            resultado["operacion"] = comando.get("operacion")
+            resultado["resultado"] = ejecutar_comando(servicio, comando)
+            resultado["ok"] = True
+            exitosos += 1
+            pendientes += 1
+        except ErrorServicio as error:
+            resultado.update({"ok": False, "error": str(error), "tipo": type(error).__name__})
+            fallidos += 1
+        except (TypeError, ValueError) as error:
+            resultado.update({"ok": False, "error": f"Datos inválidos: {error}", "tipo": DatosInvalidos.__name__})
+            fallidos += 1
+        salida.write(json.dumps(resultado, ensure_ascii=False))
+        salida.write("\n")
+        if guardar_cada and pendientes >= guardar_cada:
+            guardar_datos(servicio.clientes, api=servicio.api)
+            pendientes = 0
+    guardar_datos(servicio.clientes, api=servicio.api)
+    tiempo = time.perf_counter() - inicio
+    total = exitosos + fallidos
+    return {"comandos": total, "exitosos": exitosos, "fallidos": fallidos, "segundos": tiempo,
+            "comandos_por_segundo": total / tiempo if tiempo else 0}
@@ -1,29 +1,65 @@
+import sys
+import argparse
 from cargar_api import CargarApi
 from funciones_ayudante import menu_principal
 from funciones_entradas import comprar_entrada, validar_entrada
 from funciones_restaurantes import compra_restaurante
 from estadisticas import Estadisticas
 from gestion_datos import guardar_datos, cargar_datos
+from diario import diario_eventos
+from servicio import Servicio
+from lotes import leer_comandos, ejecutar_lote, GUARDAR_CADA
 
 
 def main() -> None:
     api = CargarApi()
-    clientes = []
-    clientes.extend(cargar_datos(api))
+    servicio = Servicio(api, cargar_datos(api))
     while True:
         opcion = menu_principal()
         if opcion == "1":
-            clientes.append(comprar_entrada(api, clientes))
+            comprar_entrada(servicio)
         elif opcion == "2":
-            validar_entrada(api)
+            validar_entrada(servicio)
         elif opcion == "3":
-            compra_restaurante(api)
+            compra_restaurante(servicio)
         elif opcion == "4":
-            Estadisticas(api)
+            Estadisticas(api).mostrar()
         elif opcion == "5":
-            guardar_datos(clientes)
+            guardar_datos(servicio.clientes, api=servicio.api)
+            print("Datos guardados con éxito.")
             break
+        if diario_eventos.debe_compactar():
+            guardar_datos(servicio.clientes, api=servicio.api)
+
+
+def main_lotes(comandos: str, salida: str = None, guardar_cada: int = GUARDAR_CADA) -> None:
+    """
+    Ejecuta un archivo de comandos sin interacción y reporta el rendimiento al terminar.
+
+    Args:
+        comandos (str): Archivo CSV o JSONL de comandos.
+        salida (str): Archivo JSONL donde se escriben los resultados, o None para la salida estándar.
+        guardar_cada (int): Cantidad de comandos exitosos entre dos guardados.
+    """
+    api = CargarApi()
+    servicio = Servicio(api, cargar_datos(api))
+    file = open(salida, "w", encoding="utf-8") if salida else sys.stdout
+    try:
+        resultado = ejecutar_lote(servicio, leer_comandos(comandos), file, guardar_cada)
+    finally:
+        if salida:
+            file.close()
+    print(f"{resultado['comandos']} comandos ({resultado['exitosos']} exitosos, {resultado['fallidos']} fallidos) "
+          f"en {resultado['segundos']:.2f} s: {resultado['comandos_por_segundo']:,.0f} comandos/s", file=sys.stderr)
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Sistema de venta de entradas de la Euro 2024. Sin argumentos abre el menú interactivo.")
+    parser.add_argument("--comandos", help="Archivo CSV o JSONL de comandos (comprar, validar, restaurante) a ejecutar sin interacción.")
+    parser.add_argument("--salida", help="Archivo JSONL donde se escriben los resultados de los comandos (por defecto, la salida estándar).")
+    parser.add_argument("--guardar-cada", type=int, default=GUARDAR_CADA, help="Comandos exitosos entre dos guardados de los datos.")
+    argumentos = parser.parse_args()
+    if argumentos.comandos:
+        main_lotes(argumentos.comandos, argumentos.salida, argumentos.guardar_cada)
+    else:
+        main()
@@ -0,0 +1,399 @@
+import time
+import heapq
+import threading
+
+LIBRE = 0
+OCUPADO = 1
+RETENIDO = 2
+
+TTL_RETENCION = 120.0
+
+
+class Retencion:
+    """
+    Representa la retención temporal de un asiento mientras se completa una venta.
+
+    Attributes:
+        codigo (str): Código del asiento retenido.
+        posicion (int): Posición del asiento dentro del mapa.
+        expira (float): Instante (según time.monotonic) en que la retención vence.
+        mapa (MapaAsientos): Mapa de asientos al que pertenece el asiento.
+    """
+
+    def __init__(self, codigo: str, posicion: int, expira: float, mapa):
+        """
+        Inicializa una instancia de la clase Retencion.
+
+        Args:
+            codigo (str): Código del asiento retenido.
+            posicion (int): Posición del asiento dentro del mapa.
+            expira (float): Instante (según time.monotonic) en que la retención vence.
+            mapa (MapaAsientos): Mapa de asientos al que pertenece el asiento.
+        """
+        self.codigo = codigo
+        self.posicion = posicion
+        self.expira = expira
+        self.mapa = mapa
+
+    def __str__(self):
+        """
+        Retorna una representación en cadena de la retención.
+
+        Returns:
+            str: Código del asiento retenido.
+        """
+        return self.codigo
+
+
+class MapaAsientos:
+    """
+    Mapa compacto de asientos de una sección de un partido.
+
+    Cada asiento ocupa un byte en un bytearray indexado por (letra de fila, número), de modo que ocupar,
+    liberar y consultar un asiento son operaciones O(1). Los códigos de asiento conservan el formato
+    de texto existente ("vA12" para VIP y "A12" para general).
+
+    Para asignar el mejor asiento disponible se lleva la cantidad de asientos libres de cada fila y un
+    cursor al primer asiento posiblemente libre (todos los anteriores están ocupados), así las filas
+    llenas y los tramos ya vendidos se saltan sin recorrerlos.
+
+    Un asiento también puede quedar retenido por un tiempo limitado mientras un vendedor completa la venta.
+    Las retenciones vencidas se liberan al comienzo de cada operación. Todas las operaciones toman el lock
+    de la sección, de modo que varios vendedores pueden usar el mismo partido sin vender un asiento dos veces.
+
+    Attributes:
+        prefijo (str): Prefijo de los códigos de asiento de la sección ('v' para VIP, '' para general).
+        letras (list): Lista de letras de las filas.
+        numeros (int): Cantidad de asientos por fila.
+        ocupados (int): Cantidad de asientos ocupados.
+        retenidos (int): Cantidad de asientos retenidos.
+    """
+
+    def __init__(self, prefijo: str, letras: list[str], numeros: int):
+        """
+        Inicializa una instancia de la clase MapaAsientos con todos los asientos libres.
+
+        Args:
+            prefijo (str): Prefijo de los códigos de asiento de la sección.
+            letras (list[str]): Lista de letras de las filas.
+            numeros (int): Cantidad de asientos por fila.
+        """
+        self.prefijo = prefijo
+        self.letras = letras
+        self.numeros = max(numeros, 0)
+        self.ocupados = 0
+        self.retenidos = 0
+        self._filas = {letra: i for i, letra in enumerate(letras)}
+        self._estados = bytearray(len(letras) * self.numeros)
+        self._libres = [self.numeros] * len(letras)
+        self._cursores = [0] * len(letras)
+        self._retenciones = {}
+        self._vencimientos = []
+        self._lock = threading.Lock()
+
+    def posicion(self, codigo: str) -> int:
+        """
+        Convierte un código de asiento en su posición dentro del mapa.
+
+        Args:
+            codigo (str): Código del asiento.
+
+        Returns:
+            int: Posición del asiento.
+
+        Raises:
+            KeyError: Si el código no corresponde a un asiento de la sección.
+        """
+        if not isinstance(codigo, str) or not codigo.startswith(self.prefijo):
+            raise KeyError(codigo)
+        resto = codigo[len(self.prefijo):]
+        fila = self._filas.get(resto[:1])
+        numero = resto[1:]
+        if fila is None or not (numero.isascii() and numero.isdigit()) or numero.startswith("0"):
+            raise KeyError(codigo)
+        numero = int(numero)
+        if numero > self.numeros:
+            raise KeyError(codigo)
+        return fila * self.numeros + numero - 1
+
+    def codigo(self, posicion: int) -> str:
+        """
+        Convierte una posición del mapa en su código de asiento.
+
+        Args:
+            posicion (int): Posición del asiento.
+
+        Returns:
+            str: Código del asiento.
+        """
+        fila, numero = divmod(posicion, self.numeros)
+        return f"{self.prefijo}{self.letras[fila]}{numero + 1}"
+
+    def ocupado(self, codigo: str) -> bool:
+        """
+        Indica si un asiento está ocupado o retenido.
+
+        Args:
+            codigo (str): Código del asiento.
+
+        Returns:
+            bool: True si el asiento no está libre, False en caso contrario.
+        """
+        posicion = self.posicion(codigo)
+        with self._lock:
+            self._purgar()
+            return self._estados[posicion] != LIBRE
+
+    def disponibles(self) -> int:
+        """
+        Retorna la cantidad de asientos libres de la sección.
+
+        Returns:
+            int: Cantidad de asientos que no están ocupados ni retenidos.
+        """
+        with self._lock:
+            self._purgar()
+            return len(self._estados) - self.ocupados - self.retenidos
+
+    def ocupar(self, codigo: str) -> bool:
+        """
+        Marca un asiento como ocupado.
+
+        Args:
+            codigo (str): Código del asiento.
+
+        Returns:
+            bool: True si el asiento estaba libre, False si ya estaba ocupado o retenido.
+        """
+        posicion = self.posicion(codigo)
+        with self._lock:
+            self._purgar()
+            if self._estados[posicion] != LIBRE:
+                return False
+            self._marcar(posicion, OCUPADO)
+            return True
+
+    def liberar(self, codigo: str) -> bool:
+        """
+        Marca un asiento como libre, descartando su retención si la tenía.
+
+        Args:
+            codigo (str): Código del asiento.
+
+        Returns:
+            bool: True si el asiento estaba ocupado o retenido, False si ya estaba libre.
+        """
+        posicion = self.posicion(codigo)
+        with self._lock:
+            if self._estados[posicion] == LIBRE:
+                return False
+            self._retenciones.pop(posicion, None)
+            self._marcar(posicion, LIBRE)
+            return True
+
+    def mejor_libre(self, cantidad: int = 1) -> int or None:
+        """
+        Busca el mejor bloque de asientos libres contiguos: la fila más cercana y, dentro de ella, los números más bajos.
+
+        Args:
+            cantidad (int): Cantidad de asientos contiguos requeridos.
+
+        Returns:
+            int or None: Posición del primer asiento del bloque, o None si no hay un bloque disponible.
+        """
+        with self._lock:
+            self._purgar()
+            return self._buscar_libre(cantidad)
+
+    def tomar_mejores(self, cantidad: int = 1, contiguos: bool = True) -> list[str]:
+        """
+        Ocupa los mejores asientos libres, como un bloque contiguo o de uno en uno. Se ocupan todos o ninguno.
+
+        Args:
+            cantidad (int): Cantidad de asientos requeridos.
+            contiguos (bool): Si es True, los asientos deben estar juntos en una misma fila.
+
+        Returns:
+            list[str]: Códigos de los asientos ocupados, o una lista vacía si no hay asientos suficientes.
+        """
+        with self._lock:
+            self._purgar()
+            posiciones = []
+            if contiguos:
+                posicion = self._buscar_libre(cantidad)
+                if posicion is None:
+                    return []
+                posiciones = range(posicion, posicion + cantidad)
+                for posicion in posiciones:
+                    self._marcar(posicion, OCUPADO)
+            elif len(self._estados) - self.ocupados - self.retenidos >= cantidad:
+                for _ in range(cantidad):
+                    posiciones.append(self._buscar_libre(1))
+                    self._marcar(posiciones[-1], OCUPADO)
+        return [self.codigo(posicion) for posicion in posiciones]
+
+    def retener(self, codigo: str = None, ttl: float = TTL_RETENCION) -> Retencion or None:
+        """
+        Retiene un asiento por un tiempo limitado. Si no se indica el asiento, se retiene el mejor disponible.
+
+        Args:
+            codigo (str): Código del asiento a retener, o None para el mejor disponible.
+            ttl (float): Segundos que dura la retención.
+
+        Returns:
+            Retencion or None: La retención, o None si el asiento no está libre o no quedan asientos.
+        """
+        posicion = None if codigo is None else self.posicion(codigo)
+        with self._lock:
+            self._purgar()
+            if posicion is None:
+                posicion = self._buscar_libre(1)
+            if posicion is None or self._estados[posicion] != LIBRE:
+                return None
+            self._marcar(posicion, RETENIDO)
+            retencion = Retencion(self.codigo(posicion), posicion, time.monotonic() + ttl, self)
+            self._retenciones[posicion] = retencion
+            heapq.heappush(self._vencimientos, (retencion.expira, posicion))
+            return retencion
+
+    def confirmar(self, retencion: Retencion) -> bool:
+        """
+        Convierte una retención vigente en un asiento ocupado.
+
+        Args:
+            retencion (Retencion): La retención a confirmar.
+
+        Returns:
+            bool: True si se confirmó, False si la retención ya venció o fue cancelada.
+        """
+        with self._lock:
+            self._purgar()
+            if self._retenciones.get(retencion.posicion) is not retencion:
+                return False
+            del self._retenciones[retencion.posicion]
+            self._marcar(retencion.posicion, OCUPADO)
+            return True
+
+    def cancelar(self, retencion: Retencion) -> bool:
+        """
+        Libera el asiento de una retención vigente.
+
+        Args:
+            retencion (Retencion): La retención a cancelar.
+
+        Returns:
+            bool: True si se canceló, False si la retención ya venció o fue confirmada.
+        """
+        with self._lock:
+            if self._retenciones.get(retencion.posicion) is not retencion:
+                return False
+            del self._retenciones[retencion.posicion]
+            self._marcar(retencion.posicion, LIBRE)
+            return True
+
+    def _purgar(self):
+        """
+        Libera los asientos cuyas retenciones vencieron. Se llama con el lock tomado.
+        """
+        if not self._vencimientos:
+            return
+        ahora = time.monotonic()
+        while self._vencimientos and self._vencimientos[0][0] <= ahora:
+            _, posicion = heapq.heappop(self._vencimientos)
+            retencion = self._retenciones.get(posicion)
+            if retencion is not None and retencion.expira <= ahora:
+                del self._retenciones[posicion]
+                self._marcar(posicion, LIBRE)
+
+    def _buscar_libre(self, cantidad: int) -> int or None:
+        """
+        Busca el mejor bloque de asientos libres contiguos. Se llama con el lock tomado.
+
+        Args:
+            cantidad (int): Cantidad de asientos contiguos requeridos.
+
+        Returns:
+            int or None: Posición del primer asiento del bloque, o None si no hay un bloque disponible.
+        """
+        bloque = bytes(cantidad)
+        for fila, libres in enumerate(self._libres):
+            if libres < cantidad:
+                continue
+            inicio = fila * self.numeros
+            posicion = self._estados.find(bloque, inicio + self._cursores[fila], inicio + self.numeros)
+            if cantidad == 1:
+                self._cursores[fila] = self.numeros if posicion == -1 else posicion - inicio
+            if posicion != -1:
+                return posicion
+        return None
+
+    def _marcar(self, posicion: int, estado: int):
+        """
+        Cambia el estado de un asiento y actualiza los contadores y el cursor de su fila. Se llama con el lock tomado.
+
+        Args:
+            posicion (int): Posición del asiento.
+            estado (int): Nuevo estado del asiento (LIBRE, OCUPADO o RETENIDO).
+        """
+        fila, numero = divmod(posicion, self.numeros)
+        anterior = self._estados[posicion]
+        self._estados[posicion] = estado
+        self.ocupados += (estado == OCUPADO) - (anterior == OCUPADO)
+        self.retenidos += (estado == RETENIDO) - (anterior == RETENIDO)
+        if anterior == LIBRE and estado != LIBRE:
+            self._libres[fila] -= 1
+            if self._cursores[fila] == numero:
+                self._cursores[fila] = numero + 1
+        elif anterior != LIBRE and estado == LIBRE:
+            self._libres[fila] += 1
+            self._cursores[fila] = min(self._cursores[fila], numero)
+
+    def __getitem__(self, codigo: str) -> bool:
+        """
+        Permite consultar un asiento como en el mapa de diccionario anterior.
+
+        Args:
+            codigo (str): Código del asiento.
+
+        Returns:
+            bool: True si el asiento no está libre, False en caso contrario.
+        """
+        return self.ocupado(codigo)
+
+    def __setitem__(self, codigo: str, ocupado: bool):
+        """
+        Permite ocupar o liberar un asiento como en el mapa de diccionario anterior.
+
+        Args:
+            codigo (str): Código del asiento.
+            ocupado (bool): True para ocupar el asiento, False para liberarlo.
+        """
+        if ocupado:
+            self.ocupar(codigo)
+        else:
+            self.liberar(codigo)
+
+    def __contains__(self, codigo: str) -> bool:
+        """
+        Indica si un código corresponde a un asiento de la sección.
+
+        Args:
+            codigo (str): Código del asiento.
+
+        Returns:
+            bool: True si el asiento existe, False en caso contrario.
+        """
+        try:
+            self.posicion(codigo)
+        except KeyError:
+            return False
+        return True
+
+    def __len__(self) -> int:
+        """
+        Retorna la cantidad total de asientos de la sección.
+
+        Returns:
+            int: Cantidad de asientos.
+        """
+        return len(self._estados)
@@ -1,5 +1,21 @@
+import threading
 from funciones_ayudante import generar_id
 from equipo import Equipo
+from mapa_asientos import MapaAsientos, Retencion, TTL_RETENCION
+
+
+class SinAsientosDisponibles(Exception):
+    """
+    Excepción personalizada para indicar que no quedan asientos disponibles en una sección de un partido.
+    """
+    pass
+
+
+class RetencionExpirada(Exception):
+    """
+    Excepción personalizada para indicar que la retención de un asiento venció o fue cancelada antes de confirmarse.
+    """
+    pass
 
 
 class Partido:
@@ -15,8 +31,8 @@ class Partido:
         entradas (list): Lista de entradas registradas para el partido.
         asistencia (int): Número de asistentes al partido.
         letras (list): Lista de letras utilizadas para la numeración de asientos.
-        mapa_asientos_vip (dict): Mapa de asientos VIP, inicialmente vacío.
-        mapa_asientos_general (dict): Mapa de asientos generales, inicialmente vacío.
+        mapa_asientos_vip (MapaAsientos): Mapa de asientos VIP, creado la primera vez que se usa.
+        mapa_asientos_general (MapaAsientos): Mapa de asientos generales, creado la primera vez que se usa.
     """
 
     def __init__(self, equipo_local: Equipo, equipo_visitante: Equipo, fecha: str, estadio):
@@ -37,9 +53,9 @@ class Partido:
         self.entradas = []
         self.asistencia = 0
         self.letras = ["A", "B", "C", "D", "F", "G", "H", "I", "J", "K", "L", "M", "N", "O", "P"]
-        self.mapa_asientos_vip = None
-        self.mapa_asientos_general = None
-        self.mapa_asientos()
+        self._mapa_asientos_vip = None
+        self._mapa_asientos_general = None
+        self._lock = threading.Lock()
 
     def registrar_entrada(self, entrada):
         """
@@ -50,58 +66,206 @@ class Partido:
         """
         self.entradas.append(entrada)
 
-    def mapa_asientos(self):
+    def validar(self, entrada) -> bool:
+        """
+        Marca una entrada del partido como validada y suma su asistencia, de forma atómica: si varios hilos
+        validan la misma entrada a la vez, solo uno la cuenta.
+
+        Args:
+            entrada: La entrada a validar.
+
+        Returns:
+            bool: True si se validó, False si ya estaba validada.
+        """
+        with self._lock:
+            if entrada.validado:
+                return False
+            entrada.validado = True
+            self.asistencia += 1
+            return True
+
+    @property
+    def mapa_asientos_vip(self) -> MapaAsientos:
         """
-        Inicializa los mapas de asientos VIP y generales con su numeración correspondiente.
+        Retorna el mapa de asientos VIP, creándolo la primera vez que se consulta.
+
+        Returns:
+            MapaAsientos: Mapa de asientos VIP.
+        """
+        if self._mapa_asientos_vip is None:
+            with self._lock:
+                if self._mapa_asientos_vip is None:
+                    self._mapa_asientos_vip = MapaAsientos("v", self.letras, self.estadio.asientos[0] - 1)
+        return self._mapa_asientos_vip
+
+    @property
+    def mapa_asientos_general(self) -> MapaAsientos:
+        """
+        Retorna el mapa de asientos generales, creándolo la primera vez que se consulta.
+
+        Returns:
+            MapaAsientos: Mapa de asientos generales.
         """
-        self.mapa_asientos_vip = {f"v{letra}{num}": False for letra in self.letras for num in range(1, self.estadio.asientos[0])}
-        self.mapa_asientos_general = {f"{letra}{num}": False for letra in self.letras for num in range(1, self.estadio.asientos[1])}
+        if self._mapa_asientos_general is None:
+            with self._lock:
+                if self._mapa_asientos_general is None:
+                    self._mapa_asientos_general = MapaAsientos("", self.letras, self.estadio.asientos[1] - 1)
+        return self._mapa_asientos_general
 
-    def modificar_asientos(self, vip: bool):
+    def plano_asientos(self, vip: bool) -> str:
         """
-        Modifica el estado de los asientos, permitiendo marcar un asiento como ocupado.
+        Dibuja el plano de asientos de la sección, marcando con X los que no están libres.
 
         Args:
-            vip (bool): Indica si se modificará un asiento VIP o general.
+            vip (bool): Indica si se dibujará la sección VIP o la general.
 
         Returns:
-            str: El asiento modificado.
+            str: El plano de asientos, una línea por número de asiento.
         """
         mapa_asientos = self.mapa_asientos_vip if vip else self.mapa_asientos_general
         prefix = 'v' if vip else ''
         num_asientos = self.estadio.asientos[0] if vip else self.estadio.asientos[1]
-
+        filas = []
         for num in range(1, num_asientos):
             row = [f"X" if mapa_asientos[f"{prefix}{letra}{num}"] else f"{prefix}{letra}{num}" for letra in self.letras]
-            print(num, ' '.join(row), "\n")
-
-        while True:
-            try:
-                asiento = input("Ingrese el asiento: ")
-                if vip:
-                    if not self.mapa_asientos_vip[asiento]:
-                        self.mapa_asientos_vip[asiento] = True
-                        return asiento
-                else:
-                    if not self.mapa_asientos_general[asiento]:
-                        self.mapa_asientos_general[asiento] = True
-                        return asiento
-            except KeyError:
-                pass
-            print("Asiento invalido. Intente de nuevo.")
-
-    def modificar_asientos_(self, vip: bool, asiento: str):
-        """
-        Modifica el estado de un asiento específico.
+            filas.append(f"{num} {' '.join(row)} \n")
+        return "\n".join(filas)
+
+    def asientos_disponibles(self, vip: bool) -> int:
+        """
+        Retorna la cantidad de asientos libres de la sección.
+
+        Args:
+            vip (bool): Indica si se consultará la sección VIP o la general.
+
+        Returns:
+            int: Cantidad de asientos que no están ocupados ni retenidos.
+        """
+        mapa_asientos = self.mapa_asientos_vip if vip else self.mapa_asientos_general
+        return mapa_asientos.disponibles()
+
+    def asignar_mejor_asiento(self, vip: bool) -> str:
+        """
+        Ocupa el mejor asiento disponible de la sección, sin interacción con el usuario.
+
+        Args:
+            vip (bool): Indica si se asignará un asiento VIP o general.
+
+        Returns:
+            str: El asiento asignado.
+
+        Raises:
+            SinAsientosDisponibles: Si la sección está llena.
+        """
+        return self.asignar_asientos(vip, 1)[0]
+
+    def asignar_asientos_contiguos(self, vip: bool, cantidad: int) -> list[str]:
+        """
+        Ocupa el mejor bloque de asientos contiguos disponible en una misma fila de la sección.
+
+        Args:
+            vip (bool): Indica si se asignarán asientos VIP o generales.
+            cantidad (int): Cantidad de asientos contiguos.
+
+        Returns:
+            list[str]: Los asientos asignados.
+
+        Raises:
+            SinAsientosDisponibles: Si no hay un bloque de asientos contiguos disponible.
+        """
+        mapa_asientos = self.mapa_asientos_vip if vip else self.mapa_asientos_general
+        asientos = mapa_asientos.tomar_mejores(cantidad)
+        if not asientos:
+            raise SinAsientosDisponibles
+        return asientos
+
+    def asignar_asientos(self, vip: bool, cantidad: int) -> list[str]:
+        """
+        Ocupa los mejores asientos disponibles de la sección, aunque no estén juntos. Se asignan todos o ninguno.
+
+        Args:
+            vip (bool): Indica si se asignarán asientos VIP o generales.
+            cantidad (int): Cantidad de asientos.
+
+        Returns:
+            list[str]: Los asientos asignados.
+
+        Raises:
+            SinAsientosDisponibles: Si no quedan suficientes asientos libres.
+        """
+        mapa_asientos = self.mapa_asientos_vip if vip else self.mapa_asientos_general
+        asientos = mapa_asientos.tomar_mejores(cantidad, contiguos=False)
+        if not asientos:
+            raise SinAsientosDisponibles
+        return asientos
+
+    def retener_asiento(self, vip: bool, asiento: str = None, ttl: float = TTL_RETENCION) -> Retencion:
+        """
+        Retiene un asiento mientras se completa la venta. Si no se confirma antes de `ttl` segundos, se libera solo.
+
+        Args:
+            vip (bool): Indica si se retendrá un asiento VIP o general.
+            asiento (str): El asiento a retener, o None para retener el mejor disponible.
+            ttl (float): Segundos que dura la retención.
+
+        Returns:
+            Retencion: La retención del asiento.
+
+        Raises:
+            KeyError: Si el asiento no existe en la sección.
+            SinAsientosDisponibles: Si el asiento no está libre o la sección está llena.
+        """
+        mapa_asientos = self.mapa_asientos_vip if vip else self.mapa_asientos_general
+        retencion = mapa_asientos.retener(asiento, ttl)
+        if retencion is None:
+            raise SinAsientosDisponibles
+        return retencion
+
+    def confirmar_retencion(self, retencion: Retencion) -> str:
+        """
+        Ocupa definitivamente un asiento retenido.
+
+        Args:
+            retencion (Retencion): La retención a confirmar.
+
+        Returns:
+            str: El asiento ocupado.
+
+        Raises:
+            RetencionExpirada: Si la retención venció o fue cancelada.
+        """
+        if not retencion.mapa.confirmar(retencion):
+            raise RetencionExpirada
+        return retencion.codigo
+
+    def liberar_retencion(self, retencion: Retencion) -> bool:
+        """
+        Cancela una retención y deja el asiento libre.
+
+        Args:
+            retencion (Retencion): La retención a cancelar.
+
+        Returns:
+            bool: True si se liberó el asiento, False si la retención ya no estaba vigente.
+        """
+        return retencion.mapa.cancelar(retencion)
+
+    def modificar_asientos_(self, vip: bool, asiento: str) -> bool:
+        """
+        Modifica el estado de un asiento específico, marcándolo como ocupado.
 
         Args:
             vip (bool): Indica si se modificará un asiento VIP o general.
             asiento (str): El identificador del asiento a modificar.
+
+        Returns:
+            bool: True si el asiento estaba libre, False si ya estaba ocupado o retenido.
+
+        Raises:
+            KeyError: Si el asiento no existe en la sección.
         """
-        if vip:
-            self.mapa_asientos_vip[asiento] = True
-        else:
-            self.mapa_asientos_general[asiento] = True
+        mapa_asientos = self.mapa_asientos_vip if vip else self.mapa_asientos_general
+        return mapa_asientos.ocupar(asiento)
 
     def __str__(self):
         """
@@ -0,0 +1,94 @@
+from cliente import Cliente
+
+
+class ClienteRegistry:
+    """
+    Registro de clientes indexado por cédula, con un índice de las entradas VIP de cada cliente.
+
+    Se comparte entre el menú principal, la compra de entradas, la compra en restaurantes y la carga de datos,
+    de modo que buscar un cliente o sus entradas VIP sea una operación de tiempo constante.
+    """
+
+    def __init__(self):
+        """
+        Inicializa un registro de clientes vacío.
+        """
+        self._clientes = {}
+        self._entradas_vip = {}
+
+    def obtener(self, cedula: int) -> Cliente or None:
+        """
+        Busca un cliente por su cédula.
+
+        Args:
+            cedula (int): Cédula del cliente.
+
+        Returns:
+            Cliente or None: El cliente si existe, None en caso contrario.
+        """
+        return self._clientes.get(cedula)
+
+    def agregar(self, cliente: Cliente) -> Cliente:
+        """
+        Agrega un cliente al registro. Si ya existe un cliente con la misma cédula, se conserva el existente.
+
+        Args:
+            cliente (Cliente): Cliente a agregar.
+
+        Returns:
+            Cliente: El cliente registrado con esa cédula.
+        """
+        return self._clientes.setdefault(cliente.cedula, cliente)
+
+    def registrar_entrada(self, entrada):
+        """
+        Asocia una entrada a su cliente y, si es VIP, la agrega al índice de entradas VIP.
+
+        Args:
+            entrada (Entrada): La entrada a registrar.
+        """
+        entrada.cliente.entradas.append(entrada)
+        if entrada.tipo == "vip":
+            self._entradas_vip.setdefault(entrada.cliente.cedula, []).append(entrada)
+
+    def entradas_vip(self, cedula: int) -> list:
+        """
+        Retorna las entradas VIP de un cliente.
+
+        Args:
+            cedula (int): Cédula del cliente.
+
+        Returns:
+            list[Entrada]: Lista de entradas VIP del cliente, vacía si no tiene ninguna.
+        """
+        return self._entradas_vip.get(cedula, [])
+
+    def __contains__(self, cedula: int) -> bool:
+        """
+        Indica si existe un cliente con la cédula dada.
+
+        Args:
+            cedula (int): Cédula del cliente.
+
+        Returns:
+            bool: True si el cliente existe, False en caso contrario.
+        """
+        return cedula in self._clientes
+
+    def __iter__(self):
+        """
+        Recorre los clientes en el orden en que fueron registrados.
+
+        Returns:
+            iterator: Iterador sobre los clientes.
+        """
+        return iter(self._clientes.values())
+
+    def __len__(self) -> int:
+        """
+        Retorna la cantidad de clientes registrados.
+
+        Returns:
+            int: Cantidad de clientes.
+        """
+        return len(self._clientes)
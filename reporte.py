@@ -0,0 +1,151 @@
+import os
+import time
+import html
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from cargar_api import CargarApi
+from estadisticas import Estadisticas
+from gestion_datos import cargar_datos, conexion_estadisticas
+
+FORMATOS = ["png", "svg"]
+
+TITULOS = {
+    "gastos_vip": "Gastos VIP por entrada",
+    "asistencia_partidos": "Asistencia por partido",
+    "restaurantes_max_ventas": "Restaurantes con más ventas",
+    "platos_max_ventas": "Platos con más ventas",
+}
+
+
+def _usar_agg():
+    """
+    Selecciona el backend de matplotlib sin interfaz gráfica. Se llama al iniciar cada proceso de dibujo.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+
+
+def _dibujar(funcion, argumentos: tuple, archivo: str) -> str:
+    """
+    Dibuja un gráfico en un archivo. Se ejecuta en un proceso del grupo.
+
+    Args:
+        funcion (function): Función de dibujo de estadisticas.py.
+        argumentos (tuple): Argumentos de la función.
+        archivo (str): Archivo de imagen donde se guarda el gráfico.
+
+    Returns:
+        str: El archivo escrito.
+    """
+    funcion(*argumentos, archivo=archivo)
+    return archivo
+
+
+def generar_reporte(estadisticas: Estadisticas, directorio: str = "reporte", formato: str = "png", procesos: int = None) -> str:
+    """
+    Dibuja todos los gráficos de las estadísticas en archivos y escribe una página HTML que los reúne.
+
+    Los datos de los gráficos se calculan una sola vez en este proceso; los dibujos se reparten en un grupo
+    de procesos con el backend Agg de matplotlib, así que el reporte no necesita una pantalla.
+
+    Args:
+        estadisticas (Estadisticas): Estadísticas a graficar.
+        directorio (str): Directorio donde se escriben las imágenes y el índice; se crea si no existe.
+        formato (str): Formato de las imágenes, "png" o "svg".
+        procesos (int): Cantidad de procesos de dibujo, o None para usar uno por núcleo (hasta uno por gráfico).
+
+    Returns:
+        str: Ruta de la página HTML del reporte.
+
+    Raises:
+        ValueError: Si el formato no es válido.
+    """
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato inválido: {formato}. Debe ser {' o '.join(FORMATOS)}.")
+    os.makedirs(directorio, exist_ok=True)
+    graficos = estadisticas.graficos()
+    resumen = {"promedio": estadisticas.gastos_vip_promedio(), "clientes": estadisticas.clientes_top(),
+               "platos": estadisticas.platos_por_restaurante(), "asistencia": estadisticas.filas_asistencia()}
+    procesos = procesos or min(len(graficos), os.cpu_count() or 1)
+    with ProcessPoolExecutor(procesos, initializer=_usar_agg) as grupo:
+        futuros = {nombre: grupo.submit(_dibujar, funcion, argumentos, os.path.join(directorio, f"{nombre}.{formato}"))
+                   for nombre, (funcion, argumentos) in graficos.items()}
+        archivos = {nombre: os.path.basename(futuro.result()) for nombre, futuro in futuros.items()}
+    indice = os.path.join(directorio, "index.html")
+    with open(indice, "w", encoding="utf-8") as file:
+        file.write(_pagina(archivos, resumen))
+    return indice
+
+
+def _pagina(archivos: dict[str, str], resumen: dict) -> str:
+    """
+    Arma la página HTML del reporte.
+
+    Args:
+        archivos (dict[str, str]): Imagen de cada gráfico, por nombre de gráfico.
+        resumen (dict): Gasto VIP promedio, clientes top, platos por restaurante y filas de asistencia.
+
+    Returns:
+        str: La página HTML.
+    """
+    filas = sorted(resumen["asistencia"], key=lambda fila: (fila[3], fila[4]), reverse=True)
+    asistencia = "\n".join(f"<tr><td>{html.escape(str(fila[0]))}</td><td>{html.escape(fila[1])}</td><td>{html.escape(fila[2])}</td>"
+                           f"<td>{fila[3]}</td><td>{fila[4]}</td><td>{fila[5]:.2f}</td></tr>" for fila in filas)
+    clientes = "\n".join(f"<li>{html.escape(cliente)}: {cantidad}</li>" for cliente, cantidad in resumen["clientes"])
+    platos = "\n".join(f"<li>{html.escape(restaurante)}: " + ", ".join(f"{html.escape(plato)} ({cantidad})" for plato, cantidad in lista) + "</li>"
+                       for restaurante, lista in resumen["platos"].items())
+    imagenes = "\n".join(f'<figure><img src="{html.escape(archivo)}" alt="{html.escape(TITULOS[nombre])}">'
+                         f"<figcaption>{html.escape(TITULOS[nombre])}</figcaption></figure>" for nombre, archivo in archivos.items())
+    return f"""<!DOCTYPE html>
+<html lang="es">
+<head>
+<meta charset="utf-8">
+<title>Estadísticas Euro 2024</title>
+<style>body {{ font-family: sans-serif; margin: 2em; }} img {{ max-width: 100%; }} figure {{ display: inline-block; width: 45%; }}
+table {{ border-collapse: collapse; }} td, th {{ border: 1px solid #ccc; padding: 0.2em 0.5em; }}</style>
+</head>
+<body>
+<h1>Estadísticas Euro 2024</h1>
+<p>Generado el {time.strftime("%Y-%m-%d %H:%M:%S")}. Gasto promedio de las entradas VIP: {resumen["promedio"]:.2f}</p>
+{imagenes}
+<h2>Clientes con más entradas</h2>
+<ol>
+{clientes}
+</ol>
+<h2>Platos más vendidos por restaurante</h2>
+<ul>
+{platos}
+</ul>
+<h2>Asistencia por partido</h2>
+<table>
+<tr><th>ID</th><th>Partido</th><th>Estadio</th><th>Boletos Vendidos</th><th>Asistencia</th><th>Relación Asistencia/Venta</th></tr>
+{asistencia}
+</table>
+</body>
+</html>
+"""
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera el reporte de estadísticas en imágenes y una página HTML, sin interfaz gráfica.")
+    parser.add_argument("--directorio", default="reporte", help="Directorio donde se escribe el reporte.")
+    parser.add_argument("--formato", choices=FORMATOS, default="png")
+    parser.add_argument("--procesos", type=int, help="Cantidad de procesos de dibujo (por defecto, uno por núcleo).")
+    fuente = parser.add_mutually_exclusive_group()
+    fuente.add_argument("--columnas", action="store_true", help="Calcula las estadísticas con el almacén columnar de NumPy.")
+    fuente.add_argument("--sqlite", action="store_true", help="Calcula las estadísticas con SQL si el backend configurado es SQLite y está al día.")
+    argumentos = parser.parse_args()
+    inicio = time.perf_counter()
+    api = CargarApi()
+    cargar_datos(api)
+    if argumentos.columnas:
+        api.activar_columnas()
+    conexion = conexion_estadisticas() if argumentos.sqlite else None
+    if argumentos.sqlite and conexion is None:
+        print("La base SQLite no es el backend configurado o tiene eventos sin guardar; se usan los datos cargados.")
+    try:
+        indice = generar_reporte(Estadisticas(api, conexion), argumentos.directorio, argumentos.formato, argumentos.procesos)
+    finally:
+        if conexion is not None:
+            conexion.close()
+    print(f"Reporte escrito en {indice} en {time.perf_counter() - inicio:.2f} s")
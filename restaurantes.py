@@ -1,14 +1,26 @@
+from math import inf
+from bisect import bisect_left, bisect_right, insort
 from producto import Producto
 from funciones_ayudante import seleccion_multiple
+from inventario import Inventario
 
 
 class Restaurante:
     """
     Representa un restaurante con su nombre y lista de productos.
 
+    Además de la lista, el restaurante mantiene índices de su catálogo que se actualizan al agregar, quitar
+    o cambiar el precio de un producto: los productos ordenados por precio (para buscar rangos con bisect),
+    los productos por tipo y los n-gramas (de 1 a 3 letras) de los nombres en minúsculas, para buscar por
+    parte del nombre sin recorrer todo el catálogo. Los índices guardan los mismos objetos Producto, así que
+    los cambios de stock se ven en las búsquedas sin reindexar.
+
     Attributes:
         nombre (str): Nombre del restaurante.
         productos (list): Lista de productos ofrecidos por el restaurante.
+        productos_por_nombre (dict): Productos del restaurante indexados por nombre.
+        tipos (dict): Productos del restaurante agrupados por tipo.
+        inventario (Inventario): Stock del catálogo, con reservas atómicas de varios productos.
     """
 
     def __init__(self, nombre: str, productos: list[dict]):
@@ -21,6 +33,14 @@ class Restaurante:
         """
         self.nombre = nombre
         self.productos = []
+        self.productos_por_nombre = {}
+        self.tipos = {}
+        self._precios = []
+        self._ngramas = {}
+        self._nombres = {}
+        self._secuencias = {}
+        self._siguiente = 0
+        self.inventario = Inventario(self)
         self.registrar_productos(productos)
 
     def registrar_productos(self, productos: list[dict]):
@@ -31,7 +51,145 @@ class Restaurante:
             productos (list[dict]): Lista de productos en formato de diccionario.
         """
         for producto in productos:
-            self.productos.append(Producto(producto["name"], producto["quantity"], float(producto["price"]), producto["stock"], producto["adicional"]))
+            self.agregar_producto(Producto(producto["name"], producto["quantity"], float(producto["price"]), producto["stock"], producto["adicional"]))
+
+    def agregar_producto(self, producto: Producto):
+        """
+        Agrega un producto al catálogo y a los índices.
+
+        Args:
+            producto (Producto): El producto a agregar.
+        """
+        secuencia = self._siguiente
+        self._siguiente += 1
+        self.productos.append(producto)
+        self.productos_por_nombre.setdefault(producto.nombre, producto)
+        self.tipos.setdefault(producto.tipo, []).append(producto)
+        self._secuencias[id(producto)] = secuencia
+        insort(self._precios, (producto.precio, secuencia, producto))
+        nombre = producto.nombre.lower()
+        self._nombres[secuencia] = (nombre, producto)
+        for ngrama in self._ngramas_de(nombre):
+            self._ngramas.setdefault(ngrama, set()).add(secuencia)
+
+    def quitar_producto(self, nombre: str) -> Producto or None:
+        """
+        Quita un producto del catálogo y de los índices.
+
+        Args:
+            nombre (str): Nombre del producto.
+
+        Returns:
+            Producto or None: El producto quitado, o None si no existe.
+        """
+        producto = self.productos_por_nombre.pop(nombre, None)
+        if producto is None:
+            return None
+        secuencia = self._secuencias.pop(id(producto))
+        self.productos = [otro for otro in self.productos if otro is not producto]
+        for otro in self.productos:
+            if otro.nombre == nombre:
+                self.productos_por_nombre[nombre] = otro
+                break
+        self.tipos[producto.tipo] = [otro for otro in self.tipos[producto.tipo] if otro is not producto]
+        del self._precios[bisect_left(self._precios, (producto.precio, secuencia))]
+        nombre_minusculas, _ = self._nombres.pop(secuencia)
+        for ngrama in self._ngramas_de(nombre_minusculas):
+            self._ngramas[ngrama].discard(secuencia)
+        return producto
+
+    def cambiar_precio(self, nombre: str, precio: float) -> bool:
+        """
+        Cambia el precio de un producto, reubicándolo en el índice de precios.
+
+        Args:
+            nombre (str): Nombre del producto.
+            precio (float): Nuevo precio.
+
+        Returns:
+            bool: True si el producto existe, False en caso contrario.
+        """
+        producto = self.productos_por_nombre.get(nombre)
+        if producto is None:
+            return False
+        secuencia = self._secuencias[id(producto)]
+        del self._precios[bisect_left(self._precios, (producto.precio, secuencia))]
+        producto.precio = precio
+        insort(self._precios, (producto.precio, secuencia, producto))
+        return True
+
+    def buscar_producto(self, nombre: str) -> Producto or None:
+        """
+        Busca un producto del restaurante por su nombre exacto.
+
+        Args:
+            nombre (str): Nombre del producto.
+
+        Returns:
+            Producto or None: El producto si existe, None en caso contrario.
+        """
+        return self.productos_por_nombre.get(nombre)
+
+    def buscar_por_precio(self, minimo: float, maximo: float) -> list[Producto]:
+        """
+        Busca los productos con precio estrictamente entre dos valores, ordenados por precio.
+
+        Args:
+            minimo (float): Precio mínimo (excluido).
+            maximo (float): Precio máximo (excluido).
+
+        Returns:
+            list[Producto]: Productos en el rango de precios.
+        """
+        inicio = bisect_right(self._precios, (minimo, inf))
+        fin = bisect_left(self._precios, (maximo, -1))
+        return [producto for _, _, producto in self._precios[inicio:fin]]
+
+    def buscar_por_tipo(self, tipo: str) -> list[Producto]:
+        """
+        Busca los productos de un tipo.
+
+        Args:
+            tipo (str): Tipo de producto ("Bebida alcoholic", "Bebida non-alcoholic", "Alimento" o "Paquete").
+
+        Returns:
+            list[Producto]: Productos del tipo, en el orden del catálogo.
+        """
+        return self.tipos.get(tipo, [])
+
+    def buscar_por_nombre(self, texto: str) -> list[Producto]:
+        """
+        Busca los productos cuyo nombre contiene un texto, sin distinguir mayúsculas.
+
+        Los candidatos son los productos que tienen todos los trigramas del texto (o el texto completo si
+        tiene menos de tres letras), intersecando desde el conjunto más chico; luego se confirma que el
+        texto aparezca en el nombre.
+
+        Args:
+            texto (str): Texto a buscar.
+
+        Returns:
+            list[Producto]: Productos que coinciden, en el orden del catálogo.
+        """
+        texto = texto.lower()
+        if not texto:
+            return list(self.productos)
+        conjuntos = sorted((self._ngramas.get(texto[i:i + 3], set()) for i in range(max(len(texto) - 2, 1))), key=len)
+        candidatos = conjuntos[0].intersection(*conjuntos[1:])
+        return [self._nombres[secuencia][1] for secuencia in sorted(candidatos) if texto in self._nombres[secuencia][0]]
+
+    @staticmethod
+    def _ngramas_de(nombre: str) -> set[str]:
+        """
+        Calcula los n-gramas de 1 a 3 letras de un nombre.
+
+        Args:
+            nombre (str): Nombre en minúsculas.
+
+        Returns:
+            set[str]: N-gramas del nombre.
+        """
+        return {nombre[i:i + n] for n in (1, 2, 3) for i in range(len(nombre) - n + 1)}
 
     def productos_por_precio(self, edad: int) -> list[Producto]:
         """
@@ -52,7 +210,7 @@ class Restaurante:
                     raise ValueError
                 if rango[0] > rango[1]:
                     raise ValueError
-                lp = [producto for producto in self.productos if rango[0] < producto.precio < rango[1]]
+                lp = self.buscar_por_precio(rango[0], rango[1])
                 if edad < 18:
                     lp = [producto for producto in lp if not producto.alcoholic]
                 productos_seleccionados.extend(seleccion_multiple(lp))
@@ -85,7 +243,7 @@ class Restaurante:
                 if edad < 18 and tipo == "Bebida alcoholic":
                     print("El cliente es menor de 18, no puede comprar bebidas alcohólicas.")
                     continue
-                lp = [producto for producto in self.productos if producto.tipo == tipo]
+                lp = self.buscar_por_tipo(tipo)
                 if len(lp) == 0:
                     raise ValueError
                 productos_seleccionados.extend(seleccion_multiple(lp))
@@ -112,7 +270,7 @@ class Restaurante:
         while True:
             nombre = input("Ingrese el nombre del producto: ")
             try:
-                productos_seleccionados.extend([producto for producto in self.productos if nombre.lower() in producto.nombre.lower()])
+                productos_seleccionados.extend(self.buscar_por_nombre(nombre))
                 sn = input("Desea buscar otros productos por nombre? (s/n): ")
                 if sn == "s":
                     continue
@@ -155,14 +313,30 @@ class Restaurante:
         """
         pop_idx = []
         for i, producto in enumerate(compras):
-            if edad < 18 and producto.alcoholic:
-                print(f"Usted es menor de edad, por lo tanto no puede comprar {producto.nombre}")
-                pop_idx.append(i)
-            if producto.stock < 1:
-                print(f"Producto {producto.nombre} no disponible")
+            motivo = Restaurante.motivo_rechazo(producto, edad)
+            if motivo is not None:
+                print(motivo)
                 pop_idx.append(i)
         return [compras[i] for i in range(len(compras)) if i not in pop_idx]
 
+    @staticmethod
+    def motivo_rechazo(producto: Producto, edad: int) -> str or None:
+        """
+        Indica por qué no se le puede vender un producto a un cliente.
+
+        Args:
+            producto (Producto): Producto a vender.
+            edad (int): Edad del cliente.
+
+        Returns:
+            str or None: El motivo del rechazo, o None si el producto se puede vender.
+        """
+        if edad < 18 and producto.alcoholic:
+            return f"Usted es menor de edad, por lo tanto no puede comprar {producto.nombre}"
+        if producto.stock < 1:
+            return f"Producto {producto.nombre} no disponible"
+        return None
+
     def iniciar_compra(self, edad: int):
         """
         Inicia el proceso de compra, permitiendo buscar productos por diferentes criterios.
@@ -0,0 +1,458 @@
+from cargar_api import CargarApi
+from cliente import Cliente
+from entrada import Entrada
+from factura import Factura
+from partido import Partido, SinAsientosDisponibles
+from restaurantes import Restaurante
+from inventario import Reserva, StockInsuficiente
+from registro_clientes import ClienteRegistry
+from estadisticas import Estadisticas
+from diario import diario_eventos, ENTRADA_VENDIDA, ENTRADA_VALIDADA, FACTURA_CREADA
+from instrumentacion import medir, contar
+
+TIPOS_ENTRADA = ["general", "vip"]
+
+VALIDADA = "validada"
+YA_VALIDADA = "ya validada"
+NO_ENCONTRADA = "no encontrada"
+
+
+def resumen_entrada(entrada: Entrada) -> dict:
+    """
+    Resume una entrada vendida para responderla a un cliente del servicio.
+
+    Args:
+        entrada (Entrada): La entrada vendida.
+
+    Returns:
+        dict: Código, partido, tipo, asiento y factura de la entrada.
+    """
+    return {"codigo": entrada.codigo, "partido": entrada.partido.id, "tipo": entrada.tipo, "asiento": entrada.asiento, "factura": entrada.factura}
+
+
+class ErrorServicio(Exception):
+    """
+    Excepción base de las operaciones del servicio.
+    """
+    pass
+
+
+class DatosInvalidos(ErrorServicio):
+    """
+    Excepción personalizada para indicar que los datos de una operación son inválidos.
+    """
+    pass
+
+
+class PartidoNoEncontrado(ErrorServicio):
+    """
+    Excepción personalizada para indicar que no existe un partido con el ID indicado.
+    """
+    pass
+
+
+class AsientoNoDisponible(ErrorServicio):
+    """
+    Excepción personalizada para indicar que el asiento pedido no existe o está ocupado, o que no quedan asientos suficientes.
+    """
+    pass
+
+
+class EntradaNoEncontrada(ErrorServicio):
+    """
+    Excepción personalizada para indicar que no existe una entrada con el código indicado.
+    """
+    pass
+
+
+class EntradaYaValidada(ErrorServicio):
+    """
+    Excepción personalizada para indicar que la entrada ya fue validada.
+    """
+    pass
+
+
+class ClienteNoVip(ErrorServicio):
+    """
+    Excepción personalizada para indicar que un cliente no tiene entradas VIP.
+    """
+    pass
+
+
+class RestauranteNoEncontrado(ErrorServicio):
+    """
+    Excepción personalizada para indicar que el restaurante no existe en el estadio de la entrada.
+    """
+    pass
+
+
+class ProductoNoDisponible(ErrorServicio):
+    """
+    Excepción personalizada para indicar que un producto no existe, no tiene stock suficiente o no se le puede vender al cliente.
+    """
+    pass
+
+
+class Servicio:
+    """
+    Operaciones de la taquilla y los restaurantes sin interacción con el usuario.
+
+    Cada operación recibe sus datos como argumentos y retorna el resultado o lanza una excepción de
+    ErrorServicio, de modo que el menú, los modos por lotes y los benchmarks usan la misma lógica.
+
+    Attributes:
+        api (CargarApi): Instancia de CargarApi con los datos de equipos, estadios y partidos.
+        clientes (ClienteRegistry): Registro de clientes.
+    """
+
+    def __init__(self, api: CargarApi, clientes: ClienteRegistry):
+        """
+        Inicializa una instancia de la clase Servicio.
+
+        Args:
+            api (CargarApi): Instancia de CargarApi con los datos de equipos, estadios y partidos.
+            clientes (ClienteRegistry): Registro de clientes.
+        """
+        self.api = api
+        self.clientes = clientes
+
+    @medir
+    def vender_entrada(self, cedula: int, partido_id: str, tipo_entrada: str, asiento: str = None, nombre: str = None, edad: int = None) -> Entrada:
+        """
+        Vende una entrada. Si no se indica el asiento, se asigna el mejor disponible.
+
+        Args:
+            cedula (int): Cédula del cliente.
+            partido_id (str): ID del partido.
+            tipo_entrada (str): Tipo de entrada ("general" o "vip").
+            asiento (str): Asiento elegido, o None para asignar el mejor disponible.
+            nombre (str): Nombre del cliente, requerido si el cliente no está registrado.
+            edad (int): Edad del cliente, requerida si el cliente no está registrado.
+
+        Returns:
+            Entrada: La entrada vendida.
+
+        Raises:
+            DatosInvalidos: Si los datos del cliente o el tipo de entrada son inválidos.
+            PartidoNoEncontrado: Si el partido no existe.
+            AsientoNoDisponible: Si el asiento no existe o está ocupado, o si la sección está llena.
+        """
+        cliente = self._cliente(cedula, nombre, edad)
+        partido = self._partido(partido_id)
+        vip = self._es_vip(tipo_entrada)
+        if asiento is None:
+            try:
+                asiento = partido.asignar_mejor_asiento(vip)
+            except SinAsientosDisponibles:
+                raise AsientoNoDisponible("No quedan asientos disponibles de ese tipo para este partido.")
+        else:
+            try:
+                ocupado = partido.modificar_asientos_(vip, asiento)
+            except KeyError:
+                ocupado = False
+            if not ocupado:
+                raise AsientoNoDisponible(f"El asiento {asiento} no está disponible.")
+        return self._emitir_entrada(cliente, partido, tipo_entrada, asiento)
+
+    @medir
+    def vender_entradas(self, cedula: int, partido_id: str, tipo_entrada: str, cantidad: int, contiguos: bool = False,
+                        nombre: str = None, edad: int = None) -> list[Entrada]:
+        """
+        Vende varias entradas de un mismo tipo para un cliente, asignando los mejores asientos. Se venden todas o ninguna.
+
+        Args:
+            cedula (int): Cédula del cliente.
+            partido_id (str): ID del partido.
+            tipo_entrada (str): Tipo de entrada ("general" o "vip").
+            cantidad (int): Cantidad de entradas a vender.
+            contiguos (bool): Si es True, los asientos se asignan juntos en una misma fila.
+            nombre (str): Nombre del cliente, requerido si el cliente no está registrado.
+            edad (int): Edad del cliente, requerida si el cliente no está registrado.
+
+        Returns:
+            list[Entrada]: Las entradas vendidas.
+
+        Raises:
+            DatosInvalidos: Si los datos del cliente, el tipo de entrada o la cantidad son inválidos.
+            PartidoNoEncontrado: Si el partido no existe.
+            AsientoNoDisponible: Si no hay suficientes asientos.
+        """
+        cliente = self._cliente(cedula, nombre, edad)
+        partido = self._partido(partido_id)
+        vip = self._es_vip(tipo_entrada)
+        if not isinstance(cantidad, int) or cantidad < 1:
+            raise DatosInvalidos("La cantidad de entradas debe ser un entero positivo.")
+        try:
+            if contiguos:
+                asientos = partido.asignar_asientos_contiguos(vip, cantidad)
+            else:
+                asientos = partido.asignar_asientos(vip, cantidad)
+        except SinAsientosDisponibles:
+            raise AsientoNoDisponible(f"No quedan {cantidad} asientos disponibles de ese tipo para este partido.")
+        return [self._emitir_entrada(cliente, partido, tipo_entrada, asiento) for asiento in asientos]
+
+    @medir
+    def validar_entrada(self, codigo: str) -> Entrada:
+        """
+        Valida una entrada, registrando la asistencia al partido.
+
+        Args:
+            codigo (str): Código de la entrada.
+
+        Returns:
+            Entrada: La entrada validada.
+
+        Raises:
+            DatosInvalidos: Si el código no es una cadena.
+            EntradaNoEncontrada: Si la entrada no existe.
+            EntradaYaValidada: Si la entrada ya fue validada.
+        """
+        if not isinstance(codigo, str):
+            raise DatosInvalidos("El código de la entrada debe ser una cadena.")
+        entrada = self.api.entradas_por_codigo.get(codigo)
+        if entrada is None:
+            raise EntradaNoEncontrada(f"La entrada {codigo} no existe.")
+        if not self.api.registrar_validacion(entrada):
+            raise EntradaYaValidada(f"La entrada {codigo} ya ha sido validada.")
+        diario_eventos.registrar(ENTRADA_VALIDADA, {"codigo": codigo})
+        return entrada
+
+    def validar_codigos(self, codigos) -> list[tuple[str, str]]:
+        """
+        Valida en lote los códigos leídos por un escáner.
+
+        Args:
+            codigos (iterable): Códigos de entrada, por ejemplo las líneas de un registro del escáner.
+
+        Returns:
+            list[tuple[str, str]]: Código y estado de la validación (VALIDADA, YA_VALIDADA o NO_ENCONTRADA) de cada entrada.
+        """
+        resultados = []
+        for codigo in codigos:
+            codigo = codigo.strip()
+            if not codigo:
+                continue
+            try:
+                self.validar_entrada(codigo)
+                resultados.append((codigo, VALIDADA))
+            except EntradaYaValidada:
+                resultados.append((codigo, YA_VALIDADA))
+            except EntradaNoEncontrada:
+                resultados.append((codigo, NO_ENCONTRADA))
+        return resultados
+
+    def entradas_vip(self, cedula: int) -> list[Entrada]:
+        """
+        Retorna las entradas VIP de un cliente.
+
+        Args:
+            cedula (int): Cédula del cliente.
+
+        Returns:
+            list[Entrada]: Lista de entradas VIP del cliente.
+
+        Raises:
+            ClienteNoVip: Si el cliente no tiene entradas VIP.
+        """
+        entradas = self.clientes.entradas_vip(cedula)
+        if len(entradas) == 0:
+            raise ClienteNoVip(f"El cliente {cedula} no tiene entrada VIP.")
+        return entradas
+
+    @medir
+    def crear_factura(self, cedula: int, restaurante: str, productos: list[str], codigo: str = None) -> Factura:
+        """
+        Vende productos de un restaurante a un cliente con entrada VIP y descuenta el stock.
+
+        Args:
+            cedula (int): Cédula del cliente.
+            restaurante (str): Nombre del restaurante.
+            productos (list[str]): Nombres de los productos, repetidos tantas veces como unidades se compren.
+            codigo (str): Código de la entrada VIP con la que se compra. Si no se indica, se usa la primera
+                entrada VIP del cliente cuyo estadio tenga el restaurante.
+
+        Returns:
+            Factura: La factura creada.
+
+        Raises:
+            DatosInvalidos: Si no se indica ningún producto o algún nombre de producto no es una cadena.
+            ClienteNoVip: Si el cliente no tiene entradas VIP.
+            EntradaNoEncontrada: Si el cliente no tiene la entrada VIP indicada.
+            RestauranteNoEncontrado: Si el restaurante no está en el estadio de la entrada.
+            ProductoNoDisponible: Si un producto no existe, no tiene stock suficiente o no se le puede vender al cliente.
+        """
+        if not isinstance(productos, list) or not productos:
+            raise DatosInvalidos("La compra debe tener al menos un producto.")
+        if not all(isinstance(nombre, str) for nombre in productos):
+            raise DatosInvalidos("Los nombres de los productos deben ser cadenas.")
+        entradas = self.entradas_vip(cedula)
+        if codigo is not None:
+            entradas = [entrada for entrada in entradas if entrada.codigo == codigo]
+            if not entradas:
+                raise EntradaNoEncontrada(f"El cliente {cedula} no tiene la entrada VIP {codigo}.")
+        for entrada in entradas:
+            local = self._restaurante(entrada, restaurante)
+            if local is not None:
+                break
+        else:
+            raise RestauranteNoEncontrado(f"El restaurante {restaurante} no está en el estadio de la entrada.")
+        seleccion = []
+        for nombre in productos:
+            producto = local.buscar_producto(nombre)
+            if producto is None:
+                raise ProductoNoDisponible(f"El producto {nombre} no está en el menú de {local.nombre}.")
+            motivo = Restaurante.motivo_rechazo(producto, entrada.cliente.edad)
+            if motivo is not None:
+                raise ProductoNoDisponible(motivo)
+            seleccion.append(producto)
+        factura = Factura(entrada, seleccion, local)
+        try:
+            reserva = local.inventario.reservar(factura.cantidades())
+        except StockInsuficiente as error:
+            contar("stock_insuficiente")
+            raise ProductoNoDisponible(str(error))
+        return self.registrar_factura(factura, reserva)
+
+    def registrar_factura(self, factura: Factura, reserva: Reserva = None) -> Factura:
+        """
+        Confirma una factura: descuenta el stock de sus productos, la asocia a su entrada y a su cliente y la anota en el diario.
+
+        Args:
+            factura (Factura): La factura a confirmar.
+            reserva (Reserva): Reserva de los productos hecha en el inventario del restaurante, o None para
+                reservarlos y descontarlos en el momento.
+
+        Returns:
+            Factura: La factura confirmada.
+
+        Raises:
+            ProductoNoDisponible: Si no se indica una reserva y algún producto no tiene stock suficiente.
+        """
+        try:
+            factura.confirmar(reserva)
+        except StockInsuficiente as error:
+            raise ProductoNoDisponible(str(error))
+        self.api.registrar_factura(factura)
+        factura.cliente.compras.append(factura)
+        diario_eventos.registrar(FACTURA_CREADA, {"codigo": factura.entrada.codigo, "indice": factura.entrada.compras.index(factura),
+                                                  "factura": factura.__dict__()})
+        return factura
+
+    def estadisticas(self, conexion=None) -> dict:
+        """
+        Calcula las estadísticas de partidos, clientes y restaurantes.
+
+        Args:
+            conexion (sqlite3.Connection): Conexión a la base SQLite para calcular las estadísticas con SQL, o None.
+
+        Returns:
+            dict: Gasto VIP promedio, asistencia por partido, clientes con más entradas, restaurantes con más ventas
+                y platos más vendidos.
+        """
+        estadisticas = Estadisticas(self.api, conexion)
+        restaurantes, platos = estadisticas.platos_top()
+        return {"gastos_vip_promedio": estadisticas.gastos_vip_promedio(),
+                "asistencia": estadisticas.asistencia_partidos().to_dict("records"),
+                "clientes_top": estadisticas.clientes_top(),
+                "restaurantes_top": restaurantes,
+                "platos_top": platos}
+
+    def _cliente(self, cedula: int, nombre: str, edad: int) -> Cliente:
+        """
+        Busca un cliente registrado o crea uno nuevo con los datos dados. El cliente nuevo se registra al emitir su primera entrada.
+
+        Args:
+            cedula (int): Cédula del cliente.
+            nombre (str): Nombre del cliente.
+            edad (int): Edad del cliente.
+
+        Returns:
+            Cliente: El cliente.
+
+        Raises:
+            DatosInvalidos: Si la cédula es inválida o el cliente no existe y faltan su nombre o su edad.
+        """
+        if not isinstance(cedula, int) or cedula < 0:
+            raise DatosInvalidos("La cédula es inválida, debe ser un número entero.")
+        cliente = self.clientes.obtener(cedula)
+        if cliente is not None:
+            return cliente
+        if not nombre or not isinstance(edad, int) or edad < 0:
+            raise DatosInvalidos("Para un cliente nuevo se requieren su nombre y su edad.")
+        return Cliente(nombre, cedula, edad)
+
+    def _partido(self, partido_id: str) -> Partido:
+        """
+        Busca un partido por su ID.
+
+        Args:
+            partido_id (str): ID del partido.
+
+        Returns:
+            Partido: El partido.
+
+        Raises:
+            DatosInvalidos: Si el ID no es una cadena.
+            PartidoNoEncontrado: Si el partido no existe.
+        """
+        if not isinstance(partido_id, str):
+            raise DatosInvalidos("El ID del partido debe ser una cadena.")
+        partido = self.api.partidos_por_id.get(partido_id)
+        if partido is None:
+            raise PartidoNoEncontrado(f"El partido {partido_id} no existe.")
+        return partido
+
+    @staticmethod
+    def _es_vip(tipo_entrada: str) -> bool:
+        """
+        Valida el tipo de entrada.
+
+        Args:
+            tipo_entrada (str): Tipo de entrada ("general" o "vip").
+
+        Returns:
+            bool: True si la entrada es VIP, False si es general.
+
+        Raises:
+            DatosInvalidos: Si el tipo de entrada es inválido.
+        """
+        if tipo_entrada not in TIPOS_ENTRADA:
+            raise DatosInvalidos(f"Tipo de entrada inválido: {tipo_entrada}.")
+        return tipo_entrada == "vip"
+
+    @staticmethod
+    def _restaurante(entrada: Entrada, nombre: str) -> Restaurante or None:
+        """
+        Busca un restaurante por nombre en el estadio del partido de una entrada.
+
+        Args:
+            entrada (Entrada): La entrada.
+            nombre (str): Nombre del restaurante.
+
+        Returns:
+            Restaurante or None: El restaurante, o None si no está en el estadio.
+        """
+        for restaurante in entrada.partido.estadio.restaurantes:
+            if restaurante.nombre == nombre:
+                return restaurante
+        return None
+
+    def _emitir_entrada(self, cliente: Cliente, partido: Partido, tipo_entrada: str, asiento: str) -> Entrada:
+        """
+        Crea una entrada para un asiento ya ocupado, la registra y la anota en el diario de eventos.
+
+        Args:
+            cliente (Cliente): Cliente que compra la entrada.
+            partido (Partido): Partido de la entrada.
+            tipo_entrada (str): Tipo de entrada ("general" o "vip").
+            asiento (str): Asiento asignado.
+
+        Returns:
+            Entrada: La entrada emitida.
+        """
+        cliente = self.clientes.agregar(cliente)
+        entrada = Entrada(tipo_entrada, partido, asiento, cliente, f"{asiento} {partido.id}")
+        self.api.registrar_entrada(entrada)
+        self.clientes.registrar_entrada(entrada)
+        diario_eventos.registrar(ENTRADA_VENDIDA, {"cliente": {"nombre": cliente.nombre, "cedula": cliente.cedula, "edad": cliente.edad}, "entrada": entrada.__dict__()})
+        return entrada
@@ -0,0 +1,400 @@
+import json
+import asyncio
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from cargar_api import CargarApi
+from gestion_datos import guardar_datos, cargar_datos
+from diario import diario_eventos
+from servicio import (Servicio, ErrorServicio, DatosInvalidos, PartidoNoEncontrado, AsientoNoDisponible, EntradaNoEncontrada,
+                      EntradaYaValidada, ClienteNoVip, RestauranteNoEncontrado, ProductoNoDisponible, VALIDADA, resumen_entrada)
+
+HOST = "127.0.0.1"
+PUERTO = 8024
+HILOS = 8
+TAMANO_MAXIMO = 1 << 20
+MAXIMO_CABECERAS = 100
+
+ESTADOS_ERROR = {
+    DatosInvalidos: HTTPStatus.BAD_REQUEST,
+    ClienteNoVip: HTTPStatus.FORBIDDEN,
+    PartidoNoEncontrado: HTTPStatus.NOT_FOUND,
+    EntradaNoEncontrada: HTTPStatus.NOT_FOUND,
+    RestauranteNoEncontrado: HTTPStatus.NOT_FOUND,
+    AsientoNoDisponible: HTTPStatus.CONFLICT,
+    EntradaYaValidada: HTTPStatus.CONFLICT,
+    ProductoNoDisponible: HTTPStatus.CONFLICT,
+}
+
+
+class PeticionInvalida(Exception):
+    """
+    Excepción personalizada para indicar que una petición HTTP está mal formada.
+    """
+    pass
+
+
+class Servidor:
+    """
+    Servidor HTTP/JSON de la taquilla y los restaurantes, sobre asyncio y la biblioteca estándar.
+
+    Las operaciones del servicio se ejecutan en un grupo de hilos para no bloquear el ciclo de eventos con la
+    escritura del diario. Las ventas y validaciones de un mismo partido se serializan con un lock por partido,
+    y las compras de un mismo restaurante con un lock por restaurante, de modo que partidos distintos se
+    atienden en paralelo. El partido o el restaurante se validan antes de crear su lock, así los IDs
+    inexistentes no agregan locks. Cuando el diario crece lo suficiente, se pausan las operaciones nuevas, se esperan
+    las que están en curso y se guardan los datos.
+
+    Rutas:
+        GET /partidos: Lista de partidos.
+        POST /entradas: Venta de entradas ({"cedula", "partido", "tipo", "asiento", "nombre", "edad", "cantidad", "contiguos"}).
+        POST /validaciones: Validación de una entrada ({"codigo"}).
+        POST /facturas: Compra en un restaurante ({"cedula", "restaurante", "productos", "codigo"}).
+        GET /estadisticas: Estadísticas de partidos, clientes y restaurantes.
+
+    Attributes:
+        servicio (Servicio): Servicio que atiende las operaciones.
+        hilos (int): Cantidad de hilos del grupo que ejecuta las operaciones.
+    """
+
+    def __init__(self, servicio: Servicio, hilos: int = HILOS):
+        """
+        Inicializa una instancia de la clase Servidor.
+
+        Args:
+            servicio (Servicio): Servicio que atiende las operaciones.
+            hilos (int): Cantidad de hilos del grupo que ejecuta las operaciones.
+        """
+        self.servicio = servicio
+        self.hilos = hilos
+        self._executor = ThreadPoolExecutor(hilos)
+        self._locks = {}
+        self._en_curso = 0
+        self._abierto = asyncio.Event()
+        self._abierto.set()
+        self._inactivo = asyncio.Condition()
+        self._rutas = {
+            ("GET", "/partidos"): self._partidos,
+            ("POST", "/entradas"): self._vender,
+            ("POST", "/validaciones"): self._validar,
+            ("POST", "/facturas"): self._facturar,
+            ("GET", "/estadisticas"): self._estadisticas,
+        }
+
+    async def iniciar(self, host: str = HOST, puerto: int = PUERTO) -> asyncio.Server:
+        """
+        Abre el socket del servidor y empieza a aceptar conexiones.
+
+        Args:
+            host (str): Dirección en la que se escucha.
+            puerto (int): Puerto en el que se escucha; 0 elige uno libre.
+
+        Returns:
+            asyncio.Server: El servidor de asyncio.
+        """
+        return await asyncio.start_server(self._atender, host, puerto)
+
+    def cerrar(self):
+        """
+        Espera las operaciones pendientes y guarda los datos de los clientes.
+        """
+        self._executor.shutdown(wait=True)
+        guardar_datos(self.servicio.clientes, api=self.servicio.api)
+
+    async def _atender(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Atiende las peticiones de una conexión, manteniéndola abierta entre peticiones (keep-alive).
+
+        Args:
+            reader (asyncio.StreamReader): Flujo de lectura de la conexión.
+            writer (asyncio.StreamWriter): Flujo de escritura de la conexión.
+        """
+        try:
+            while True:
+                try:
+                    peticion = await self._leer_peticion(reader)
+                except PeticionInvalida as error:
+                    await self._responder(writer, HTTPStatus.BAD_REQUEST, {"error": str(error)}, False)
+                    break
+                if peticion is None:
+                    break
+                metodo, ruta, cuerpo, mantener = peticion
+                estado, respuesta = await self._despachar(metodo, ruta, cuerpo)
+                await self._responder(writer, estado, respuesta, mantener)
+                if not mantener:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _leer_peticion(reader: asyncio.StreamReader) -> tuple[str, str, bytes, bool] or None:
+        """
+        Lee una petición HTTP/1.1 de la conexión.
+
+        Args:
+            reader (asyncio.StreamReader): Flujo de lectura de la conexión.
+
+        Returns:
+            tuple[str, str, bytes, bool] or None: Método, ruta, cuerpo y si se mantiene la conexión,
+                o None si el cliente cerró la conexión.
+
+        Raises:
+            PeticionInvalida: Si la petición está mal formada o es demasiado grande.
+        """
+        linea = await Servidor._leer_linea(reader)
+        if not linea:
+            return None
+        try:
+            metodo, ruta, version = linea.decode("latin-1").split()
+        except ValueError:
+            raise PeticionInvalida("Línea de petición inválida.")
+        cabeceras = {}
+        while (linea := await Servidor._leer_linea(reader)) not in (b"\r\n", b"\n", b""):
+            if len(cabeceras) >= MAXIMO_CABECERAS:
+                raise PeticionInvalida("Demasiadas cabeceras.")
+            nombre, _, valor = linea.decode("latin-1").partition(":")
+            cabeceras[nombre.strip().lower()] = valor.strip()
+        try:
+            largo = int(cabeceras.get("content-length", 0))
+        except ValueError:
+            raise PeticionInvalida("Content-Length inválido.")
+        if largo < 0:
+            raise PeticionInvalida("Content-Length inválido.")
+        if largo > TAMANO_MAXIMO:
+            raise PeticionInvalida("Petición demasiado grande.")
+        cuerpo = await reader.readexactly(largo) if largo else b""
+        conexion = cabeceras.get("connection", "").lower()
+        mantener = conexion != "close" if version == "HTTP/1.1" else conexion == "keep-alive"
+        return metodo, ruta.split("?", 1)[0], cuerpo, mantener
+
+    @staticmethod
+    async def _leer_linea(reader: asyncio.StreamReader) -> bytes:
+        """
+        Lee una línea de la petición.
+
+        Args:
+            reader (asyncio.StreamReader): Flujo de lectura de la conexión.
+
+        Returns:
+            bytes: La línea, vacía si el cliente cerró la conexión.
+
+        Raises:
+            PeticionInvalida: Si la línea supera el límite del flujo de lectura.
+        """
+        try:
+            return await reader.readline()
+        except (ValueError, asyncio.LimitOverrunError):
+            raise PeticionInvalida("Línea de la petición demasiado larga.")
+
+    @staticmethod
+    async def _responder(writer: asyncio.StreamWriter, estado: HTTPStatus, respuesta, mantener: bool):
+        """
+        Escribe una respuesta JSON.
+
+        Args:
+            writer (asyncio.StreamWriter): Flujo de escritura de la conexión.
+            estado (HTTPStatus): Código de estado de la respuesta.
+            respuesta: Datos a enviar como JSON.
+            mantener (bool): Si la conexión se mantiene abierta después de la respuesta.
+        """
+        cuerpo = json.dumps(respuesta, ensure_ascii=False).encode("utf-8")
+        writer.write(f"HTTP/1.1 {estado.value} {estado.phrase}\r\nContent-Type: application/json; charset=utf-8\r\n"
+                     f"Content-Length: {len(cuerpo)}\r\nConnection: {'keep-alive' if mantener else 'close'}\r\n\r\n".encode("latin-1") + cuerpo)
+        await writer.drain()
+
+    async def _despachar(self, metodo: str, ruta: str, cuerpo: bytes) -> tuple[HTTPStatus, object]:
+        """
+        Ejecuta la operación de una ruta y convierte su resultado o su error en una respuesta. Los datos de tipo
+        incorrecto se responden con 400 y cualquier otro error con 500, así siempre se escribe una respuesta.
+
+        Args:
+            metodo (str): Método HTTP.
+            ruta (str): Ruta pedida.
+            cuerpo (bytes): Cuerpo JSON de la petición.
+
+        Returns:
+            tuple[HTTPStatus, object]: Código de estado y datos de la respuesta.
+        """
+        operacion = self._rutas.get((metodo, ruta))
+        if operacion is None:
+            if any(ruta == ruta_conocida for _, ruta_conocida in self._rutas):
+                return HTTPStatus.METHOD_NOT_ALLOWED, {"error": f"Método {metodo} no permitido en {ruta}."}
+            return HTTPStatus.NOT_FOUND, {"error": f"Ruta {ruta} no encontrada."}
+        try:
+            datos = json.loads(cuerpo) if cuerpo else {}
+        except ValueError:
+            return HTTPStatus.BAD_REQUEST, {"error": "El cuerpo no es JSON válido."}
+        if not isinstance(datos, dict):
+            return HTTPStatus.BAD_REQUEST, {"error": "El cuerpo debe ser un objeto JSON."}
+        try:
+            return await operacion(datos)
+        except KeyError as error:
+            return HTTPStatus.BAD_REQUEST, {"error": f"Falta el campo {error}.", "tipo": DatosInvalidos.__name__}
+        except ErrorServicio as error:
+            return ESTADOS_ERROR.get(type(error), HTTPStatus.BAD_REQUEST), {"error": str(error), "tipo": type(error).__name__}
+        except (TypeError, ValueError) as error:
+            return HTTPStatus.BAD_REQUEST, {"error": f"Datos inválidos: {error}", "tipo": DatosInvalidos.__name__}
+        except Exception as error:
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Error interno del servidor.", "tipo": type(error).__name__}
+
+    async def _ejecutar(self, clave: str, funcion, *args):
+        """
+        Ejecuta una operación del servicio en el grupo de hilos, serializada con las demás operaciones de la misma clave.
+
+        Después de una operación, si el diario creció lo suficiente, se compactan los datos.
+
+        Args:
+            clave (str): Clave del lock (el partido o el restaurante), o None para no serializar.
+            funcion (function): Operación del servicio.
+            *args: Argumentos de la operación.
+
+        Returns:
+            object: El resultado de la operación.
+        """
+        await self._abierto.wait()
+        self._en_curso += 1
+        try:
+            loop = asyncio.get_running_loop()
+            if clave is None:
+                return await loop.run_in_executor(self._executor, funcion, *args)
+            async with self._locks.setdefault(clave, asyncio.Lock()):
+                return await loop.run_in_executor(self._executor, funcion, *args)
+        finally:
+            self._en_curso -= 1
+            async with self._inactivo:
+                self._inactivo.notify_all()
+            if diario_eventos.debe_compactar() and self._abierto.is_set():
+                await self._compactar()
+
+    async def _compactar(self):
+        """
+        Pausa las operaciones nuevas, espera a que terminen las que están en curso y guarda los datos.
+        """
+        self._abierto.clear()
+        try:
+            async with self._inactivo:
+                await self._inactivo.wait_for(lambda: self._en_curso == 0)
+            await asyncio.get_running_loop().run_in_executor(self._executor, guardar_datos, self.servicio.clientes, None, self.servicio.api)
+        finally:
+            self._abierto.set()
+
+    async def _partidos(self, datos: dict) -> tuple[HTTPStatus, list]:
+        """
+        Lista los partidos.
+
+        Args:
+            datos (dict): Cuerpo de la petición (no se usa).
+
+        Returns:
+            tuple[HTTPStatus, list]: Código de estado e ID, descripción y fecha de cada partido.
+        """
+        return HTTPStatus.OK, [{"id": partido.id, "partido": str(partido), "fecha": partido.fecha} for partido in self.servicio.api.partidos]
+
+    async def _vender(self, datos: dict) -> tuple[HTTPStatus, object]:
+        """
+        Vende una entrada o, si se indica "cantidad", varias entradas de un partido.
+
+        Args:
+            datos (dict): Cuerpo de la petición.
+
+        Returns:
+            tuple[HTTPStatus, object]: Código de estado y la entrada vendida, o la lista de entradas vendidas.
+        """
+        partido = datos["partido"]
+        if not isinstance(partido, str):
+            raise DatosInvalidos("El ID del partido debe ser un texto.")
+        if partido not in self.servicio.api.partidos_por_id:
+            raise PartidoNoEncontrado(f"El partido {partido} no existe.")
+        argumentos = (datos["cedula"], partido, datos["tipo"])
+        nombre, edad = datos.get("nombre"), datos.get("edad")
+        if "cantidad" in datos:
+            entradas = await self._ejecutar(f"partido:{partido}", self.servicio.vender_entradas, *argumentos, datos["cantidad"],
+                                            bool(datos.get("contiguos", False)), nombre, edad)
+            return HTTPStatus.CREATED, [resumen_entrada(entrada) for entrada in entradas]
+        entrada = await self._ejecutar(f"partido:{partido}", self.servicio.vender_entrada, *argumentos, datos.get("asiento"), nombre, edad)
+        return HTTPStatus.CREATED, resumen_entrada(entrada)
+
+    async def _validar(self, datos: dict) -> tuple[HTTPStatus, dict]:
+        """
+        Valida una entrada, serializada con las demás operaciones de su partido.
+
+        Args:
+            datos (dict): Cuerpo de la petición.
+
+        Returns:
+            tuple[HTTPStatus, dict]: Código de estado, código de la entrada y estado de la validación.
+        """
+        codigo = datos["codigo"]
+        if not isinstance(codigo, str):
+            raise DatosInvalidos("El código debe ser un texto.")
+        entrada = self.servicio.api.entradas_por_codigo.get(codigo)
+        if entrada is None:
+            raise EntradaNoEncontrada(f"La entrada {codigo} no existe.")
+        await self._ejecutar(f"partido:{entrada.partido.id}", self.servicio.validar_entrada, codigo)
+        return HTTPStatus.OK, {"codigo": codigo, "estado": VALIDADA}
+
+    async def _facturar(self, datos: dict) -> tuple[HTTPStatus, dict]:
+        """
+        Vende productos de un restaurante a un cliente con entrada VIP.
+
+        Args:
+            datos (dict): Cuerpo de la petición.
+
+        Returns:
+            tuple[HTTPStatus, dict]: Código de estado y la factura creada.
+        """
+        restaurante = datos["restaurante"]
+        if not isinstance(restaurante, str):
+            raise DatosInvalidos("El restaurante debe ser un texto.")
+        if restaurante not in self.servicio.api.restaurantes_por_nombre:
+            raise RestauranteNoEncontrado(f"El restaurante {restaurante} no existe.")
+        factura = await self._ejecutar(f"restaurante:{restaurante}", self.servicio.crear_factura, datos["cedula"],
+                                       restaurante, datos["productos"], datos.get("codigo"))
+        return HTTPStatus.CREATED, factura.__dict__()
+
+    async def _estadisticas(self, datos: dict) -> tuple[HTTPStatus, dict]:
+        """
+        Calcula las estadísticas.
+
+        Args:
+            datos (dict): Cuerpo de la petición (no se usa).
+
+        Returns:
+            tuple[HTTPStatus, dict]: Código de estado y las estadísticas.
+        """
+        return HTTPStatus.OK, await self._ejecutar(None, self.servicio.estadisticas)
+
+
+async def servir(host: str = HOST, puerto: int = PUERTO, hilos: int = HILOS):
+    """
+    Carga los datos y atiende peticiones hasta que se interrumpa el proceso; al terminar guarda los datos.
+
+    Args:
+        host (str): Dirección en la que se escucha.
+        puerto (int): Puerto en el que se escucha.
+        hilos (int): Cantidad de hilos del grupo que ejecuta las operaciones.
+    """
+    api = CargarApi()
+    servidor = Servidor(Servicio(api, cargar_datos(api)), hilos)
+    servidor_asyncio = await servidor.iniciar(host, puerto)
+    print(f"Escuchando en http://{host}:{servidor_asyncio.sockets[0].getsockname()[1]}")
+    try:
+        async with servidor_asyncio:
+            await servidor_asyncio.serve_forever()
+    finally:
+        servidor.cerrar()
+        print("Datos guardados con éxito.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servidor HTTP/JSON de la taquilla de la Euro 2024.")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--puerto", type=int, default=PUERTO)
+    parser.add_argument("--hilos", type=int, default=HILOS)
+    argumentos = parser.parse_args()
+    try:
+        asyncio.run(servir(argumentos.host, argumentos.puerto, argumentos.hilos))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,93 @@
+import os
+import json
+import hashlib
+from ast import literal_eval
+
+VERSION_SNAPSHOT = 1
+
+
+class SnapshotInvalido(Exception):
+    """
+    Excepción personalizada para indicar que un snapshot está corrupto o tiene una versión no soportada.
+    """
+    pass
+
+
+def _checksum(payload: bytes) -> str:
+    """
+    Calcula el checksum SHA-256 del contenido de un snapshot.
+
+    Args:
+        payload (bytes): Contenido serializado del snapshot.
+
+    Returns:
+        str: Checksum en hexadecimal.
+    """
+    return hashlib.sha256(payload).hexdigest()
+
+
+def guardar_snapshot(filename: str, data) -> None:
+    """
+    Guarda los datos en un snapshot versionado con checksum.
+
+    El archivo tiene una línea de cabecera en JSON con la versión y el checksum, seguida del contenido en JSON.
+    Se escribe en un archivo temporal y se reemplaza de forma atómica para no dejar snapshots a medias.
+
+    Args:
+        filename (str): El nombre del archivo donde se guardará el snapshot.
+        data: Datos serializables en JSON.
+    """
+    payload = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    cabecera = json.dumps({"version": VERSION_SNAPSHOT, "checksum": _checksum(payload)}).encode("utf-8")
+    temporal = f"{filename}.tmp"
+    with open(temporal, "wb") as file:
+        file.write(cabecera)
+        file.write(b"\n")
+        file.write(payload)
+    os.replace(temporal, filename)
+
+
+def cargar_snapshot(filename: str):
+    """
+    Carga los datos de un snapshot verificando su versión y checksum.
+
+    Args:
+        filename (str): El nombre del archivo del snapshot.
+
+    Returns:
+        Datos contenidos en el snapshot.
+
+    Raises:
+        SnapshotInvalido: Si el archivo está corrupto o su versión no es soportada.
+    """
+    with open(filename, "rb") as file:
+        contenido = file.read()
+    cabecera, _, payload = contenido.partition(b"\n")
+    try:
+        cabecera = json.loads(cabecera)
+    except ValueError:
+        raise SnapshotInvalido(f"Cabecera inválida en {filename}")
+    if not isinstance(cabecera, dict):
+        raise SnapshotInvalido(f"Cabecera inválida en {filename}")
+    if cabecera.get("version") != VERSION_SNAPSHOT:
+        raise SnapshotInvalido(f"Versión de snapshot no soportada en {filename}")
+    if cabecera.get("checksum") != _checksum(payload):
+        raise SnapshotInvalido(f"Checksum inválido en {filename}")
+    return json.loads(payload)
+
+
+def migrar_cache(legacy: str, filename: str):
+    """
+    Convierte un archivo de caché antiguo (literal de Python) en un snapshot.
+
+    Args:
+        legacy (str): El nombre del archivo de caché antiguo.
+        filename (str): El nombre del archivo del snapshot a generar.
+
+    Returns:
+        Datos contenidos en el archivo antiguo.
+    """
+    with open(legacy, "r") as file:
+        data = literal_eval(file.read())
+    guardar_snapshot(filename, data)
+    return data
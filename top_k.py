@@ -0,0 +1,128 @@
+import heapq
+
+TOP_K = 10
+
+
+class TopK:
+    """
+    Conteos por clave que mantienen sus k mayores valores mientras se incrementan.
+
+    Como los conteos solo crecen, basta con guardar los k mayores y compararlos con el menor de ellos:
+    una clave de afuera entra al grupo cuando su conteo lo supera, y la que sale nunca vuelve a ser mayor
+    que las que quedan sin antes pasar por esa misma comparación. Así los k primeros son exactos, cada
+    incremento cuesta O(log k) y consultar hasta k claves no recorre todos los conteos. Las consultas de
+    más de k claves se responden con un heap sobre todos los conteos, en O(n log N).
+
+    Attributes:
+        k (int): Cantidad de claves mayores que se mantienen.
+        conteos (dict): Conteo de cada clave.
+    """
+
+    def __init__(self, k: int = TOP_K):
+        """
+        Inicializa una instancia de la clase TopK sin conteos.
+
+        Args:
+            k (int): Cantidad de claves mayores que se mantienen.
+        """
+        self.k = k
+        self.conteos = {}
+        self._top = {}
+        self._heap = []
+
+    def incrementar(self, clave, cantidad: float = 1):
+        """
+        Suma una cantidad positiva al conteo de una clave.
+
+        Args:
+            clave (hashable): La clave.
+            cantidad (float): Cantidad a sumar; debe ser positiva para que los k mayores sigan siendo exactos.
+        """
+        conteo = self.conteos.get(clave, 0) + cantidad
+        self.conteos[clave] = conteo
+        if clave in self._top:
+            self._top[clave] = conteo
+            self._empujar(conteo, clave)
+        elif len(self._top) < self.k:
+            self._top[clave] = conteo
+            self._empujar(conteo, clave)
+        elif self.k and conteo > self._minimo():
+            _, saliente = heapq.heappop(self._heap)
+            del self._top[saliente]
+            self._top[clave] = conteo
+            self._empujar(conteo, clave)
+
+    def top(self, n: int = None) -> list[tuple]:
+        """
+        Retorna las claves con mayor conteo, de mayor a menor.
+
+        Args:
+            n (int): Cantidad de claves a retornar, o None para todas.
+
+        Returns:
+            list[tuple]: Clave y conteo de cada una.
+        """
+        if n is not None and n <= self.k:
+            return heapq.nlargest(n, self._top.items(), key=lambda item: item[1])
+        if n is None:
+            return sorted(self.conteos.items(), key=lambda item: item[1], reverse=True)
+        return heapq.nlargest(n, self.conteos.items(), key=lambda item: item[1])
+
+    def copia(self) -> "TopK":
+        """
+        Retorna una copia independiente de los conteos.
+
+        Returns:
+            TopK: La copia.
+        """
+        copia = TopK(self.k)
+        copia.conteos = dict(self.conteos)
+        copia._top = dict(self._top)
+        copia._heap = list(self._heap)
+        return copia
+
+    def __getitem__(self, clave) -> float:
+        """
+        Retorna el conteo de una clave.
+
+        Args:
+            clave (hashable): La clave.
+
+        Returns:
+            float: El conteo, 0 si la clave no tiene conteo.
+        """
+        return self.conteos.get(clave, 0)
+
+    def __len__(self) -> int:
+        """
+        Retorna la cantidad de claves con conteo.
+
+        Returns:
+            int: Cantidad de claves.
+        """
+        return len(self.conteos)
+
+    def _minimo(self) -> float:
+        """
+        Retorna el menor conteo de las k claves mayores, descartando las entradas viejas del heap.
+
+        Returns:
+            float: El menor conteo del grupo.
+        """
+        while self._top.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return self._heap[0][0]
+
+    def _empujar(self, conteo: float, clave):
+        """
+        Agrega una entrada al heap de las k claves mayores. Las entradas viejas de una clave quedan en el heap
+        hasta que llegan al tope; si el heap crece demasiado, se reconstruye con los conteos actuales.
+
+        Args:
+            conteo (float): Conteo actual de la clave.
+            clave (hashable): La clave.
+        """
+        heapq.heappush(self._heap, (conteo, clave))
+        if len(self._heap) > 4 * self.k + 16:
+            self._heap = [(valor, llave) for llave, valor in self._top.items()]
+            heapq.heapify(self._heap)